@@ -0,0 +1,112 @@
+"""
+Measures model class creation and EllarSQLService boot time for N synthetic models.
+
+Usage:
+    python benchmarks/models_startup.py --models 800 --modules 8
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+_MODEL_TEMPLATE = """
+class Model{index}(model.Model):
+    id = model.Column(model.Integer, primary_key=True)
+    name = model.Column(model.String(50))
+    email = model.Column(model.String(100))
+    created_at = model.Column(model.DateTime)
+    parent_id = model.Column(model.ForeignKey("model{parent}.id"), nullable=True)
+    parent = model.relationship("Model{parent}")
+"""
+
+_BOOT_SCRIPT = """
+import sys
+import time
+
+from ellar_sql import EllarSQLService
+
+started = time.perf_counter()
+db_service = EllarSQLService(
+    databases="sqlite:///:memory:",
+    models=sys.argv[2:],
+    lazy_models=sys.argv[1] == "lazy",
+    root_path=sys.argv[0],
+)
+booted = time.perf_counter()
+db_service.load_models(configure=True)
+loaded = time.perf_counter()
+
+print(booted - started, loaded - booted)
+"""
+
+
+def write_models(directory: str, count: int, modules: int) -> list:
+    names = []
+    per_module = max(count // modules, 1)
+
+    for module_index, start in enumerate(range(0, count, per_module)):
+        name = f"bench_models_{module_index}"
+        with open(os.path.join(directory, f"{name}.py"), "w") as f:
+            f.write("from ellar_sql import model\n")
+            for index in range(start, min(start + per_module, count)):
+                f.write(_MODEL_TEMPLATE.format(index=index, parent=index // 2))
+        names.append(name)
+    return names
+
+
+def run_boot(directory: str, mode: str, names: list) -> tuple:
+    script = os.path.join(directory, "boot.py")
+    with open(script, "w") as f:
+        f.write(textwrap.dedent(_BOOT_SCRIPT))
+
+    output = subprocess.check_output(
+        [sys.executable, script, mode, *names],
+        cwd=directory,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join([directory, os.getcwd()])),
+    )
+    boot, load = output.decode().split()
+    return float(boot), float(load)
+
+
+def measure_class_creation(count: int) -> tuple:
+    from ellar_sql import model
+
+    started = time.perf_counter()
+    for index in range(count):
+        namespace = {
+            "__tablename__": f"bench_{index}",
+            "id": model.Column(model.Integer, primary_key=True),
+            "name": model.Column(model.String(50)),
+        }
+        type(model.Model)(f"Bench{index}", (model.Model,), namespace)
+    created = time.perf_counter()
+    model.configure_mappers()
+    configured = time.perf_counter()
+
+    return created - started, configured - created
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", type=int, default=800)
+    parser.add_argument("--modules", type=int, default=8)
+    args = parser.parse_args()
+
+    create, configure = measure_class_creation(args.models)
+    print(f"class creation ({args.models} models): {create:.3f}s")
+    print(f"configure_mappers ({args.models} models): {configure:.3f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = write_models(directory, args.models, args.modules)
+
+        for mode in ("eager", "lazy"):
+            boot, load = run_boot(directory, mode, names)
+            print(f"{mode} boot: {boot:.3f}s, models load and configure: {load:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
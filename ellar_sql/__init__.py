@@ -2,12 +2,44 @@
 
 __version__ = "0.1.8"
 
-from .model.database_binds import get_all_metadata, get_metadata
-from .module import EllarSQLModule
-from .pagination import LimitOffsetPagination, PageNumberPagination, paginate
-from .query import first_or_404, first_or_none, get_or_404, get_or_none, one_or_404
-from .schemas import MigrationOption, ModelBaseConfig, SQLAlchemyConfig
-from .services import EllarSQLService
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .model.database_binds import get_all_metadata, get_metadata
+    from .module import EllarSQLModule
+    from .pagination import LimitOffsetPagination, PageNumberPagination, paginate
+    from .query import (
+        first_or_404,
+        first_or_none,
+        get_many_or_404,
+        get_or_404,
+        get_or_none,
+        one_or_404,
+    )
+    from .schemas import MigrationOption, ModelBaseConfig, SQLAlchemyConfig
+    from .services import EllarSQLService
+
+# Exports are imported on first access, so that importing `ellar_sql.model`
+# in a migration script or worker does not load the module, pagination and CLI.
+_lazy_exports: t.Dict[str, str] = {
+    "EllarSQLModule": ".module",
+    "EllarSQLService": ".services",
+    "SQLAlchemyConfig": ".schemas",
+    "MigrationOption": ".schemas",
+    "ModelBaseConfig": ".schemas",
+    "get_or_404": ".query",
+    "get_many_or_404": ".query",
+    "first_or_404": ".query",
+    "one_or_404": ".query",
+    "first_or_none": ".query",
+    "get_or_none": ".query",
+    "paginate": ".pagination",
+    "PageNumberPagination": ".pagination",
+    "LimitOffsetPagination": ".pagination",
+    "get_metadata": ".model.database_binds",
+    "get_all_metadata": ".model.database_binds",
+}
 
 __all__ = [
     "EllarSQLModule",
@@ -15,6 +47,7 @@ __all__ = [
     "SQLAlchemyConfig",
     "MigrationOption",
     "get_or_404",
+    "get_many_or_404",
     "first_or_404",
     "one_or_404",
     "first_or_none",
@@ -26,3 +59,19 @@ __all__ = [
     "get_metadata",
     "get_all_metadata",
 ]
+
+
+def __getattr__(name: str) -> t.Any:
+    module_name = _lazy_exports.get(name)
+
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # cache on the module so `__getattr__` is not called again for this name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> t.List[str]:
+    return sorted(list(globals()) + list(_lazy_exports))
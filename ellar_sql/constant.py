@@ -14,6 +14,12 @@ NAMING_CONVERSION = {
     "pk": "pk_%(table_name)s",
 }
 DEFAULT_STORAGE_PLACEHOLDER = "DEFAULT_STORAGE_PLACEHOLDER".lower()
+# `Session.info` key of the number of threads uploading the files of a flush
+FILE_UPLOAD_WORKERS = "ellar_sql.file_upload_workers"
+# `Session.info` key of the `FileDeletionQueue` deleting files after commit and rollback
+FILE_DELETION_QUEUE = "ellar_sql.file_deletion_queue"
+# `Session.info` key of the `FileProcessingQueue` running deferred file processors after commit
+FILE_PROCESSING_QUEUE = "ellar_sql.file_processing_queue"
 
 
 class DeclarativeBasePlaceHolder(sa_orm.DeclarativeBase):
@@ -1,10 +1,12 @@
+import contextlib
+import contextvars
 import inspect
 import typing as t
 
 import factory
 import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
-from ellar.threading import run_as_sync
+from ellar.threading import execute_coroutine
 from factory.alchemy import (
     SESSION_PERSISTENCE_COMMIT,
     SESSION_PERSISTENCE_FLUSH,
@@ -14,16 +16,46 @@ from factory.alchemy import (
 from factory.errors import FactoryError
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util.concurrency import await_only, greenlet_spawn, in_greenlet
 
 from ellar_sql.model.base import ModelBase
 
 T = t.TypeVar("T", bound=ModelBase)
 
+# number of primary keys per query reloading the objects of a committed batch
+_REFRESH_CHUNK_SIZE = 500
+
+
+class _FactoryBatch:
+    """Objects added to each session by the factories of a `create_batch` call"""
+
+    def __init__(self) -> None:
+        self.sessions: t.Dict[
+            int,
+            t.Tuple[t.Union[sa_orm.Session, AsyncSession], t.List[t.Any]],
+        ] = {}
+
+    def add(self, session: t.Union[sa_orm.Session, AsyncSession], obj: t.Any) -> None:
+        self.sessions.setdefault(id(session), (session, []))[1].append(obj)
+
+
+_factory_batch: contextvars.ContextVar[t.Optional[_FactoryBatch]] = (
+    contextvars.ContextVar("ellar_sql_factory_batch", default=None)
+)
+
 
 class EllarSQLOptions(SQLAlchemyOptions):
     # Type hints for SQLAlchemy-specific attributes
     sqlalchemy_get_or_create: t.Tuple[str, ...]
     sqlalchemy_session_persistence: str
+    sqlalchemy_batch_persistence: bool
+
+    def _build_default_options(self):
+        return super()._build_default_options() + [
+            factory.base.OptionDefault(
+                "sqlalchemy_batch_persistence", False, inherit=True
+            ),
+        ]
 
     @staticmethod
     def _check_has_sqlalchemy_session_set(meta, value):
@@ -43,15 +75,104 @@ class EllarSQLFactory(SQLAlchemyModelFactory):
         abstract = True
 
     @classmethod
-    @run_as_sync
-    async def _session_execute(
+    def _session_execute(
         cls, session_func: t.Callable, *args: t.Any, **kwargs: t.Any
     ) -> t.Union[sa.Result, sa.CursorResult, t.Any]:
         res = session_func(*args, **kwargs)
         if isinstance(res, t.Coroutine):
-            res = await res
+            if in_greenlet():
+                # called by `create_async`, awaited on the running event loop
+                return await_only(res)
+            res = execute_coroutine(res)
         return res
 
+    @classmethod
+    @contextlib.contextmanager
+    def _batch(cls) -> t.Iterator[_FactoryBatch]:
+        """Defers the persistence of the objects created by any factory in the block"""
+        batch = _FactoryBatch()
+        token = _factory_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            _factory_batch.reset(token)
+
+    @classmethod
+    def create_batch(cls, size: int, **kwargs: t.Any) -> t.List[t.Any]:
+        """
+        Create a batch of instances.
+
+        With `sqlalchemy_batch_persistence`, the instances and the objects of their sub-factories
+        are persisted with a single flush or commit according to `sqlalchemy_session_persistence`,
+        instead of one by one.
+        """
+        if not cls._meta.sqlalchemy_batch_persistence:
+            return super().create_batch(size, **kwargs)
+
+        if cls._meta.sqlalchemy_get_or_create:
+            raise FactoryError(
+                "sqlalchemy_batch_persistence can't be used with sqlalchemy_get_or_create "
+                "in factory %s, since each instance is looked up before it is created."
+                % cls.__name__
+            )
+
+        with cls._batch() as batch:
+            instances = [cls.create(**kwargs) for _ in range(size)]
+
+        for session, objects in batch.sessions.values():
+            cls._persist_batch(session, objects)
+        return instances
+
+    @classmethod
+    async def create_async(cls, **kwargs: t.Any) -> t.Any:
+        """Create an instance, awaiting the `AsyncSession` on the running event loop"""
+        return await greenlet_spawn(cls.create, **kwargs)
+
+    @classmethod
+    async def create_batch_async(cls, size: int, **kwargs: t.Any) -> t.List[t.Any]:
+        """`create_batch`, awaiting the `AsyncSession` on the running event loop"""
+        return t.cast(
+            t.List[t.Any], await greenlet_spawn(cls.create_batch, size, **kwargs)
+        )
+
+    @classmethod
+    def _persist_batch(
+        cls, session: t.Union[sa_orm.Session, AsyncSession], objects: t.List[t.Any]
+    ) -> None:
+        session_persistence = cls._meta.sqlalchemy_session_persistence
+
+        if session_persistence == SESSION_PERSISTENCE_FLUSH:
+            cls._session_execute(session.flush)
+        elif session_persistence == SESSION_PERSISTENCE_COMMIT:
+            cls._session_execute(session.commit)
+            for stmt in cls._get_refresh_statements(objects):
+                cls._session_execute(session.scalars, stmt).all()
+
+    @classmethod
+    def _get_refresh_statements(
+        cls, objects: t.List[t.Any]
+    ) -> t.Iterator[sa.Select[t.Any]]:
+        """Selects reloading the committed `objects`, instead of refreshing them one by one"""
+        identities: t.Dict[sa_orm.Mapper[t.Any], t.List[t.Tuple[t.Any, ...]]] = {}
+        for obj in objects:
+            state = sa.inspect(obj)
+            if state.identity is not None:
+                identities.setdefault(state.mapper, []).append(state.identity)
+
+        for mapper, keys in identities.items():
+            primary_key = mapper.primary_key
+            for i in range(0, len(keys), _REFRESH_CHUNK_SIZE):
+                chunk = keys[i : i + _REFRESH_CHUNK_SIZE]
+                if len(primary_key) == 1:
+                    criteria = primary_key[0].in_([key[0] for key in chunk])
+                else:
+                    criteria = sa.tuple_(*primary_key).in_(chunk)
+                yield (
+                    sa.select(mapper)
+                    .where(criteria)
+                    .execution_options(populate_existing=True)
+                )
+
     @classmethod
     def _get_or_create(
         cls,
@@ -114,6 +235,12 @@ class EllarSQLFactory(SQLAlchemyModelFactory):
 
         obj = model_class(*args, **kwargs)  # type:ignore[call-arg]
         session.add(obj)
+
+        batch = _factory_batch.get()
+        if batch is not None:
+            batch.add(session, obj)
+            return obj
+
         if session_persistence == SESSION_PERSISTENCE_FLUSH:
             cls._session_execute(session.flush)
         elif session_persistence == SESSION_PERSISTENCE_COMMIT:
@@ -16,6 +16,8 @@ if t.TYPE_CHECKING:
 class AlembicEnvMigrationBase:
     def __init__(self, db_service: EllarSQLService) -> None:
         self.db_service = db_service
+        # migrations compare against the metadata of all models
+        self.db_service.load_models()
         self.use_two_phase = db_service.migration_options.use_two_phase
 
     def get_user_context_configurations(self) -> t.Dict[str, t.Any]:
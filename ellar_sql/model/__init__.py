@@ -6,7 +6,21 @@ import sqlalchemy.orm as sa_orm
 
 from .base import Model
 from .table import Table
-from .typeDecorator import GUID, GenericIP
+from .typeDecorator import (
+    GUID,
+    ULID,
+    UUID7,
+    CompressedBinary,
+    CompressedJSON,
+    CompressedText,
+    GenericIP,
+    GenericNetwork,
+    LazyJSON,
+    Snowflake,
+    SnowflakeGenerator,
+    ulid,
+    uuid7,
+)
 from .utils import make_metadata
 
 if t.TYPE_CHECKING:
@@ -16,7 +30,24 @@ if t.TYPE_CHECKING:
 
     from .table import Table
 
-__all__ = ["Model", "Table", "make_metadata", "GUID", "GenericIP"]
+__all__ = [
+    "Model",
+    "Table",
+    "make_metadata",
+    "GUID",
+    "GenericIP",
+    "GenericNetwork",
+    "CompressedBinary",
+    "CompressedText",
+    "CompressedJSON",
+    "LazyJSON",
+    "UUID7",
+    "ULID",
+    "Snowflake",
+    "SnowflakeGenerator",
+    "uuid7",
+    "ulid",
+]
 
 
 def __getattr__(name: str) -> t.Any:
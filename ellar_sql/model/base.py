@@ -1,9 +1,11 @@
+import collections
+import datetime
 import types
 import typing as t
 
 import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
-from ellar.core import current_injector
+from ellar.threading import run_as_sync
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ellar_sql.constant import DATABASE_BIND_KEY, DATABASE_KEY, DEFAULT_KEY
@@ -16,6 +18,7 @@ from .mixins import (
     ModelTrackMixin,
     NameMixin,
 )
+from .utils import get_select_entity
 
 
 def _update_metadata(namespace: t.Dict[str, t.Any]) -> None:
@@ -45,6 +48,73 @@ def _get_declarative_bases(
     return declarative_bases
 
 
+_NUMPY_DTYPES: t.Dict[t.Type[t.Any], str] = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+    datetime.datetime: "datetime64[us]",
+    datetime.date: "datetime64[D]",
+}
+
+
+def _get_numpy_dtype(column_type: t.Optional[sa.types.TypeEngine[t.Any]]) -> str:
+    try:
+        python_type = column_type.python_type if column_type is not None else None
+    except NotImplementedError:
+        python_type = None
+    return _NUMPY_DTYPES.get(python_type, "object")  # type:ignore[arg-type]
+
+
+@run_as_sync
+async def _execute_rows_async(
+    session: AsyncSession, statement: sa.sql.Select[t.Any]
+) -> t.List[t.Any]:
+    result = await session.execute(statement)
+    return list(result.tuples())
+
+
+def _execute_rows(
+    session: t.Union[sa_orm.Session, AsyncSession], statement: sa.sql.Select[t.Any]
+) -> t.List[t.Any]:
+    if isinstance(session, AsyncSession):
+        return list(_execute_rows_async(session, statement))
+    return list(session.execute(statement).tuples())
+
+
+@run_as_sync
+async def _close_session(session: t.Union[sa_orm.Session, AsyncSession]) -> None:
+    res = session.close()
+    if isinstance(res, t.Coroutine):
+        await res
+
+
+# intermediate declarative bases created by ModelMeta, by (bases, use_bases)
+_model_bases: t.Dict[t.Tuple[t.Any, ...], t.Type[t.Any]] = {}
+
+
+def _get_model_base(
+    bases: t.Tuple[t.Any, ...], use_bases: t.Sequence[t.Any]
+) -> t.Type[t.Any]:
+    """
+    Returns the declarative base for models declared with `bases` and `use_bases`.
+
+    A base is shared by models with the same bases for as long as the default
+    database registry it was mapped with is still in use.
+    """
+    key = (bases, tuple(use_bases))
+    base = _model_bases.get(key)
+
+    if (
+        base is None
+        or not has_metadata(DEFAULT_KEY)
+        or base._sa_registry is not get_metadata(DEFAULT_KEY).registry
+    ):
+        __base_config__ = ModelBaseConfig(use_bases=use_bases, as_base=True)
+        base = ModelMeta("ModelBase", bases, {"__base_config__": __base_config__})
+        _model_bases[key] = base
+    return base
+
+
 class ModelMeta(type):
     def __new__(
         mcs,
@@ -121,14 +191,7 @@ class ModelMeta(type):
 
             return model
 
-        # _update_metadata(namespace)
-        __base_config__ = ModelBaseConfig(use_bases=options.use_bases, as_base=True)
-
-        base = ModelMeta(
-            "ModelBase",
-            bases,
-            {"__base_config__": __base_config__},
-        )
+        base = _get_model_base(bases, options.use_bases)
 
         return types.new_class(
             name, (base,), {"options": options}, lambda ns: ns.update(namespace)
@@ -167,11 +230,137 @@ class ModelBase(ModelDataExportMixin):
     def get_db_session(
         cls,
     ) -> t.Union[sa_orm.Session, AsyncSession, t.Any]:
+        from ellar.core import current_injector
+
         from ellar_sql.services import EllarSQLService
 
         db_service = current_injector.get(EllarSQLService)
         return db_service.session_factory()
 
+    @classmethod
+    def _execute_rows(
+        cls,
+        statement: sa.sql.Select[t.Any],
+        session: t.Optional[t.Union[sa_orm.Session, AsyncSession]] = None,
+    ) -> t.List[t.Any]:
+        created_session = session is None
+        session = session or cls.get_db_session()
+        try:
+            return _execute_rows(session, statement)
+        finally:
+            if created_session:
+                _close_session(session)
+
+    @classmethod
+    def get_record_type(cls) -> t.Type[t.Any]:
+        """
+        Returns an immutable namedtuple type with a field for each model column.
+        """
+        assert cls.__mms__ is not None, f"{cls.__name__} is not a mapped model"
+
+        if cls.__mms__.record_type is None:
+            cls.__mms__.record_type = collections.namedtuple(  # type:ignore[misc]
+                f"{cls.__name__}Record",
+                [c.key for c in cls.__mms__.columns],
+                rename=True,
+            )
+        return cls.__mms__.record_type
+
+    @classmethod
+    def select_light(
+        cls,
+        statement: t.Optional[sa.sql.Select[t.Any]] = None,
+        *,
+        session: t.Optional[t.Union[sa_orm.Session, AsyncSession]] = None,
+    ) -> t.List[t.Any]:
+        """
+        Executes a select of the model as plain rows and returns read-only
+        records from `get_record_type` instead of session tracked model instances.
+
+        If `statement` is None, all rows are selected.
+        """
+        statement = sa.select(cls) if statement is None else statement
+        assert get_select_entity(statement) is cls, (
+            f"select_light requires a select of {cls.__name__}"
+        )
+
+        record_type = cls.get_record_type()
+        rows = cls._execute_rows(
+            statement.with_only_columns(*cls.__mms__.columns), session
+        )
+        return [record_type._make(row) for row in rows]
+
+    @classmethod
+    def to_columns(
+        cls,
+        source: t.Optional[t.Union[sa.sql.Select[t.Any], t.Iterable[t.Any]]] = None,
+        *,
+        session: t.Optional[t.Union[sa_orm.Session, AsyncSession]] = None,
+    ) -> t.Dict[str, t.List[t.Any]]:
+        """
+        Returns column-oriented data, a list of values for each model column.
+
+        `source` can be a select statement, executed without ORM hydration,
+        or a list of model instances. If `source` is None, all rows are selected.
+        """
+        if source is None:
+            source = sa.select(cls)
+
+        if not isinstance(source, sa.sql.Select):
+            instances = list(source)
+            return {
+                c.key: [getattr(instance, c.key, None) for instance in instances]
+                for c in cls.__mms__.columns
+            }
+
+        statement = source
+
+        if get_select_entity(statement) is cls:
+            # select model columns as plain rows instead of model instances
+            statement = statement.with_only_columns(*cls.__mms__.columns)
+            keys = [c.key for c in cls.__mms__.columns]
+        else:
+            keys = [d["name"] for d in statement.column_descriptions]
+
+        rows = cls._execute_rows(statement, session)
+
+        if not rows:
+            return {key: [] for key in keys}
+        return dict(zip(keys, map(list, zip(*rows))))
+
+    @classmethod
+    def to_arrays(
+        cls,
+        source: t.Optional[t.Union[sa.sql.Select[t.Any], t.Iterable[t.Any]]] = None,
+        *,
+        session: t.Optional[t.Union[sa_orm.Session, AsyncSession]] = None,
+    ) -> t.Dict[str, t.Any]:
+        """
+        Same as `to_columns` but returns a NumPy array for each column
+        with a dtype derived from the column type, or `object` when it has NULLs.
+        """
+        try:
+            import numpy as np
+        except ImportError as im_ex:  # pragma: no cover
+            raise RuntimeError(
+                "numpy not found. Please run `pip install numpy`"
+            ) from im_ex
+
+        columns_types = {c.key: c.type for c in cls.__mms__.columns}
+        arrays: t.Dict[str, t.Any] = {}
+
+        for key, values in cls.to_columns(source, session=session).items():
+            dtype = _get_numpy_dtype(columns_types.get(key))
+            if dtype != "object" and any(value is None for value in values):
+                # NULLs would be converted, e.g. to False for booleans or NaN for floats
+                dtype = "object"
+            try:
+                arrays[key] = np.array(values, dtype=dtype)
+            except (TypeError, ValueError, OverflowError):
+                # e.g. integers out of the int64 range
+                arrays[key] = np.array(values, dtype=object)
+        return arrays
+
 
 class Model(ModelBase, metaclass=ModelMeta):
     __base_config__: t.ClassVar[t.Union[ModelBaseConfig, t.Dict[str, t.Any]]]
@@ -4,6 +4,7 @@ import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
 
 from ellar_sql.constant import ABSTRACT_KEY, DATABASE_KEY, DEFAULT_KEY, TABLE_KEY
+from ellar_sql.model.typeDecorator.lazy import instrument_lazy_columns
 from ellar_sql.model.utils import (
     camel_to_snake_case,
     make_metadata,
@@ -73,6 +74,11 @@ class ModelTrackMixin:
                 columns=list(cls.__table__.columns),  # type:ignore[arg-type]
             )
 
+        mapper = cls.__dict__.get("__mapper__")
+        if mapper is not None:
+            # converts raw values of lazy columns on attribute access
+            instrument_lazy_columns(mapper)
+
 
 class ModelDataExportMixin:
     __mms__: t.Optional[ModelMetaStore] = None
@@ -90,24 +96,26 @@ class ModelDataExportMixin:
 
         return f"<{type(self).__name__} {pk}>"
 
-    def _calculate_keys(
-        self,
-        data: t.Dict[str, t.Any],
+    @classmethod
+    def _get_exporter(
+        cls,
         include: t.Optional[t.Set[str]],
         exclude: t.Optional[t.Set[str]],
-    ) -> t.Set[str]:
-        keys: t.Set[str] = set(data.keys())
-
-        if include is None and exclude is None:
-            return keys
-
-        if include is not None:
-            keys &= include
+        exclude_none: bool = False,
+    ) -> t.Callable[[t.Any], t.Dict[str, t.Any]]:
+        assert cls.__mms__ is not None, f"{cls.__name__} is not a mapped model"
 
-        if exclude:
-            keys -= exclude
+        key = (
+            frozenset(include) if include is not None else None,
+            frozenset(exclude) if exclude else None,
+            exclude_none,
+        )
+        exporter = cls.__mms__.exporters.get(key)
 
-        return keys
+        if exporter is None:
+            exporter = _build_exporter(cls.__mms__.columns, *key)
+            cls.__mms__.exporters[key] = exporter
+        return exporter
 
     def _iter(
         self,
@@ -115,19 +123,8 @@ class ModelDataExportMixin:
         exclude: t.Optional[t.Set[str]],
         exclude_none: bool = False,
     ) -> t.Generator[t.Tuple[str, t.Any], None, None]:
-        data = dict(self.__dict__)
-
-        if len(data.keys()) != len(self.__mms__.columns):
-            data = {c.key: getattr(self, c.key, None) for c in self.__mms__.columns}
-
-        allowed_keys = self._calculate_keys(include=include, exclude=exclude, data=data)
-
-        for field_key, v in data.items():
-            if (allowed_keys is not None and field_key not in allowed_keys) or (
-                exclude_none and v is None
-            ):
-                continue
-            yield field_key, v
+        exporter = self._get_exporter(include, exclude, exclude_none)
+        yield from exporter(self).items()
 
     def dict(
         self,
@@ -135,6 +132,39 @@ class ModelDataExportMixin:
         exclude: t.Optional[t.Set[str]] = None,
         exclude_none: bool = False,
     ) -> t.Dict[str, t.Any]:
-        return dict(
-            self._iter(include=include, exclude_none=exclude_none, exclude=exclude)
-        )
+        return self._get_exporter(include, exclude, exclude_none)(self)
+
+    @classmethod
+    def dicts(
+        cls,
+        instances: t.Iterable[t.Any],
+        include: t.Optional[t.Set[str]] = None,
+        exclude: t.Optional[t.Set[str]] = None,
+        exclude_none: bool = False,
+    ) -> t.List[t.Dict[str, t.Any]]:
+        """Exports a list of model instances with the same options as `dict`"""
+        exporter = cls._get_exporter(include, exclude, exclude_none)
+        return [exporter(instance) for instance in instances]
+
+
+def _build_exporter(
+    columns: t.Sequence[sa_orm.ColumnProperty],
+    include: t.Optional[t.FrozenSet[str]],
+    exclude: t.Optional[t.FrozenSet[str]],
+    exclude_none: bool,
+) -> t.Callable[[t.Any], t.Dict[str, t.Any]]:
+    column_keys = tuple(c.key for c in columns)
+
+    def is_allowed(key: str) -> bool:
+        return (include is None or key in include) and not (exclude and key in exclude)
+
+    allowed_keys = tuple(key for key in column_keys if is_allowed(key))
+
+    def export(instance: t.Any) -> t.Dict[str, t.Any]:
+        result = {k: getattr(instance, k, None) for k in allowed_keys}
+
+        if exclude_none:
+            return {k: v for k, v in result.items() if v is not None}
+        return result
+
+    return export
@@ -1,11 +1,52 @@
-from .file import File, FileField, ImageField
+import importlib
+import typing as t
+
+from .compressed import CompressedBinary, CompressedJSON, CompressedText
 from .guid import GUID
-from .ipaddress import GenericIP
+from .ipaddress import GenericIP, GenericNetwork
+from .lazy import LazyTypeDecorator, LazyValue
+from .lazy_json import LazyJSON
+from .ordered_id import (
+    ULID,
+    UUID7,
+    Snowflake,
+    SnowflakeGenerator,
+    get_snowflake_generator,
+    ulid,
+    uuid7,
+)
+
+if t.TYPE_CHECKING:
+    from .file import File, FileField, ImageField
 
 __all__ = [
     "GUID",
     "GenericIP",
+    "GenericNetwork",
+    "CompressedBinary",
+    "CompressedText",
+    "CompressedJSON",
+    "LazyJSON",
+    "LazyTypeDecorator",
+    "LazyValue",
+    "UUID7",
+    "ULID",
+    "Snowflake",
+    "SnowflakeGenerator",
+    "get_snowflake_generator",
+    "uuid7",
+    "ulid",
     "FileField",
     "ImageField",
     "File",
 ]
+
+
+def __getattr__(name: str) -> t.Any:
+    # file fields depend on `sqlalchemy_file` and `ellar_storage` and,
+    # registers session listeners on import, so it's only loaded when used.
+    if name in ("File", "FileField", "ImageField", "file"):
+        file_module = importlib.import_module(".file", __name__)
+        return file_module if name == "file" else getattr(file_module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,63 @@
+import typing as t
+import zlib
+
+import sqlalchemy as sa
+
+from .lazy import LazyTypeDecorator
+from .lazy_json import json_dumps, json_loads
+
+
+class CompressionCodec(t.Protocol):
+    """Any object with `compress` and `decompress` functions, e.g. `zlib`, `lzma` or `bz2` modules"""
+
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def decompress(self, data: bytes, /) -> bytes: ...
+
+
+class CompressedBinary(LazyTypeDecorator):
+    """
+    Binary type compressed with `codec` before being stored in a LargeBinary column.
+
+    :param codec: Compression codec, `zlib` by default.
+        Changing the codec of an existing column requires a data migration.
+    :param lazy: Decompresses values when the model attribute is first accessed
+        instead of when the row is loaded.
+    """
+
+    impl = sa.LargeBinary
+    cache_ok = True
+
+    def __init__(self, codec: CompressionCodec = zlib, lazy: bool = True) -> None:
+        super().__init__(lazy=lazy)
+        self.codec = codec
+
+    def dump_value(self, value: t.Any) -> bytes:
+        return self.codec.compress(value)
+
+    def load_value(self, value: t.Any) -> t.Any:
+        return self.codec.decompress(value)
+
+
+class CompressedText(CompressedBinary):
+    """Text type compressed with `codec`, see `CompressedBinary`"""
+
+    cache_ok = True
+
+    def dump_value(self, value: t.Any) -> bytes:
+        return self.codec.compress(value.encode("utf-8"))
+
+    def load_value(self, value: t.Any) -> t.Any:
+        return self.codec.decompress(value).decode("utf-8")
+
+
+class CompressedJSON(CompressedBinary):
+    """JSON type compressed with `codec`, see `CompressedBinary`"""
+
+    cache_ok = True
+
+    def dump_value(self, value: t.Any) -> bytes:
+        return self.codec.compress(json_dumps(value))
+
+    def load_value(self, value: t.Any) -> t.Any:
+        return json_loads(self.codec.decompress(value))
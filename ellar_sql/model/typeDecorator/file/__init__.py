@@ -1,6 +1,9 @@
+from .cache import StoredFileCache, invalidate_stored_files
+from .deletion import FileDeletionQueue
 from .exceptions import FileExceptionHandler
 from .file import File
 from .file_tracker import ModifiedFileFieldSessionTracker
+from .processing import FileProcessingQueue, run_cpu_bound
 from .processors import Processor, ThumbnailGenerator
 from .types import FileField, ImageField
 from .validators import ContentTypeValidator, ImageValidator, SizeValidator, Validator
@@ -16,6 +19,11 @@ __all__ = [
     "Processor",
     "ThumbnailGenerator",
     "FileExceptionHandler",
+    "FileDeletionQueue",
+    "FileProcessingQueue",
+    "StoredFileCache",
+    "invalidate_stored_files",
+    "run_cpu_bound",
 ]
 
 
@@ -0,0 +1,135 @@
+import typing as t
+
+import sqlalchemy as sa
+from ellar_storage import StorageService
+from libcloud.storage.types import ObjectDoesNotExistError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .cache import invalidate_stored_files
+
+# table counting the rows referencing each content-addressed file
+BLOB_TABLE_NAME = "ellar_sql_file_blobs"
+
+# dialects supporting `INSERT ... ON CONFLICT DO UPDATE`
+_UPSERT_DIALECTS: t.Dict[str, t.Callable[[sa.Table], t.Any]] = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+class FileBlob(t.NamedTuple):
+    """Content-addressed file of a `FileField(deduplicate=True)` column"""
+
+    engine: sa.Engine
+    table: sa.Table
+
+
+def get_blob_table(metadata: sa.MetaData) -> sa.Table:
+    """Returns the reference counts table of `metadata`, which is added on first call"""
+    table = metadata.tables.get(BLOB_TABLE_NAME)
+    if table is None:
+        table = sa.Table(
+            BLOB_TABLE_NAME,
+            metadata,
+            sa.Column("path", sa.String(255), primary_key=True),
+            sa.Column("ref_count", sa.Integer, nullable=False),
+        )
+    return table
+
+
+def add_reference(
+    connection: sa.Connection, table: sa.Table, path: str, count: int = 1
+) -> bool:
+    """
+    Increments the references of `path`, returns `False` if it wasn't referenced.
+
+    The row is upserted, so that concurrent transactions storing the same new content
+    both increment it instead of one of them failing on the primary key.
+    """
+    dialect = connection.dialect
+    if dialect.name in _UPSERT_DIALECTS and dialect.insert_returning:
+        insert = _UPSERT_DIALECTS[dialect.name](table).values(
+            path=path, ref_count=count
+        )
+        ref_count = connection.execute(
+            insert.on_conflict_do_update(
+                index_elements=[table.c.path],
+                set_={"ref_count": table.c.ref_count + count},
+            ).returning(table.c.ref_count)
+        ).scalar_one()
+        # a row left with no references may have had its file deleted already
+        return bool(ref_count != count)
+
+    if _increment_reference(connection, table, path, count):
+        return True
+    return _insert_reference(connection, table, path, count)
+
+
+def _increment_reference(
+    connection: sa.Connection, table: sa.Table, path: str, count: int
+) -> bool:
+    result = connection.execute(
+        sa.update(table)
+        .where(table.c.path == path)
+        .values(ref_count=table.c.ref_count + count)
+    )
+    return bool(result.rowcount)
+
+
+def _insert_reference(
+    connection: sa.Connection, table: sa.Table, path: str, count: int
+) -> bool:
+    """Inserts the references of `path` in a SAVEPOINT, incrementing them if the row was inserted concurrently"""
+    try:
+        with connection.begin_nested():
+            connection.execute(sa.insert(table).values(path=path, ref_count=count))
+    except sa.exc.IntegrityError:
+        _increment_reference(connection, table, path, count)
+        return True
+    return False
+
+
+def remove_reference(
+    connection: sa.Connection, table: sa.Table, path: str, count: int = 1
+) -> None:
+    connection.execute(
+        sa.update(table)
+        .where(table.c.path == path)
+        .values(ref_count=table.c.ref_count - count)
+    )
+
+
+def delete_unreferenced(
+    blobs: t.Dict[str, FileBlob], storage_service: StorageService
+) -> t.List[str]:
+    """
+    Deletes the files of `blobs` that aren't referenced anymore and returns their paths.
+
+    Files are deleted before their reference count is, with the count row locked,
+    so that a concurrent flush referencing the same content waits and uploads it again.
+    """
+    grouped: t.Dict[FileBlob, t.List[str]] = {}
+    for path, blob in blobs.items():
+        grouped.setdefault(blob, []).append(path)
+
+    deleted: t.List[str] = []
+    for blob, paths in grouped.items():
+        table = blob.table
+        with blob.engine.begin() as connection:
+            for path in paths:
+                ref_count = connection.execute(
+                    sa.select(table.c.ref_count)
+                    .where(table.c.path == path)
+                    .with_for_update()
+                ).scalar()
+                if ref_count is not None and ref_count > 0:
+                    continue
+
+                invalidate_stored_files([path])
+                try:
+                    storage_service.delete(path)
+                except ObjectDoesNotExistError:
+                    pass
+                connection.execute(sa.delete(table).where(table.c.path == path))
+                deleted.append(path)
+    return deleted
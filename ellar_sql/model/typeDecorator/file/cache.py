@@ -0,0 +1,124 @@
+import threading
+import time
+import typing as t
+import weakref
+from collections import OrderedDict
+
+from ellar_storage import StorageService, StoredFile
+
+_caches: "weakref.WeakSet[StoredFileCache]" = weakref.WeakSet()
+
+
+class _CacheEntry(t.NamedTuple):
+    # entries of another application's storage service are not returned
+    storage_service: StorageService
+    stored_file: StoredFile
+    expires_at: float
+    url: t.Optional[str] = None
+    url_resolved: bool = False
+
+
+class StoredFileCache:
+    """
+    Bounded LRU cache of the `StoredFile` handles and CDN urls of stored paths,
+    so that accessing `File.file` doesn't query the storage every time.
+
+    Entries are invalidated when their files are deleted or stored again,
+    see `invalidate_stored_files`. Invalidation only reaches the caches of the
+    current process, files changed by other processes are resolved again after `ttl`.
+
+    :param maxsize: Maximum number of cached paths, `0` disables the cache.
+    :param ttl: Seconds after which an entry is resolved again, `None` to keep entries until evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: t.Optional[float] = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_entry(
+        self, storage_service: StorageService, path: str
+    ) -> t.Optional[_CacheEntry]:
+        # called with the lock held
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+
+        if (
+            entry.storage_service is not storage_service
+            or entry.expires_at <= time.monotonic()
+        ):
+            del self._entries[path]
+            return None
+
+        self._entries.move_to_end(path)
+        return entry
+
+    def _set_entry(self, path: str, entry: _CacheEntry) -> None:
+        # called with the lock held
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, storage_service: StorageService, path: str) -> StoredFile:
+        """Returns the `StoredFile` of `path`, resolved by `storage_service` when not cached"""
+        with self._lock:
+            entry = self._get_entry(storage_service, path)
+        if entry is not None:
+            return entry.stored_file
+
+        stored_file = storage_service.get(path)
+        if self.maxsize > 0:
+            with self._lock:
+                self._set_entry(
+                    path,
+                    _CacheEntry(
+                        storage_service,
+                        stored_file,
+                        time.monotonic() + self.ttl
+                        if self.ttl is not None
+                        else float("inf"),
+                    ),
+                )
+        return stored_file
+
+    def get_url(self, storage_service: StorageService, path: str) -> t.Optional[str]:
+        """Returns the CDN url of `path`, resolved once per cached `StoredFile`"""
+        stored_file = self.get(storage_service, path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.url_resolved:
+                return entry.url
+
+        url = stored_file.get_cdn_url()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stored_file is stored_file:
+                self._entries[path] = entry._replace(url=url, url_resolved=True)
+        return url
+
+    def invalidate(self, paths: t.Iterable[str]) -> None:
+        with self._lock:
+            for path in paths:
+                self._entries.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def invalidate_stored_files(paths: t.Iterable[str]) -> None:
+    """
+    Removes `paths` from every `StoredFileCache` of the current process,
+    after they are deleted or replaced.
+    """
+    paths = list(paths)
+    for cache in list(_caches):
+        cache.invalidate(paths)
@@ -0,0 +1,351 @@
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from ellar.core import current_injector
+from ellar_storage import StorageService
+from libcloud.storage.types import ObjectDoesNotExistError
+
+from .cache import invalidate_stored_files
+
+logger = logging.getLogger("ellar_sql.file")
+
+_IN_PROGRESS = float("inf")
+
+
+class FileDeletionQueue:
+    """
+    Deletes storage files on a background thread, in batches of `batch_size` paths
+    deleted concurrently by up to `max_workers` threads.
+
+    Failed deletions are retried after `retry_delay` seconds, up to `max_retries` times.
+    Pending paths are saved, when `journal_path` is set, in a journal of each process,
+    `<journal_path>.<pid>`, so that processes sharing `journal_path` don't overwrite each other.
+    Journals are appended to, one JSON line of queued or processed paths per call or batch,
+    and are rewritten with only the pending paths once they grow too large.
+    Journals of processes that are no longer running are taken over by the next queue created.
+
+    :param journal_path: Path of the JSON lines files of the pending paths.
+    :param batch_size: Maximum number of paths deleted before the journal is saved.
+    :param max_workers: Maximum number of paths of a batch deleted at the same time.
+    :param max_retries: Number of retries of a failed deletion before it's dropped.
+    :param retry_delay: Seconds between retries of a failed deletion.
+    :param synchronous: Deletes files when they are queued, e.g. in tests.
+    """
+
+    def __init__(
+        self,
+        journal_path: t.Optional[str] = None,
+        batch_size: int = 100,
+        max_workers: int = 8,
+        max_retries: int = 3,
+        retry_delay: float = 5.0,
+        synchronous: bool = False,
+    ) -> None:
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.synchronous = synchronous
+
+        self._storage_service: t.Optional[StorageService] = None
+        # pending paths and their [attempts, time of the next attempt]
+        self._pending: t.Dict[str, t.List[float]] = {}
+        self._condition = threading.Condition()
+        self._processing = 0
+        self._thread: t.Optional[threading.Thread] = None
+        self._executor: t.Optional[ThreadPoolExecutor] = None
+        # paths written to the journal since it was last rewritten
+        self._journal_entries = 0
+        self._stopped = False
+
+        self._load_journals()
+
+    @property
+    def pending(self) -> t.List[str]:
+        with self._condition:
+            return list(self._pending)
+
+    @property
+    def journal_file(self) -> t.Optional[str]:
+        """Journal of the pending paths of this process"""
+        if self.journal_path is None:
+            return None
+        return f"{self.journal_path}.{os.getpid()}"
+
+    @classmethod
+    def _is_running(cls, pid: int) -> bool:
+        if pid == os.getpid():
+            # journal of a previous process with the same pid
+            return False
+        if os.name != "posix":  # pragma: no cover
+            # can't check other processes, their journals are left to them
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:  # pragma: no cover
+            pass
+        return True
+
+    def _get_orphaned_journals(self) -> t.List[str]:
+        assert self.journal_path is not None
+        journals = [self.journal_path]
+
+        pattern = re.compile(rf"{re.escape(self.journal_path)}\.(\d+)$")
+        for journal in glob.glob(f"{glob.escape(self.journal_path)}.*"):
+            match = pattern.match(journal)
+            if match and not self._is_running(int(match.group(1))):
+                journals.append(journal)
+        return journals
+
+    def _load_journals(self) -> None:
+        if self.journal_path is None:
+            return
+
+        claimed = []
+        for journal in self._get_orphaned_journals():
+            # renamed first, so that a journal is only taken over by one process
+            claimed_journal = f"{journal}.claimed-{os.getpid()}"
+            try:
+                os.rename(journal, claimed_journal)
+            except FileNotFoundError:
+                continue
+
+            for path in self._read_journal(claimed_journal):
+                self._pending.setdefault(path, [0, 0.0])
+            claimed.append(claimed_journal)
+
+        if claimed:
+            self._save_journal()
+            for claimed_journal in claimed:
+                os.remove(claimed_journal)
+
+    @classmethod
+    def _read_journal(cls, journal_path: str) -> t.List[str]:
+        with open(journal_path) as journal:
+            content = journal.read()
+
+        if content.startswith("["):
+            # journal of a previous version, a JSON list of the pending paths
+            return list(json.loads(content))
+
+        pending: t.Dict[str, None] = {}
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # line partially written by a stopped process
+                continue
+            for path in entry.get("add", []):
+                pending[path] = None
+            for path in entry.get("done", []):
+                pending.pop(path, None)
+        return list(pending)
+
+    def _save_journal(self) -> None:
+        # called with the condition lock held
+        journal_file = self.journal_file
+        if journal_file is None:
+            return
+
+        self._journal_entries = len(self._pending)
+        if not self._pending:
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+            return
+
+        tmp_path = f"{journal_file}.tmp"
+        with open(tmp_path, "w") as journal:
+            journal.write(json.dumps({"add": list(self._pending)}) + "\n")
+        os.replace(tmp_path, journal_file)
+
+    def _append_journal(self, action: str, paths: t.List[str]) -> None:
+        # called with the condition lock held
+        if self.journal_file is None or not paths:
+            return
+
+        self._journal_entries += len(paths)
+        if (
+            not self._pending
+            or self._journal_entries > 2 * len(self._pending) + self.batch_size
+        ):
+            # removed once empty, rewritten once mostly made of processed paths
+            self._save_journal()
+            return
+
+        with open(self.journal_file, "a") as journal:
+            journal.write(json.dumps({action: paths}) + "\n")
+
+    def put(
+        self,
+        paths: t.Iterable[str],
+        storage_service: t.Optional[StorageService] = None,
+    ) -> None:
+        """Queues `paths` for deletion"""
+        self._storage_service = storage_service or current_injector.get(StorageService)
+
+        with self._condition:
+            queued = [path for path in paths if path not in self._pending]
+            for path in queued:
+                self._pending[path] = [0, 0.0]
+            self._append_journal("add", queued)
+
+            if self.synchronous:
+                self._process_ready()
+            else:
+                self._start()
+                self._condition.notify_all()
+
+    def start(self, storage_service: t.Optional[StorageService] = None) -> None:
+        """Starts deleting the paths of the journal, without waiting for new paths to be queued"""
+        self._storage_service = storage_service or current_injector.get(StorageService)
+
+        with self._condition:
+            if self.synchronous:
+                self._process_ready()
+            else:
+                self._start()
+
+    def _start(self) -> None:
+        # called with the condition lock held
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="ellar-sql-file-deletion", daemon=True
+            )
+            self._thread.start()
+
+    def _take_ready_batch(self) -> t.List[str]:
+        # called with the condition lock held
+        now = time.monotonic()
+        batch = [path for path, (_, at) in self._pending.items() if at <= now][
+            : self.batch_size
+        ]
+        for path in batch:
+            # in progress, not ready again until processed
+            self._pending[path][1] = _IN_PROGRESS
+        return batch
+
+    def _get_wait_timeout(self) -> t.Optional[float]:
+        next_attempts = [at for _, at in self._pending.values() if at != _IN_PROGRESS]
+        if not next_attempts:
+            return None
+        return max(min(next_attempts) - time.monotonic(), 0)
+
+    def _delete(self, path: str) -> bool:
+        assert self._storage_service is not None
+        try:
+            self._storage_service.delete(path)
+        except ObjectDoesNotExistError:
+            pass
+        except Exception as ex:
+            logger.warning("Failed to delete %s: %s", path, ex)
+            return False
+        return True
+
+    def _delete_batch(self, batch: t.List[str]) -> t.Dict[str, bool]:
+        invalidate_stored_files(batch)
+
+        if len(batch) == 1 or self.max_workers <= 1:
+            return {path: self._delete(path) for path in batch}
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="ellar-sql-file-deletion"
+            )
+        return dict(zip(batch, self._executor.map(self._delete, batch)))
+
+    def _process(self, batch: t.List[str]) -> None:
+        # called with the condition lock released
+        try:
+            results = self._delete_batch(batch)
+        except Exception as ex:
+            logger.warning("Failed to delete %d files: %s", len(batch), ex)
+            results = dict.fromkeys(batch, False)
+
+        with self._condition:
+            try:
+                done = []
+                for path, deleted in results.items():
+                    attempts = int(self._pending[path][0]) + 1
+
+                    if deleted or attempts > self.max_retries:
+                        if not deleted:
+                            logger.warning(
+                                "Giving up deleting %s after %d attempts",
+                                path,
+                                attempts,
+                            )
+                        del self._pending[path]
+                        done.append(path)
+                    else:
+                        self._pending[path] = [
+                            attempts,
+                            time.monotonic() + self.retry_delay,
+                        ]
+
+                self._append_journal("done", done)
+            finally:
+                self._processing -= 1
+                self._condition.notify_all()
+
+    def _process_ready(self) -> None:
+        # synchronous mode, called with the condition lock held
+        batch = self._take_ready_batch()
+        while batch:
+            self._processing += 1
+            self._condition.release()
+            try:
+                self._process(batch)
+            finally:
+                self._condition.acquire()
+            batch = self._take_ready_batch()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopped:
+                        return
+                    batch = self._take_ready_batch()
+                    if batch:
+                        break
+                    self._condition.wait(self._get_wait_timeout())
+
+                self._processing += 1
+
+            try:
+                self._process(batch)
+            except Exception:
+                # e.g. the journal can't be written, paths are still deleted
+                logger.exception("Failed to save the file deletion journal")
+
+    def join(self, timeout: t.Optional[float] = None) -> bool:
+        """Waits until queued paths are deleted or dropped, returns `False` on timeout"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._processing, timeout
+            )
+
+    def stop(self) -> None:
+        """Stops the background thread, pending paths are kept in the journal"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -1,16 +1,74 @@
+import hashlib
+import threading
 import typing as t
 import uuid
 import warnings
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
 
 from ellar.common.compatible import AttributeDictAccessMixin
 from ellar.core import current_injector
 from ellar_storage import StorageService, StoredFile
+from libcloud.storage.types import ObjectDoesNotExistError
 from sqlalchemy_file.file import File as BaseFile
+from sqlalchemy_file.helpers import INMEMORY_FILESIZE
 from starlette.datastructures import UploadFile
 
 from ellar_sql.constant import DEFAULT_STORAGE_PLACEHOLDER
 
+from .cache import StoredFileCache, invalidate_stored_files
+
+# serializes concurrent uploads of the same content, striped by digest
+_content_locks = [threading.Lock() for _ in range(64)]
+
+
+class ContentStream:
+    """
+    Iterates a file object in `chunk_size` chunks, computing its size
+    and sha256 digest on the fly, so that storages receive the content
+    without it being read into memory.
+    """
+
+    def __init__(self, fileobj: t.Any, chunk_size: int) -> None:
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.completed = False
+        self._hash = hashlib.sha256()
+
+        if self._seekable():
+            fileobj.seek(0)
+
+    def _seekable(self) -> bool:
+        seekable = getattr(self.fileobj, "seekable", None)
+        return (
+            bool(seekable()) if seekable is not None else hasattr(self.fileobj, "seek")
+        )
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def __iter__(self) -> "ContentStream":
+        return self
+
+    def __next__(self) -> bytes:
+        chunk = self.fileobj.read(self.chunk_size)
+
+        if not chunk:
+            if not self.completed:
+                self.completed = True
+                # rewind for processors reading `original_content` after the upload
+                if self._seekable():
+                    self.fileobj.seek(0)
+            raise StopIteration
+
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        return t.cast(bytes, chunk)
+
 
 class File(BaseFile, AttributeDictAccessMixin):
     """Takes a file as content and uploads it to the appropriate storage
@@ -28,6 +86,8 @@ class File(BaseFile, AttributeDictAccessMixin):
         content_type:   This is the content type of the uploaded file
         uploaded_at (datetime):    This is the upload date in ISO format
         url (str):            CDN url of the uploaded file
+        size (int):     This is the size of the uploaded file in bytes
+        content_hash (str): This is the sha256 hex digest of the uploaded content
         file:           Only available for saved content, internally call
                       [StorageManager.get_file()][sqlalchemy_file.storage.StorageManager.get_file]
                       on path and return an instance of `StoredFile`
@@ -47,6 +107,12 @@ class File(BaseFile, AttributeDictAccessMixin):
     size: int
 
     files: t.List[str]
+    content_hash: str
+
+    # size of the chunks read from file content during uploads
+    chunk_size: int = 64 * 1024
+    # cache of the `StoredFile` handles returned by `file`
+    stored_file_cache: StoredFileCache = StoredFileCache(maxsize=1024)
 
     # Type hints for dict-like methods from parent classes
     if t.TYPE_CHECKING:
@@ -65,9 +131,12 @@ class File(BaseFile, AttributeDictAccessMixin):
         content_path: t.Optional[str] = None,
         **kwargs: t.Dict[str, t.Any],
     ) -> None:
+        size: t.Optional[int] = None
+
         if isinstance(content, UploadFile):
             filename = content.filename
             content_type = content.content_type
+            size = getattr(content, "size", None)
 
             kwargs.setdefault("headers", dict(content.headers))
 
@@ -80,9 +149,41 @@ class File(BaseFile, AttributeDictAccessMixin):
             content_type=content_type,
             **kwargs,
         )
+        if size is not None:
+            self["size"] = size
 
-    def save_to_storage(self, upload_storage: t.Optional[str] = None) -> None:
-        """Save current file into provided `upload_storage`."""
+    def _hash_content(self) -> ContentStream:
+        # reads the content once to compute its digest, before it's uploaded
+        if self.content_path is not None:
+            with open(self.content_path, "rb") as fileobj:
+                stream = ContentStream(fileobj, self.chunk_size)
+                for _ in stream:
+                    pass
+            return stream
+
+        content = self.original_content
+        stream = ContentStream(content, self.chunk_size)
+        if not stream._seekable():
+            # keeps a copy of non seekable content to upload it after hashing
+            copy = SpooledTemporaryFile(INMEMORY_FILESIZE)
+            for chunk in stream:
+                copy.write(chunk)
+            copy.seek(0)
+            self["original_content"] = copy
+            return stream
+
+        for _ in stream:
+            pass
+        return stream
+
+    def save_to_storage(
+        self, upload_storage: t.Optional[str] = None, deduplicate: bool = False
+    ) -> None:
+        """Save current file into provided `upload_storage`.
+
+        With `deduplicate`, the file is stored under the sha256 digest of its content,
+        and not uploaded again when a file with the same content is already stored.
+        """
         storage_service = current_injector.get(StorageService)
         valid_upload_storage = storage_service.get_container(
             upload_storage
@@ -108,13 +209,38 @@ class File(BaseFile, AttributeDictAccessMixin):
         extra["meta_data"].update(
             {"filename": self.filename, "content_type": self.content_type}
         )
-        stored_file = self.store_content(
-            self.original_content,
-            valid_upload_storage,
-            extra=extra,
-            headers=self.get("headers", None),
-            content_path=self.content_path,
-        )
+        content = None
+        if deduplicate:
+            digest = self._hash_content()
+            name = digest.hexdigest()
+            self["size"] = digest.size
+            self["content_hash"] = name
+
+            with _content_locks[int(name[:8], 16) % len(_content_locks)]:
+                try:
+                    stored_file = storage_service.get(f"{valid_upload_storage}/{name}")
+                    self["files"].append(f"{valid_upload_storage}/{name}")
+                except ObjectDoesNotExistError:
+                    stored_file = self.store_content(
+                        self.original_content,
+                        valid_upload_storage,
+                        name=name,
+                        extra=extra,
+                        headers=self.get("headers", None),
+                        content_path=self.content_path,
+                    )
+        else:
+            content = self.original_content
+            if content is not None and hasattr(content, "read"):
+                content = ContentStream(content, self.chunk_size)
+
+            stored_file = self.store_content(
+                content,
+                valid_upload_storage,
+                extra=extra,
+                headers=self.get("headers", None),
+                content_path=self.content_path,
+            )
         self["file_id"] = stored_file.name
         self["upload_storage"] = valid_upload_storage
         self["uploaded_at"] = datetime.utcnow().isoformat()
@@ -122,6 +248,10 @@ class File(BaseFile, AttributeDictAccessMixin):
         self["url"] = stored_file.get_cdn_url()
         self["saved"] = True
 
+        if isinstance(content, ContentStream) and content.completed:
+            self["size"] = content.size
+            self["content_hash"] = content.hexdigest()
+
     def store_content(  # type:ignore[override]
         self,
         content: t.Any,
@@ -139,6 +269,9 @@ class File(BaseFile, AttributeDictAccessMixin):
         name = name or str(uuid.uuid4())
         storage_service = current_injector.get(StorageService)
 
+        if hasattr(content, "read"):
+            content = ContentStream(content, self.chunk_size)
+
         stored_file = storage_service.save_content(
             name=name,
             content=content,
@@ -149,13 +282,21 @@ class File(BaseFile, AttributeDictAccessMixin):
             content_path=content_path,
         )
         self["files"].append(f"{upload_storage}/{name}")
+        invalidate_stored_files([f"{upload_storage}/{name}"])
         return stored_file
 
     @property
     def file(self) -> StoredFile:  # type:ignore[override]
         if self.get("saved", False):
             storage_service = current_injector.get(StorageService)
-            return storage_service.get(self["path"])
+            return self.stored_file_cache.get(storage_service, self["path"])
+        raise RuntimeError("Only available for saved file")
+
+    def get_cdn_url(self) -> t.Optional[str]:
+        """Resolves the current CDN url of the saved file, cached like `file`"""
+        if self.get("saved", False):
+            storage_service = current_injector.get(StorageService)
+            return self.stored_file_cache.get_url(storage_service, self["path"])
         raise RuntimeError("Only available for saved file")
 
     def __missing__(self, name: t.Any) -> t.Any:
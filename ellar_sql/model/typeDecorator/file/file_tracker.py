@@ -1,12 +1,69 @@
+import contextvars
+import itertools
+import logging
+import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor, wait
+from tempfile import SpooledTemporaryFile
 
+import sqlalchemy as sa
 from ellar.core import current_injector
+from ellar.threading import execute_coroutine
 from ellar_storage import StorageService
-from sqlalchemy import event, orm
+from libcloud.storage.types import ObjectDoesNotExistError
+from sqlalchemy import event, inspect, orm
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm.attributes import get_history
+from sqlalchemy_file.helpers import INMEMORY_FILESIZE
 from sqlalchemy_file.types import FileFieldSessionTracker
 
+from ellar_sql.constant import (
+    FILE_DELETION_QUEUE,
+    FILE_PROCESSING_QUEUE,
+    FILE_UPLOAD_WORKERS,
+)
+
+from .blobs import (
+    FileBlob,
+    add_reference,
+    delete_unreferenced,
+    get_blob_table,
+    remove_reference,
+)
+from .cache import invalidate_stored_files
+from .file import ContentStream, File
+from .processing import get_default_processing_queue
+from .types import FileField, get_file_metadata_value
+
+logger = logging.getLogger("ellar_sql.file")
+
+_T = t.TypeVar("_T")
+
+
+class _FileUpload(t.NamedTuple):
+    file: File
+    column_type: FileField
+    # reference counts of the file when the column is deduplicated
+    blob: t.Optional[FileBlob] = None
+
+
+class _DeferredProcessing(t.NamedTuple):
+    engine: sa.Engine
+    mapper: orm.Mapper  # type:ignore[type-arg]
+    identity: t.Tuple[t.Any, ...]
+    key: str
+    file: File
+
 
 class ModifiedFileFieldSessionTracker(FileFieldSessionTracker):
+    @classmethod
+    def clear_session(cls, session: orm.Session) -> None:
+        super().clear_session(session)
+        if hasattr(session, "_deferred_processing"):
+            del session._deferred_processing
+        if hasattr(session, "_file_blobs"):
+            del session._file_blobs
+
     @classmethod
     def delete_files(cls, paths: t.Set[str], ctx: str) -> None:
         if len(paths) == 0:
@@ -14,9 +71,513 @@ class ModifiedFileFieldSessionTracker(FileFieldSessionTracker):
 
         storage_service = current_injector.get(StorageService)
 
+        invalidate_stored_files(paths)
         for path in paths:
             storage_service.delete(path)
 
+    @classmethod
+    def _delete_session_files(
+        cls, session: orm.Session, paths: t.Set[str], ctx: str
+    ) -> None:
+        # cached handles are invalidated when files aren't referenced anymore, even if queued
+        invalidate_stored_files(paths)
+
+        blobs: t.Dict[str, FileBlob] = getattr(session, "_file_blobs", {})
+        shared = {path: blobs[path] for path in paths if path in blobs}
+        if shared:
+            # content-addressed files are deleted when no row references them anymore
+            delete_unreferenced(shared, current_injector.get(StorageService))
+            paths = paths - shared.keys()
+
+        queue = session.info.get(FILE_DELETION_QUEUE)
+
+        if queue is not None and paths:
+            queue.put(paths)
+        else:
+            cls.delete_files(paths, ctx)
+        cls.clear_session(session)
+
+    @classmethod
+    def _after_commit(cls, session: orm.Session) -> None:
+        """
+        After commit, new files are queued for their deferred processors
+        and old files are deleted or queued for deletion.
+        """
+        deferred: t.Dict[str, _DeferredProcessing] = getattr(
+            session, "_deferred_processing", {}
+        )
+        if deferred:
+            queue = session.info.get(FILE_PROCESSING_QUEUE)
+            if queue is None:
+                queue = get_default_processing_queue()
+            for job in deferred.values():
+                queue.put(cls.process_deferred, job)
+
+        cls._delete_session_files(
+            session, getattr(session, "_old_files", set()), "after_commit"
+        )
+
+    @classmethod
+    def _after_soft_rollback(cls, session: orm.Session, _: t.Any) -> None:
+        """After rollback, new files are deleted or queued for deletion."""
+        cls._delete_session_files(
+            session, getattr(session, "_new_files", set()), "after_soft_rollback"
+        )
+
+    @classmethod
+    def _prepare_uploads(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        obj: t.Any,
+        key: str,
+    ) -> t.List[_FileUpload]:
+        """
+        Converts and validates the files of `obj.key`, like `prepare_file_attr`,
+        and returns the ones to upload.
+        """
+        value = getattr(obj, key)
+        column_type = mapper.attrs[key].columns[0].type  # type:ignore[attr-defined]
+        upload_type = column_type.upload_type
+
+        converted = False
+        files: t.List[File] = []
+        for item in value if isinstance(value, list) else [value]:
+            if not isinstance(item, upload_type):
+                item = upload_type(item)
+                converted = True
+            files.append(item)
+
+        blob: t.Optional[FileBlob] = None
+        if column_type.deduplicate:
+            blob = cls._get_file_blob(inspect(obj).session, mapper, key)
+
+        uploads: t.List[_FileUpload] = []
+        for file in files:
+            if getattr(file, "saved", False):
+                continue
+
+            file.apply_validators(column_type.validators, key)
+            if column_type.extra is not None and file.get("extra", None) is None:
+                file["extra"] = column_type.extra
+            if column_type.headers is not None and file.get("headers", None) is None:
+                file["headers"] = column_type.headers
+            uploads.append(_FileUpload(file, column_type, blob))
+
+        if converted:
+            setattr(obj, key, files if column_type.multiple else files[0])
+        return uploads
+
+    @classmethod
+    def prepare_file_attr(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        obj: t.Any,
+        key: str,
+    ) -> t.Tuple[bool, t.Any]:
+        """
+        Converts, validates and uploads the files of `obj.key`, like
+        `FileFieldSessionTracker.prepare_file_attr`, storing the files of
+        deduplicated columns under the hash of their content.
+        """
+        uploads = cls._prepare_uploads(mapper, obj, key)
+        try:
+            for upload in uploads:
+                cls._upload(upload)
+        finally:
+            cls._track_blobs(inspect(obj).session, uploads)
+        return bool(uploads), getattr(obj, key)
+
+    @classmethod
+    def _get_file_blob(
+        cls,
+        session: orm.Session,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        key: str,
+    ) -> FileBlob:
+        column = mapper.attrs[key].columns[0]  # type:ignore[attr-defined]
+        return FileBlob(
+            session.get_bind(mapper=mapper).engine,
+            get_blob_table(column.table.metadata),
+        )
+
+    @classmethod
+    def _track_blobs(cls, session: orm.Session, uploads: t.List[_FileUpload]) -> None:
+        """Records the content-addressed files uploaded, deleted on rollback unless referenced"""
+        for upload in uploads:
+            if upload.blob is None or not upload.file.get("saved", False):
+                continue
+
+            session._file_blobs = getattr(session, "_file_blobs", {})  # type:ignore[attr-defined]
+            session._file_blobs[upload.file["path"]] = upload.blob  # type:ignore[attr-defined]
+
+    @classmethod
+    def _count_paths(cls, value: t.Any) -> t.Dict[str, t.List[File]]:
+        # files of a column value by path, files with the same content share their path
+        files: t.Dict[str, t.List[File]] = {}
+        for file in value if isinstance(value, list) else [value]:
+            if file is not None:
+                files.setdefault(file["path"], []).append(file)
+        return files
+
+    @classmethod
+    def _deduplicated_keys(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+    ) -> t.List[str]:
+        return [
+            key
+            for key in cls.mapped_entities.get(mapper.class_, [])
+            if mapper.attrs[key].columns[0].type.deduplicate  # type:ignore[attr-defined]
+        ]
+
+    @classmethod
+    def _update_blob_references(
+        cls,
+        connection: sa.Connection,
+        obj: t.Any,
+        blob: FileBlob,
+        old_value: t.Any,
+        new_value: t.Any,
+    ) -> None:
+        session = inspect(obj).session
+        session._file_blobs = getattr(session, "_file_blobs", {})
+        old_files = cls._count_paths(old_value)
+        new_files = cls._count_paths(new_value)
+
+        for path in old_files.keys() | new_files.keys():
+            count = len(new_files.get(path, [])) - len(old_files.get(path, []))
+            session._file_blobs[path] = blob
+
+            if count > 0:
+                if not add_reference(connection, blob.table, path, count):
+                    cls._restore_blob(new_files[path][0])
+            elif count < 0:
+                remove_reference(connection, blob.table, path, -count)
+                cls.add_old_files_to_session(session, [path])
+
+    @classmethod
+    def _restore_blob(cls, file: File) -> None:
+        """
+        Uploads again a content-addressed file that is referenced for the first time,
+        in case it was deleted as unreferenced after being found in the storage.
+        """
+        storage_service = current_injector.get(StorageService)
+        try:
+            storage_service.get(file["path"])
+            return
+        except ObjectDoesNotExistError:
+            pass
+
+        content = file.get("original_content")
+        if content is None and file.get("content_path") is None:
+            logger.warning("Missing content of deduplicated file %s", file["path"])
+            return
+
+        storage_service.save_content(
+            name=file["file_id"],
+            content=ContentStream(content, file.chunk_size)
+            if content is not None
+            else None,
+            upload_storage=file["upload_storage"],
+            extra={"content_type": file["content_type"]},
+            headers=file.get("headers", None),
+            content_path=file.get("content_path"),
+        )
+
+    @classmethod
+    def _before_insert_blobs(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        connection: sa.Connection,
+        obj: t.Any,
+    ) -> None:
+        """References the content-addressed files of a new row."""
+        for key in cls._deduplicated_keys(mapper):
+            blob = cls._get_file_blob(inspect(obj).session, mapper, key)
+            cls._update_blob_references(connection, obj, blob, None, getattr(obj, key))
+
+    @classmethod
+    def _before_update_blobs(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        connection: sa.Connection,
+        obj: t.Any,
+    ) -> None:
+        """
+        Updates the references of the content-addressed files added to
+        or removed from an updated row, compared to its stored value.
+        """
+        state = inspect(obj)
+        for key in cls._deduplicated_keys(mapper):
+            if not get_history(obj, key).has_changes():
+                continue
+
+            # the previous value isn't in the history when it was expired or changed in place
+            column = mapper.attrs[key].columns[0]  # type:ignore[attr-defined]
+            old_value = connection.execute(
+                sa.select(column).where(
+                    *(
+                        pk_column == value
+                        for pk_column, value in zip(
+                            mapper.primary_key, state.identity or ()
+                        )
+                    )
+                )
+            ).scalar()
+
+            blob = cls._get_file_blob(state.session, mapper, key)
+            cls._update_blob_references(
+                connection, obj, blob, old_value, getattr(obj, key)
+            )
+
+    @classmethod
+    def _after_delete_blobs(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        connection: sa.Connection,
+        obj: t.Any,
+    ) -> None:
+        """Removes the references of the content-addressed files of a deleted row."""
+        for key in cls._deduplicated_keys(mapper):
+            blob = cls._get_file_blob(inspect(obj).session, mapper, key)
+            cls._update_blob_references(connection, obj, blob, getattr(obj, key), None)
+
+    @classmethod
+    def _metadata_column_keys(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+    ) -> t.List[str]:
+        return [
+            key
+            for key in cls.mapped_entities.get(mapper.class_, [])
+            if mapper.attrs[key].columns[0].type.metadata_columns  # type:ignore[attr-defined]
+        ]
+
+    @classmethod
+    def _sync_metadata_columns(
+        cls,
+        mapper: orm.Mapper,  # type:ignore[type-arg]
+        connection: sa.Connection,
+        obj: t.Any,
+    ) -> None:
+        """Copies file attributes to the metadata columns of changed files."""
+        state = inspect(obj)
+        for key in cls._metadata_column_keys(mapper):
+            if state.has_identity and not get_history(obj, key).has_changes():
+                continue
+
+            column = mapper.attrs[key].columns[0]  # type:ignore[attr-defined]
+            value = getattr(obj, key)
+            for name in column.type.metadata_columns:
+                metadata_column = column.table.c[f"{column.name}_{name}"]
+                prop = mapper.get_property_by_column(metadata_column)
+                setattr(obj, prop.key, get_file_metadata_value(value, name))
+
+    @classmethod
+    def _after_configured(cls) -> None:
+        super()._after_configured()
+
+        for entity in cls.mapped_entities:
+            mapper = sa.inspect(entity)
+            if cls._deduplicated_keys(mapper):
+                event.listen(entity, "before_insert", cls._before_insert_blobs)
+                event.listen(entity, "before_update", cls._before_update_blobs)
+                event.listen(entity, "after_delete", cls._after_delete_blobs)
+            if cls._metadata_column_keys(mapper):
+                event.listen(entity, "before_insert", cls._sync_metadata_columns)
+                event.listen(entity, "before_update", cls._sync_metadata_columns)
+
+    @classmethod
+    def _upload(cls, upload: _FileUpload) -> None:
+        start = time.perf_counter()
+        upload.file.save_to_storage(
+            upload.column_type.upload_storage, deduplicate=upload.blob is not None
+        )
+        upload.file.apply_processors(
+            upload.column_type.processors, upload.column_type.upload_storage
+        )
+        logger.debug(
+            "Uploaded %s (%s bytes) in %.3fs",
+            upload.file.path,
+            upload.file.size,
+            time.perf_counter() - start,
+        )
+
+    @classmethod
+    def upload_files(
+        cls, session: orm.Session, uploads: t.List[_FileUpload], max_workers: int
+    ) -> None:
+        """
+        Uploads files concurrently on at most `max_workers` threads and waits for all of them.
+        Uploaded files are deleted if the session is rolled back, including
+        when another upload failed.
+        """
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(uploads))) as pool:
+            # each upload runs in a copy of the current context to access `current_injector`
+            futures = [
+                pool.submit(contextvars.copy_context().run, cls._upload, upload)
+                for upload in uploads
+            ]
+            wait(futures)
+
+        cls.add_new_files_to_session(
+            session, [path for upload in uploads for path in upload.file["files"]]
+        )
+        cls._track_blobs(session, uploads)
+        for future in futures:
+            future.result()
+
+    @classmethod
+    def _before_flush(cls, session: orm.Session, *args: t.Any) -> None:
+        """
+        Uploads the new files of the flush concurrently when `FILE_UPLOAD_WORKERS`
+        is set in `session.info`, before mapper events would upload them one by one.
+        """
+        max_workers = session.info.get(FILE_UPLOAD_WORKERS)
+        if not max_workers or max_workers <= 1:
+            return
+
+        uploads: t.List[_FileUpload] = []
+        for obj in itertools.chain(session.new, session.dirty):
+            mapper = inspect(obj).mapper
+            for key in cls.mapped_entities.get(mapper.class_, []):
+                if getattr(obj, key) is not None:
+                    uploads.extend(cls._prepare_uploads(mapper, obj, key))
+
+        if uploads:
+            cls.upload_files(session, uploads, max_workers)
+
+    @classmethod
+    def _after_flush(cls, session: orm.Session, *args: t.Any) -> None:
+        """Records the files uploaded by the flush for columns with deferred processors."""
+        new_files: t.Set[str] = getattr(session, "_new_files", set())
+        if not new_files:
+            return
+
+        deferred: t.Dict[str, _DeferredProcessing] = getattr(
+            session, "_deferred_processing", {}
+        )
+        for obj in itertools.chain(session.new, session.dirty):
+            mapper = inspect(obj).mapper
+            for key in cls.mapped_entities.get(mapper.class_, []):
+                column_type = mapper.attrs[key].columns[0].type
+                value = getattr(obj, key)
+                if not column_type.deferred_processors or value is None:
+                    continue
+
+                for file in value if isinstance(value, list) else [value]:
+                    if file.get("saved", False) and file["path"] in new_files:
+                        deferred[file["path"]] = _DeferredProcessing(
+                            session.get_bind(mapper=mapper).engine,
+                            mapper,
+                            tuple(mapper.primary_key_from_instance(obj)),
+                            key,
+                            file,
+                        )
+
+        if deferred:
+            session._deferred_processing = deferred  # type:ignore[attr-defined]
+
+    @classmethod
+    def _select_stored_file(
+        cls, connection: sa.Connection, job: _DeferredProcessing
+    ) -> t.Tuple[t.Any, t.Optional[File]]:
+        # returns the current value of the column and its file of `job`, if not replaced
+        column = job.mapper.attrs[job.key].columns[0]  # type:ignore[attr-defined]
+        value = connection.execute(
+            sa.select(column).where(cls._identity_clause(job))
+        ).scalar()
+
+        for file in value if isinstance(value, list) else [value]:
+            if file is not None and file.get("file_id") == job.file["file_id"]:
+                return value, file
+        return value, None
+
+    @classmethod
+    def _identity_clause(cls, job: _DeferredProcessing) -> sa.ColumnElement[bool]:
+        return sa.and_(
+            *(
+                column == value
+                for column, value in zip(job.mapper.primary_key, job.identity)
+            )
+        )
+
+    @classmethod
+    def _run_in_transaction(
+        cls, engine: sa.Engine, fn: t.Callable[[sa.Connection], _T]
+    ) -> _T:
+        """Calls `fn` in a transaction of `engine`, on an event loop for async drivers"""
+        if not engine.dialect.is_async:
+            with engine.begin() as connection:
+                return fn(connection)
+
+        async def _run() -> _T:
+            async with AsyncEngine(engine).begin() as connection:
+                return await connection.run_sync(fn)
+
+        return t.cast(_T, execute_coroutine(_run()))
+
+    @classmethod
+    def process_deferred(cls, job: _DeferredProcessing) -> None:
+        """
+        Applies the deferred processors of a file uploaded by a committed session
+        and updates the stored file, unless it has been replaced in the meantime.
+        """
+        column = job.mapper.attrs[job.key].columns[0]  # type:ignore[attr-defined]
+        column_type = column.type
+
+        def _select(connection: sa.Connection) -> t.Tuple[t.Any, t.Optional[File]]:
+            return cls._select_stored_file(connection, job)
+
+        if cls._run_in_transaction(job.engine, _select)[1] is None:
+            return
+
+        start = time.perf_counter()
+        storage_service = current_injector.get(StorageService)
+        content = SpooledTemporaryFile(INMEMORY_FILESIZE)
+        for chunk in storage_service.get(job.file["path"]).as_stream():
+            content.write(chunk)
+        content.seek(0)
+
+        processed = column_type.upload_type.decode(job.file.encode())
+        processed._thaw()
+        processed["files"] = list(processed["files"])
+        object.__setattr__(processed, "original_content", content)
+        processed.apply_processors(
+            column_type.deferred_processors, job.file["upload_storage"]
+        )
+        new_paths = set(processed["files"]) - set(job.file["files"])
+
+        def _update(connection: sa.Connection) -> bool:
+            value, stored_file = cls._select_stored_file(connection, job)
+            if stored_file is None:
+                return False
+
+            if isinstance(value, list):
+                value = [processed if f is stored_file else f for f in value]
+            else:
+                value = processed
+            connection.execute(
+                sa.update(column.table)
+                .where(cls._identity_clause(job))
+                .values({column: value})
+            )
+            return True
+
+        try:
+            updated = cls._run_in_transaction(job.engine, _update)
+        except Exception:
+            cls.delete_files(new_paths, "process_deferred")
+            raise
+
+        if not updated:
+            cls.delete_files(new_paths, "process_deferred")
+            return
+
+        logger.debug(
+            "Processed %s in %.3fs", job.file["path"], time.perf_counter() - start
+        )
+
     @classmethod
     def unsubscribe_defaults(cls) -> None:
         event.remove(
@@ -37,5 +598,7 @@ class ModifiedFileFieldSessionTracker(FileFieldSessionTracker):
         cls.unsubscribe_defaults()
         event.listen(orm.Mapper, "mapper_configured", cls._mapper_configured)
         event.listen(orm.Mapper, "after_configured", cls._after_configured)
+        event.listen(orm.Session, "before_flush", cls._before_flush)
+        event.listen(orm.Session, "after_flush", cls._after_flush)
         event.listen(orm.Session, "after_commit", cls._after_commit)
         event.listen(orm.Session, "after_soft_rollback", cls._after_soft_rollback)
@@ -0,0 +1,135 @@
+import contextvars
+import logging
+import threading
+import typing as t
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+logger = logging.getLogger("ellar_sql.file")
+
+_T = t.TypeVar("_T")
+
+# process pool of the queue running the current job, used by `run_cpu_bound`
+_cpu_executor: contextvars.ContextVar[t.Optional[Executor]] = contextvars.ContextVar(
+    "ellar_sql_file_cpu_executor", default=None
+)
+
+
+def run_cpu_bound(fn: t.Callable[..., _T], *args: t.Any) -> _T:
+    """
+    Runs `fn(*args)` on the process pool of the `FileProcessingQueue` running
+    the current job, or in the current thread otherwise.
+    `fn` and `args` must be picklable when a process pool is used.
+    """
+    executor = _cpu_executor.get()
+    if executor is None:
+        return fn(*args)
+    return executor.submit(fn, *args).result()
+
+
+class FileProcessingQueue:
+    """
+    Runs the deferred processors of file fields after commit, on a pool of `max_workers` threads.
+
+    :param max_workers: Number of threads running processors.
+    :param process_workers: Number of processes of a pool running the CPU bound part
+        of processors, e.g. resizing images with `ThumbnailGenerator`, out of the GIL.
+    :param synchronous: Runs processors when they are queued, e.g. in tests.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        process_workers: t.Optional[int] = None,
+        synchronous: bool = False,
+    ) -> None:
+        self.max_workers = max_workers
+        self.process_workers = process_workers
+        self.synchronous = synchronous
+
+        self._lock = threading.Lock()
+        self._executor: t.Optional[ThreadPoolExecutor] = None
+        self._process_executor: t.Optional[ProcessPoolExecutor] = None
+        self._futures: t.Set[Future] = set()  # type: ignore[type-arg]
+
+    def _get_executors(
+        self,
+    ) -> t.Tuple[ThreadPoolExecutor, t.Optional[ProcessPoolExecutor]]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ellar-sql-file-processing",
+                )
+            if self.process_workers and self._process_executor is None:
+                self._process_executor = ProcessPoolExecutor(
+                    max_workers=self.process_workers
+                )
+            return self._executor, self._process_executor
+
+    def _run(
+        self,
+        process_executor: t.Optional[Executor],
+        fn: t.Callable[..., t.Any],
+        *args: t.Any,
+    ) -> None:
+        _cpu_executor.set(process_executor)
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("Failed to process file")
+
+    def put(self, fn: t.Callable[..., t.Any], *args: t.Any) -> None:
+        """Runs `fn(*args)` in a copy of the current context, errors are logged"""
+        executor, process_executor = self._get_executors()
+        context = contextvars.copy_context()
+
+        if self.synchronous:
+            context.run(self._run, process_executor, fn, *args)
+            return
+
+        future = executor.submit(context.run, self._run, process_executor, fn, *args)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future: Future) -> None:  # type: ignore[type-arg]
+        with self._lock:
+            self._futures.discard(future)
+
+    def join(self, timeout: t.Optional[float] = None) -> bool:
+        """Waits until queued jobs are done, returns `False` on timeout"""
+        with self._lock:
+            futures = list(self._futures)
+        _, not_done = wait(futures, timeout)
+        return not not_done
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker threads and processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            process_executor, self._process_executor = self._process_executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        if process_executor is not None:
+            process_executor.shutdown(wait=wait)
+
+
+_default_queue: t.Optional[FileProcessingQueue] = None
+_default_queue_lock = threading.Lock()
+
+
+def get_default_processing_queue() -> FileProcessingQueue:
+    """Returns the process wide queue used by sessions without a `FILE_PROCESSING_QUEUE`"""
+    global _default_queue
+
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = FileProcessingQueue()
+        return _default_queue
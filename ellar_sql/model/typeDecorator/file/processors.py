@@ -1,2 +1,82 @@
+import mimetypes
+import typing as t
+from tempfile import SpooledTemporaryFile
+
+from sqlalchemy_file.helpers import INMEMORY_FILESIZE
 from sqlalchemy_file.processors import Processor  # noqa
-from sqlalchemy_file.processors import ThumbnailGenerator  # noqa
+from sqlalchemy_file.processors import ThumbnailGenerator as BaseThumbnailGenerator
+
+from .processing import run_cpu_bound
+
+if t.TYPE_CHECKING:
+    from sqlalchemy_file.file import File
+
+
+def _render_thumbnail(
+    content: bytes, thumbnail_size: t.Tuple[int, int], thumbnail_format: str
+) -> t.Tuple[bytes, int, int]:
+    import io
+
+    from PIL import Image
+
+    thumbnail = Image.open(io.BytesIO(content))
+    thumbnail.thumbnail(thumbnail_size)
+    output = io.BytesIO()
+    thumbnail.save(output, thumbnail_format)
+    return output.getvalue(), thumbnail.width, thumbnail.height
+
+
+class ThumbnailGenerator(BaseThumbnailGenerator):
+    """
+    Generate thumbnail from original content, see `sqlalchemy_file.processors.ThumbnailGenerator`.
+
+    Images are resized by `run_cpu_bound`, on the process pool of the `FileProcessingQueue`
+    when used as a deferred processor.
+    """
+
+    def process(self, file: "File", upload_storage: t.Optional[str] = None) -> None:
+        content = file.original_content
+        content.seek(0)
+        data, width, height = run_cpu_bound(
+            _render_thumbnail,
+            content.read(),
+            self.thumbnail_size,
+            self.thumbnail_format,
+        )
+        content.seek(0)
+
+        output = SpooledTemporaryFile(INMEMORY_FILESIZE)
+        output.write(data)
+        output.seek(0)
+
+        content_type = f"image/{self.thumbnail_format}".lower()
+        ext = mimetypes.guess_extension(content_type)
+        extra = file.get("extra", {})
+        metadata = extra.get("meta_data", {})
+        metadata.update(
+            {
+                "filename": file["filename"] + f".thumbnail{width}x{height}{ext}",
+                "content_type": content_type,
+                "width": width,
+                "height": height,
+            }
+        )
+        extra.update({"content_type": content_type, "meta_data": metadata})
+        stored_file = file.store_content(
+            output,
+            upload_storage=upload_storage,
+            extra=extra,
+            headers=file.get("headers", None),
+        )
+        file.update(
+            {
+                "thumbnail": {
+                    "file_id": stored_file.name,
+                    "width": width,
+                    "height": height,
+                    "upload_storage": upload_storage,
+                    "path": f"{upload_storage}/{stored_file.name}",
+                    "url": stored_file.get_cdn_url(),
+                }
+            }
+        )
@@ -1,32 +1,92 @@
 import typing as t
+from datetime import datetime
 
+import sqlalchemy as sa
 from ellar.pydantic.types import Validator
+from sqlalchemy.sql.base import SchemaEventTarget
 from sqlalchemy_file.types import FileField as BaseFileField
 
 from ellar_sql.constant import DEFAULT_STORAGE_PLACEHOLDER
 
+from .blobs import get_blob_table
 from .file import File
 from .processors import Processor, ThumbnailGenerator
 from .validators import ImageValidator
 
+# attributes of `File` that can be stored in sibling columns, with their column type
+FILE_METADATA_COLUMNS: t.Dict[str, t.Callable[[], sa.types.TypeEngine]] = {
+    "size": sa.BigInteger,
+    "content_type": lambda: sa.String(255),
+    "uploaded_at": sa.DateTime,
+    "content_hash": lambda: sa.String(64),
+}
+
+
+def get_file_metadata_value(file: t.Optional[File], name: str) -> t.Any:
+    """Returns the value of the `name` metadata column of `file`"""
+    if file is None:
+        return None
+
+    value = file.get(name)
+    if name == "uploaded_at" and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class _FileComparator(sa.TypeDecorator.Comparator):  # type:ignore[type-arg]
+    def file_column(self, name: str) -> sa.ColumnElement[t.Any]:
+        """
+        Returns the sibling column of the `name` file attribute,
+        e.g. `Document.content.file_column("size") > 1024`
+        """
+        type_ = t.cast(FileField, self.type)
+        if name not in type_.metadata_columns:
+            raise sa.exc.ArgumentError(
+                f"{name!r} is not a metadata column of {self.expr}, "
+                f"available: {list(type_.metadata_columns)}"
+            )
+        return self.expr.table.c[f"{self.expr.name}_{name}"]  # type:ignore[attr-defined,no-any-return]
+
+    def content_type_matches(self, pattern: str) -> sa.ColumnElement[bool]:
+        """
+        Matches content types with a `*` wildcard, e.g. `"image/*"`,
+        using the `content_type` metadata column.
+        """
+        column = self.file_column("content_type")
+        if "*" not in pattern:
+            return column == pattern
+
+        escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return column.like(escaped.replace("*", "%"), escape="\\")
+
 
 class FileField(BaseFileField):
+    comparator_factory = _FileComparator  # type:ignore[assignment]
+    # the cache key only holds the type class, the compiled SQL doesn't depend on the options
+    cache_ok = True
+
     def __init__(
         self,
         *args: t.Tuple[t.Any],
         upload_storage: t.Optional[str] = None,
         validators: t.Optional[t.List[Validator]] = None,
         processors: t.Optional[t.List[Processor]] = None,
+        deferred_processors: t.Optional[t.List[Processor]] = None,
         upload_type: t.Type[File] = File,
         multiple: t.Optional[bool] = False,
         extra: t.Optional[t.Dict[str, t.Any]] = None,
         headers: t.Optional[t.Dict[str, str]] = None,
+        deduplicate: bool = False,
+        metadata_columns: t.Optional[t.Sequence[str]] = None,
+        index_metadata_columns: bool = True,
         **kwargs: t.Dict[str, t.Any],
     ) -> None:
         """Parameters:
         upload_storage: storage to use
         validators: List of validators to apply
         processors: List of validators to apply
+        deferred_processors: List of processors to apply after
+        commit, on a [FileProcessingQueue]
         upload_type: File class to use, could be
         used to set custom File class
         multiple: Use this to save multiple files
@@ -34,7 +94,24 @@ class FileField(BaseFileField):
         headers: Additional request headers,
         such as CORS headers. For example:
         headers = {'Access-Control-Allow-Origin': 'http://mozilla.com'}.
+        deduplicate: Store files under the hash of their content, shared by
+        rows with the same content and deleted when no row references them
+        metadata_columns: File attributes stored in sibling columns named
+        `<column>_<attribute>`, among `size`, `content_type`, `uploaded_at`
+        and `content_hash`, kept in sync on flush
+        index_metadata_columns: Create an index on each metadata column
         """
+        unknown = set(metadata_columns or ()) - FILE_METADATA_COLUMNS.keys()
+        if unknown:
+            raise sa.exc.ArgumentError(
+                f"Unknown file metadata columns {sorted(unknown)}, "
+                f"available: {list(FILE_METADATA_COLUMNS)}"
+            )
+        if metadata_columns and multiple:
+            raise sa.exc.ArgumentError(
+                "metadata_columns are not supported with multiple files"
+            )
+
         super().__init__(
             *args,
             processors=processors,
@@ -46,21 +123,58 @@ class FileField(BaseFileField):
             **kwargs,  # type: ignore[arg-type]
         )
         self.upload_storage = upload_storage or DEFAULT_STORAGE_PLACEHOLDER
+        self.deferred_processors = deferred_processors or []
+        self.deduplicate = deduplicate
+        self.metadata_columns = tuple(metadata_columns or ())
+        self.index_metadata_columns = index_metadata_columns
+
+    def _set_parent(
+        self, parent: SchemaEventTarget, outer: bool = False, **kw: t.Any
+    ) -> None:
+        super()._set_parent(parent, outer=outer, **kw)
+
+        if isinstance(parent, sa.Column) and (
+            self.deduplicate or self.metadata_columns
+        ):
+            sa.event.listen(parent, "after_parent_attach", self._attach_table)
+
+    def _attach_table(self, column: sa.Column, table: sa.Table) -> None:
+        if self.deduplicate:
+            # counts the references of content-addressed files in the metadata of the table
+            get_blob_table(table.metadata)
+
+        for name in self.metadata_columns:
+            if f"{column.name}_{name}" not in table.c:
+                table.append_column(
+                    sa.Column(
+                        f"{column.name}_{name}",
+                        FILE_METADATA_COLUMNS[name](),
+                        nullable=True,
+                        index=self.index_metadata_columns,
+                    )
+                )
 
 
 class ImageField(FileField):
+    cache_ok = True
+
     def __init__(
         self,
         *args: t.Tuple[t.Any],
         upload_storage: t.Optional[str] = None,
         thumbnail_size: t.Optional[t.Tuple[int, int]] = None,
+        defer_thumbnail: bool = False,
         image_validator: t.Optional[ImageValidator] = None,
         validators: t.Optional[t.List[Validator]] = None,
         processors: t.Optional[t.List[Processor]] = None,
+        deferred_processors: t.Optional[t.List[Processor]] = None,
         upload_type: t.Type[File] = File,
         multiple: t.Optional[bool] = False,
         extra: t.Optional[t.Dict[str, str]] = None,
         headers: t.Optional[t.Dict[str, str]] = None,
+        deduplicate: bool = False,
+        metadata_columns: t.Optional[t.Sequence[str]] = None,
+        index_metadata_columns: bool = True,
         **kwargs: t.Dict[str, t.Any],
     ) -> None:
         """Parameters
@@ -70,30 +184,46 @@ class ImageField(FileField):
         thumbnail_size: If set, a thumbnail will be generated
         from original image using [ThumbnailGenerator]
         [sqlalchemy_file.processors.ThumbnailGenerator]
+        defer_thumbnail: Generates the thumbnail after commit,
+        on a [FileProcessingQueue], instead of during flush
         validators: List of additional validators to apply
         processors: List of validators to apply
+        deferred_processors: List of processors to apply after commit
         upload_type: File class to use, could be
         used to set custom File class
         multiple: Use this to save multiple files
         extra: Extra attributes (driver specific).
+        deduplicate: Store images under the hash of their content
+        metadata_columns: File attributes stored in sibling columns, see `FileField`
+        index_metadata_columns: Create an index on each metadata column
         """
         if validators is None:
             validators = []
         if image_validator is None:
             image_validator = ImageValidator()
         if thumbnail_size is not None:
-            if processors is None:
-                processors = []
-            processors.append(ThumbnailGenerator(thumbnail_size))
+            if defer_thumbnail:
+                deferred_processors = [
+                    *(deferred_processors or []),
+                    ThumbnailGenerator(thumbnail_size),
+                ]
+            else:
+                if processors is None:
+                    processors = []
+                processors.append(ThumbnailGenerator(thumbnail_size))
         validators.append(image_validator)
         super().__init__(
             *args,
             upload_storage=upload_storage,
             validators=validators,
             processors=processors,
+            deferred_processors=deferred_processors,
             upload_type=upload_type,
             multiple=multiple,
             extra=extra,
             headers=headers,
+            deduplicate=deduplicate,
+            metadata_columns=metadata_columns,
+            index_metadata_columns=index_metadata_columns,
             **kwargs,
         )
@@ -2,46 +2,140 @@ import typing as t
 import uuid
 
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.types import CHAR
+from sqlalchemy.types import BINARY, CHAR
+
+# dialects using their native UUID type by default, other dialects opt in with
+# `native=True` or by name, since it changes the type of existing CHAR(32) columns
+NATIVE_UUID_DIALECTS = ("postgresql",)
+
+
+def _get_native_option(
+    native: t.Union[bool, t.Iterable[str]],
+) -> t.Union[bool, t.Tuple[str, ...]]:
+    # hashable, for the statement cache key of the type
+    return native if isinstance(native, bool) else tuple(native)
+
+
+def _is_native_uuid(
+    native: t.Union[bool, t.Tuple[str, ...]], dialect: sa.Dialect
+) -> bool:
+    if not dialect.supports_native_uuid:
+        return False
+    if isinstance(native, bool):
+        return native
+    return dialect.name in native
+
+
+def _to_uuid(value: t.Any) -> t.Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(value)
+
+
+def _to_hex(value: t.Any) -> t.Optional[str]:
+    if value is None:
+        return value
+    if not isinstance(value, uuid.UUID):
+        value = uuid.UUID(value)
+    return "%.32x" % value.int
+
+
+def _to_bytes(value: t.Any) -> t.Optional[bytes]:
+    if value is None:
+        return value
+    if not isinstance(value, uuid.UUID):
+        value = uuid.UUID(value)
+    return value.bytes
+
+
+def _from_hex(value: t.Any) -> t.Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(hex=value)
+
+
+def _from_bytes(value: t.Any) -> t.Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(int=int.from_bytes(value, "big"))
 
 
 class GUID(sa.TypeDecorator):  # type: ignore[type-arg]
     """Platform-independent GUID type.
 
-    Uses PostgreSQL's UUID type, otherwise uses
-    CHAR(32), storing as stringified hex values.
+    Uses PostgreSQL's UUID type, otherwise uses BINARY(16) when `binary=True`
+    or CHAR(32), storing as stringified hex values.
 
+    :param binary: Stores values as 16 bytes instead of 32 hex characters on dialects
+        not using a native UUID type.
+    :param native: Names of the dialects using their native UUID type, PostgreSQL by default.
+        `True` uses it on all dialects supporting it, `False` on none.
     """
 
     impl = CHAR
+    cache_ok = True
+
+    def __init__(
+        self,
+        binary: bool = False,
+        native: t.Union[bool, t.Iterable[str]] = NATIVE_UUID_DIALECTS,
+    ) -> None:
+        super().__init__()
+        self.binary = binary
+        self.native = _get_native_option(native)
+
+    def _is_native(self, dialect: sa.Dialect) -> bool:
+        return _is_native_uuid(self.native, dialect)
 
     def load_dialect_impl(self, dialect: sa.Dialect) -> t.Any:
-        if dialect.name == "postgresql":
-            return dialect.type_descriptor(UUID())
+        if self._is_native(dialect):
+            return dialect.type_descriptor(sa.Uuid(as_uuid=True))
+        elif self.binary:
+            return dialect.type_descriptor(BINARY(16))
         else:
             return dialect.type_descriptor(CHAR(32))
 
+    def _get_processors(
+        self, dialect: sa.Dialect
+    ) -> t.Tuple[t.Callable[[t.Any], t.Any], t.Callable[[t.Any], t.Any]]:
+        if self._is_native(dialect):
+            return _to_uuid, _to_uuid
+        elif self.binary:
+            return _to_bytes, _from_bytes
+        return _to_hex, _from_hex
+
+    def bind_processor(self, dialect: sa.Dialect) -> t.Any:
+        process, _ = self._get_processors(dialect)
+        impl_processor = self._unwrapped_dialect_impl(dialect).bind_processor(dialect)
+
+        if impl_processor is None:
+            return process
+
+        def _process(value: t.Any) -> t.Any:
+            return impl_processor(process(value))
+
+        return _process
+
+    def result_processor(self, dialect: sa.Dialect, coltype: t.Any) -> t.Any:
+        _, process = self._get_processors(dialect)
+        impl_processor = self._unwrapped_dialect_impl(dialect).result_processor(
+            dialect, coltype
+        )
+
+        if impl_processor is None:
+            return process
+
+        def _process(value: t.Any) -> t.Any:
+            return process(impl_processor(value))
+
+        return _process
+
     def process_bind_param(
         self, value: t.Optional[t.Any], dialect: sa.Dialect
     ) -> t.Any:
-        if value is None:
-            return value
-        elif dialect.name == "postgresql":
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return "%.32x" % uuid.UUID(value).int
-            else:
-                # hexstring
-                return "%.32x" % value.int
+        return self._get_processors(dialect)[0](value)
 
     def process_result_value(
         self, value: t.Optional[t.Any], dialect: sa.Dialect
     ) -> t.Any:
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                value = uuid.UUID(value)
-            return value
+        return self._get_processors(dialect)[1](value)
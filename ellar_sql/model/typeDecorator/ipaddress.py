@@ -3,6 +3,88 @@ import typing as t
 
 import sqlalchemy as sa
 import sqlalchemy.dialects as sa_dialects
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.visitors import InternalTraversal
+
+_IPAddress = t.Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+_IPNetwork = t.Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def _address_key(address: _IPAddress) -> bytes:
+    # version discriminator followed by the address as a 16 bytes big-endian integer,
+    # so that keys of the same version sort like their addresses
+    return bytes((address.version,)) + int(address).to_bytes(16, "big")
+
+
+def _address_from_key(key: bytes) -> _IPAddress:
+    value = int.from_bytes(key[1:17], "big")
+    if key[0] == 4:
+        return ipaddress.IPv4Address(value)
+    return ipaddress.IPv6Address(value)
+
+
+def _network_key(network: _IPNetwork, prefixlen: t.Optional[int] = None) -> bytes:
+    return _address_key(network.network_address) + bytes(
+        (network.prefixlen if prefixlen is None else prefixlen,)
+    )
+
+
+class _InNetwork(sa.ColumnElement[bool]):
+    """
+    `column.in_network(cidr)` expression.
+
+    Compiles to `column <<= CAST(cidr AS CIDR)` on PostgreSQL and
+    to an indexable `BETWEEN` on compact keys on other databases.
+    """
+
+    __visit_name__ = "in_network"
+    inherit_cache = True
+
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("network", InternalTraversal.dp_clauseelement),
+        ("lower", InternalTraversal.dp_clauseelement),
+        ("upper", InternalTraversal.dp_clauseelement),
+    ]
+
+    type = sa.Boolean()
+
+    def __init__(self, column: t.Any, network: t.Any) -> None:
+        network = ipaddress.ip_network(network)
+        lower, upper = column.type._get_network_range(network)
+
+        self.column = column
+        self.network = sa.bindparam(None, str(network), type_=sa.String())
+        self.lower = sa.bindparam(None, lower, type_=sa.LargeBinary())
+        self.upper = sa.bindparam(None, upper, type_=sa.LargeBinary())
+
+
+@compiles(_InNetwork)
+def _compile_in_network(element: _InNetwork, compiler: t.Any, **kw: t.Any) -> str:
+    if not element.column.type.compact:
+        raise sa.exc.CompileError(
+            f"in_network() requires {type(element.column.type).__name__}(compact=True) "
+            f"on {compiler.dialect.name}"
+        )
+    return "{} BETWEEN {} AND {}".format(
+        compiler.process(element.column, **kw),
+        compiler.process(element.lower, **kw),
+        compiler.process(element.upper, **kw),
+    )
+
+
+@compiles(_InNetwork, "postgresql")
+def _compile_pg_in_network(element: _InNetwork, compiler: t.Any, **kw: t.Any) -> str:
+    return "{} <<= CAST({} AS CIDR)".format(
+        compiler.process(element.column, **kw),
+        compiler.process(element.network, **kw),
+    )
+
+
+class _NetworkComparator(sa.TypeDecorator.Comparator):  # type:ignore[type-arg]
+    def in_network(self, network: t.Any) -> sa.ColumnElement[bool]:
+        """Matches values contained in `network`, e.g. `column.in_network("10.0.0.0/8")`"""
+        return _InNetwork(self.expr, network)
 
 
 class GenericIP(sa.TypeDecorator):  # type:ignore[type-arg]
@@ -11,22 +93,44 @@ class GenericIP(sa.TypeDecorator):  # type:ignore[type-arg]
 
     Uses PostgreSQL's INET type, otherwise uses
     CHAR(45), storing as stringified values.
+
+    :param compact: Stores values as BINARY(17), a version byte followed by the 16 bytes address,
+        on databases other than PostgreSQL. Compact values can be range queried with `in_network`.
     """
 
     impl = sa.CHAR
     cache_ok = True
+    comparator_factory = _NetworkComparator  # type:ignore[assignment]
+
+    def __init__(self, compact: bool = False) -> None:
+        super().__init__()
+        self.compact = compact
+
+    def _get_network_range(self, network: _IPNetwork) -> t.Tuple[bytes, bytes]:
+        return (
+            _address_key(network.network_address),
+            _address_key(network.broadcast_address),
+        )
 
     def load_dialect_impl(self, dialect: sa.Dialect) -> t.Any:
         if dialect.name == "postgresql":
             return dialect.type_descriptor(sa_dialects.postgresql.INET())  # type:ignore[attr-defined]
+        elif self.compact:
+            return dialect.type_descriptor(sa.BINARY(17))
         else:
             return dialect.type_descriptor(sa.CHAR(45))
 
     def process_bind_param(
         self, value: t.Optional[t.Any], dialect: sa.Dialect
     ) -> t.Any:
-        if value is not None:
-            return str(value)
+        if value is None:
+            return value
+
+        if self.compact and dialect.name != "postgresql":
+            if not isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+                value = ipaddress.ip_address(value)
+            return _address_key(value)
+        return str(value)
 
     def process_result_value(
         self, value: t.Optional[t.Any], dialect: sa.Dialect
@@ -34,6 +138,70 @@ class GenericIP(sa.TypeDecorator):  # type:ignore[type-arg]
         if value is None:
             return value
 
+        if isinstance(value, bytes):
+            return _address_from_key(value)
         if not isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
             value = ipaddress.ip_address(value)
         return value
+
+
+class GenericNetwork(sa.TypeDecorator):  # type:ignore[type-arg]
+    """
+    Platform-independent IP Network type.
+
+    Uses PostgreSQL's CIDR type, otherwise uses
+    CHAR(43), storing as stringified values.
+
+    :param compact: Stores values as BINARY(18), a version byte, the 16 bytes network address
+        and the prefix length, on databases other than PostgreSQL.
+        Compact values can be range queried with `in_network`.
+    """
+
+    impl = sa.CHAR
+    cache_ok = True
+    comparator_factory = _NetworkComparator  # type:ignore[assignment]
+
+    def __init__(self, compact: bool = False) -> None:
+        super().__init__()
+        self.compact = compact
+
+    def _get_network_range(self, network: _IPNetwork) -> t.Tuple[bytes, bytes]:
+        # a stored network starting within `network` with a shorter prefix would have
+        # host bits set, so every subnet of `network` sorts between these two keys.
+        return (
+            _network_key(network),
+            _address_key(network.broadcast_address) + b"\xff",
+        )
+
+    def load_dialect_impl(self, dialect: sa.Dialect) -> t.Any:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(sa_dialects.postgresql.CIDR())  # type:ignore[attr-defined]
+        elif self.compact:
+            return dialect.type_descriptor(sa.BINARY(18))
+        else:
+            return dialect.type_descriptor(sa.CHAR(43))
+
+    def process_bind_param(
+        self, value: t.Optional[t.Any], dialect: sa.Dialect
+    ) -> t.Any:
+        if value is None:
+            return value
+
+        if not isinstance(value, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+            value = ipaddress.ip_network(value)
+
+        if self.compact and dialect.name != "postgresql":
+            return _network_key(value)
+        return str(value)
+
+    def process_result_value(
+        self, value: t.Optional[t.Any], dialect: sa.Dialect
+    ) -> t.Any:
+        if value is None:
+            return value
+
+        if isinstance(value, bytes):
+            return ipaddress.ip_network((_address_from_key(value), value[17]))
+        if not isinstance(value, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+            value = ipaddress.ip_network(value)
+        return value
@@ -0,0 +1,207 @@
+import abc
+import threading
+import typing as t
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+
+_listener_lock = threading.Lock()
+_listener_registered = False
+
+
+class LazyValue:
+    """
+    Raw column value, as returned by the database driver, that is
+    converted to its python value by `load()`.
+
+    Model instances hold it until the attribute is first accessed.
+    """
+
+    __slots__ = ("raw", "_loader")
+
+    def __init__(self, raw: t.Any, loader: t.Callable[[t.Any], t.Any]) -> None:
+        self.raw = raw
+        self._loader = loader
+
+    def load(self) -> t.Any:
+        return self._loader(self.raw)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {type(self.raw).__name__}>"
+
+
+class _LazyColumnAttribute(sa_orm.base._MappedAttribute[t.Any], sa_orm.InspectionAttr):
+    """
+    Descriptor of a lazy column, converts a `LazyValue` on first access and keeps
+    the converted value as the loaded value of the attribute, so that it's not flushed.
+
+    Other reads and writes are handed to the column `InstrumentedAttribute`,
+    which is also returned for class access, e.g. `select(Model.data)`.
+    As a `_MappedAttribute`, the column is still mapped on inheriting models.
+    """
+
+    is_attribute = True
+
+    def __init__(self, attribute: sa_orm.QueryableAttribute[t.Any]) -> None:
+        self.attribute = attribute
+        self.key = attribute.key
+
+    def __get__(self, instance: t.Any, owner: t.Any) -> t.Any:
+        if instance is None:
+            return self.attribute
+
+        value = self.attribute.__get__(instance, owner)
+        if type(value) is LazyValue:
+            value = value.load()
+            instance.__dict__[self.key] = value
+        return value
+
+    def __set__(self, instance: t.Any, value: t.Any) -> None:
+        self.attribute.__set__(instance, value)
+
+    def __delete__(self, instance: t.Any) -> None:
+        self.attribute.__delete__(instance)
+
+    def __getattr__(self, name: str) -> t.Any:
+        # e.g. `property` and `expression` of `Mapper.all_orm_descriptors` items
+        return getattr(self.attribute, name)
+
+
+def instrument_lazy_columns(mapper: sa_orm.Mapper[t.Any]) -> None:
+    """Wraps the attributes of lazy columns of `mapper` class in `_LazyColumnAttribute`"""
+    class_ = mapper.class_
+
+    # `Mapper.columns` doesn't configure mappers, unlike `Mapper.column_attrs`,
+    # so that relationships to models not declared yet can still be resolved
+    for key, column in mapper.columns.items():
+        column_type = getattr(column, "type", None)
+        if not isinstance(column_type, LazyTypeDecorator) or not column_type.lazy:
+            continue
+
+        # inherited attributes are installed on each mapped subclass
+        attribute = class_.__dict__.get(key)
+        if isinstance(attribute, sa_orm.QueryableAttribute):
+            setattr(class_, key, _LazyColumnAttribute(attribute))
+
+
+def _decode_lazy_columns(orm_execute_state: sa_orm.ORMExecuteState) -> None:
+    # only model attributes are converted on access, selected columns are converted
+    # when rows are fetched by selecting them with the eager type
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.is_column_load
+        or orm_execute_state.is_relationship_load
+    ):
+        return
+
+    statement = orm_execute_state.statement
+    if not isinstance(statement, sa.Select):
+        return
+
+    columns = []
+    has_lazy_column = False
+
+    for description in statement.column_descriptions:
+        column_type = description["type"]
+        expression = description["expr"]
+
+        if isinstance(column_type, LazyTypeDecorator) and column_type.lazy:
+            expression = sa.type_coerce(expression, column_type.eager_type).label(
+                description["name"]
+            )
+            has_lazy_column = True
+        columns.append(expression)
+
+    if has_lazy_column:
+        orm_execute_state.statement = statement.with_only_columns(
+            *columns, maintain_column_froms=True
+        )
+
+
+def _listen_lazy_columns() -> None:
+    global _listener_registered
+
+    with _listener_lock:
+        if not _listener_registered:
+            # registered with the first lazy type, so that sessions of
+            # applications without lazy columns don't inspect every select.
+            sa.event.listen(sa_orm.Session, "do_orm_execute", _decode_lazy_columns)
+            _listener_registered = True
+
+
+class LazyTypeDecorator(sa.TypeDecorator, abc.ABC):  # type: ignore[type-arg]
+    """
+    Base type for values whose conversion from the raw database value is expensive,
+    e.g. decompressing or parsing JSON.
+
+    With `lazy=True`, `model.Model` instances hold the raw value in a `LazyValue`,
+    which is converted when the column attribute is first accessed. Columns selected
+    with a session, e.g. `select(Model.data)`, are converted when rows are fetched.
+    """
+
+    cache_ok = True
+
+    def __init__(self, lazy: bool = True) -> None:
+        super().__init__()
+        self.lazy = lazy
+        self._eager_type: t.Optional["LazyTypeDecorator"] = None
+
+        if lazy:
+            _listen_lazy_columns()
+
+    @abc.abstractmethod
+    def dump_value(self, value: t.Any) -> t.Any:
+        """Converts a python value to the value stored in the database"""
+
+    @abc.abstractmethod
+    def load_value(self, value: t.Any) -> t.Any:
+        """Converts the value stored in the database to its python value"""
+
+    @property
+    def eager_type(self) -> "LazyTypeDecorator":
+        """Copy of this type converting values when rows are fetched"""
+        if not self.lazy:
+            return self
+
+        if self._eager_type is None:
+            eager_type = self.copy()
+            eager_type.lazy = False
+            self._eager_type = eager_type
+        return self._eager_type
+
+    def process_bind_param(
+        self, value: t.Optional[t.Any], dialect: sa.Dialect
+    ) -> t.Any:
+        if value is None:
+            return value
+        if isinstance(value, LazyValue):
+            value = value.load()
+        return self.dump_value(value)
+
+    def _get_raw_result_processor(
+        self, dialect: sa.Dialect, coltype: t.Any
+    ) -> t.Optional[t.Callable[[t.Any], t.Any]]:
+        # processor returning the raw value from the driver value
+        return self._unwrapped_dialect_impl(dialect).result_processor(  # type: ignore[no-any-return]
+            dialect, coltype
+        )
+
+    def result_processor(self, dialect: sa.Dialect, coltype: t.Any) -> t.Any:
+        impl_processor = self._get_raw_result_processor(dialect, coltype)
+        process_result_value = self.process_result_value
+
+        def process(value: t.Any) -> t.Any:
+            if impl_processor is not None:
+                value = impl_processor(value)
+            return process_result_value(value, dialect)
+
+        return process
+
+    def process_result_value(
+        self, value: t.Optional[t.Any], dialect: sa.Dialect
+    ) -> t.Any:
+        if value is None:
+            return value
+        return (
+            LazyValue(value, self.load_value) if self.lazy else self.load_value(value)
+        )
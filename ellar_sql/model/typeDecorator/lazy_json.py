@@ -0,0 +1,92 @@
+import dataclasses
+import datetime
+import enum
+import json
+import typing as t
+import uuid
+
+import sqlalchemy as sa
+
+from .lazy import LazyTypeDecorator, LazyValue
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def _json_default(value: t.Any) -> t.Any:
+    # types orjson serializes natively, so that both codecs store the same documents
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def json_dumps(value: t.Any) -> bytes:
+    """
+    Serializes `value` with orjson when installed, otherwise with the standard library.
+
+    Both serialize datetimes, dates and times to ISO 8601, UUIDs to strings,
+    enums to their value and dataclasses to objects.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), default=_json_default).encode(
+        "utf-8"
+    )
+
+
+def json_loads(value: t.Union[str, bytes]) -> t.Any:
+    """Parses `value` with orjson when installed, otherwise with the standard library"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+class LazyJSON(LazyTypeDecorator):
+    """
+    JSON type that keeps the JSON document returned by the database and parses it
+    when the model attribute is first accessed.
+
+    Documents are serialized and parsed with orjson when installed.
+    Unlike `sqlalchemy.JSON`, `None` is stored as SQL NULL.
+
+    :param lazy: Parses values when the model attribute is first accessed
+        instead of when the row is loaded.
+    """
+
+    impl = sa.JSON
+    cache_ok = True
+
+    def dump_value(self, value: t.Any) -> str:
+        return json_dumps(value).decode("utf-8")
+
+    def load_value(self, value: t.Any) -> t.Any:
+        # some drivers, e.g. psycopg, return parsed documents
+        if isinstance(value, (str, bytes)):
+            return json_loads(value)
+        return value
+
+    def bind_processor(self, dialect: sa.Dialect) -> t.Any:
+        # replaces `sqlalchemy.JSON` serialization with `dump_value`
+        dump_value = self.dump_value
+
+        def process(value: t.Any) -> t.Any:
+            if value is None:
+                return value
+            if isinstance(value, LazyValue):
+                value = value.load()
+            return dump_value(value)
+
+        return process
+
+    def _get_raw_result_processor(
+        self, dialect: sa.Dialect, coltype: t.Any
+    ) -> t.Optional[t.Callable[[t.Any], t.Any]]:
+        return None
@@ -0,0 +1,290 @@
+import abc
+import secrets
+import threading
+import time
+import typing as t
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.sql.base import SchemaEventTarget
+from sqlalchemy.types import BINARY
+
+from .guid import GUID, NATIVE_UUID_DIALECTS, _get_native_option, _is_native_uuid
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_CROCKFORD_DECODE = {c: i for i, c in enumerate(_CROCKFORD_BASE32)}
+_CROCKFORD_DECODE.update(
+    {c.lower(): i for c, i in _CROCKFORD_DECODE.items()},
+)
+_CROCKFORD_DECODE.update({"I": 1, "i": 1, "L": 1, "l": 1, "O": 0, "o": 0})
+
+# 2024-01-01T00:00:00Z in milliseconds
+SNOWFLAKE_EPOCH = 1704067200000
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class _MonotonicRandom:
+    """
+    Returns a millisecond timestamp and a random value for time-ordered identifiers.
+    Within the same millisecond, the value of the previous call is incremented instead,
+    so identifiers generated by a process are strictly increasing.
+    """
+
+    def __init__(self, bits: int) -> None:
+        self._bits = bits
+        self._lock = threading.Lock()
+        self._timestamp = 0
+        self._value = 0
+
+    def next(self) -> t.Tuple[int, int]:
+        with self._lock:
+            timestamp = _now_ms()
+
+            if timestamp > self._timestamp:
+                # leave the high bit unset to make room for increments
+                self._timestamp = timestamp
+                self._value = secrets.randbits(self._bits - 1)
+            else:
+                self._value += 1
+                if self._value >> self._bits:
+                    # exhausted, continue in the next millisecond
+                    self._timestamp += 1
+                    self._value = secrets.randbits(self._bits - 1)
+
+            return self._timestamp, self._value
+
+
+_uuid7_random = _MonotonicRandom(bits=12)
+_ulid_random = _MonotonicRandom(bits=80)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generates a time-ordered UUID version 7:
+    48 bits unix timestamp in milliseconds, 12 bits counter and 62 random bits.
+    """
+    timestamp, counter = _uuid7_random.next()
+    value = (
+        (timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+    return uuid.UUID(int=value)
+
+
+def _ulid_to_str(value: int) -> str:
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD_BASE32[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def _ulid_to_int(value: str) -> int:
+    if len(value) != 26:
+        raise ValueError(f"Invalid ULID: {value!r}")
+
+    result = 0
+    try:
+        for char in value:
+            result = (result << 5) | _CROCKFORD_DECODE[char]
+    except KeyError:
+        raise ValueError(f"Invalid ULID: {value!r}") from None
+
+    if result >> 128:
+        raise ValueError(f"Invalid ULID: {value!r}")
+    return result
+
+
+def ulid() -> str:
+    """
+    Generates a ULID, 48 bits unix timestamp in milliseconds and 80 random bits,
+    encoded as a 26 characters Crockford's base32 string.
+    """
+    timestamp, randomness = _ulid_random.next()
+    return _ulid_to_str((timestamp & 0xFFFFFFFFFFFF) << 80 | randomness)
+
+
+class SnowflakeGenerator:
+    """
+    Generates 64-bit time-ordered integers made of 41 bits milliseconds since `epoch`,
+    10 bits `node_id` and 12 bits sequence, i.e. up to 4096 identifiers per millisecond per node.
+
+    Every process generating identifiers for the same table must use a different `node_id`.
+    """
+
+    NODE_ID_BITS = 10
+    SEQUENCE_BITS = 12
+
+    def __init__(self, node_id: int = 0, epoch: int = SNOWFLAKE_EPOCH) -> None:
+        if not 0 <= node_id < 1 << self.NODE_ID_BITS:
+            raise ValueError(
+                f"node_id must be between 0 and {(1 << self.NODE_ID_BITS) - 1}"
+            )
+        self.node_id = node_id
+        self.epoch = epoch
+
+        self._lock = threading.Lock()
+        self._timestamp = 0
+        self._sequence = 0
+
+    def __call__(self) -> int:
+        with self._lock:
+            # never go back in time when the system clock is adjusted
+            timestamp = max(_now_ms() - self.epoch, self._timestamp)
+
+            if timestamp == self._timestamp:
+                self._sequence = (self._sequence + 1) & ((1 << self.SEQUENCE_BITS) - 1)
+
+                if self._sequence == 0:
+                    # sequence exhausted, wait for the next millisecond
+                    while timestamp <= self._timestamp:
+                        timestamp = _now_ms() - self.epoch
+            else:
+                self._sequence = 0
+
+            self._timestamp = timestamp
+            return (
+                timestamp << (self.NODE_ID_BITS + self.SEQUENCE_BITS)
+                | self.node_id << self.SEQUENCE_BITS
+                | self._sequence
+            )
+
+
+_snowflake_generators: t.Dict[t.Tuple[int, int], SnowflakeGenerator] = {}
+_snowflake_generators_lock = threading.Lock()
+
+
+def get_snowflake_generator(
+    node_id: int = 0, epoch: int = SNOWFLAKE_EPOCH
+) -> SnowflakeGenerator:
+    """Returns the process wide generator for `node_id` and `epoch`"""
+    with _snowflake_generators_lock:
+        key = (node_id, epoch)
+        if key not in _snowflake_generators:
+            _snowflake_generators[key] = SnowflakeGenerator(node_id, epoch)
+        return _snowflake_generators[key]
+
+
+class _ClientDefaultType(sa.TypeDecorator, abc.ABC):  # type: ignore[type-arg]
+    """
+    Uses the type `generate` as default for columns without a default,
+    so the column value is generated by the application instead of the database.
+
+    Types are told about their column by `_set_parent`, the `SchemaEventTarget` hook
+    also used by SQLAlchemy `Enum` and `Boolean` types, which is not a public API.
+    The default itself is set like `Column(default=...)`, through `Column.default`.
+    """
+
+    @abc.abstractmethod
+    def generate(self) -> t.Any:
+        """Returns a new column value"""
+
+    def _set_parent(
+        self, parent: SchemaEventTarget, outer: bool = False, **kw: t.Any
+    ) -> None:
+        super()._set_parent(parent, outer=outer, **kw)
+
+        if isinstance(parent, sa.Column):
+            sa.event.listen(parent, "after_parent_attach", self._set_column_default)
+
+    def _set_column_default(self, column: sa.Column, table: t.Any) -> None:
+        if column.default is None and column.server_default is None:
+            default = sa.ColumnDefault(self.generate)
+            default.column = column
+            column.default = default
+
+
+class UUID7(_ClientDefaultType, GUID):
+    """
+    Time-ordered UUID version 7 type, values are generated by `uuid7` unless
+    the column defines a default.
+
+    Stored like `GUID`, defaults to BINARY(16) on dialects not using a native UUID type.
+    """
+
+    cache_ok = True
+
+    def __init__(
+        self,
+        binary: bool = True,
+        native: t.Union[bool, t.Iterable[str]] = NATIVE_UUID_DIALECTS,
+    ) -> None:
+        super().__init__(binary=binary, native=native)
+
+    def generate(self) -> uuid.UUID:
+        return uuid7()
+
+
+class ULID(_ClientDefaultType):
+    """
+    ULID type, values are 26 characters strings generated by `ulid` unless
+    the column defines a default.
+
+    Uses PostgreSQL's UUID type, otherwise stores values as BINARY(16).
+    `native` selects the dialects using their native UUID type, like `GUID`.
+    """
+
+    impl = BINARY
+    cache_ok = True
+
+    def __init__(
+        self, native: t.Union[bool, t.Iterable[str]] = NATIVE_UUID_DIALECTS
+    ) -> None:
+        super().__init__()
+        self.native = _get_native_option(native)
+
+    def _is_native(self, dialect: sa.Dialect) -> bool:
+        return _is_native_uuid(self.native, dialect)
+
+    def load_dialect_impl(self, dialect: sa.Dialect) -> t.Any:
+        if self._is_native(dialect):
+            return dialect.type_descriptor(sa.Uuid(as_uuid=True))
+        return dialect.type_descriptor(BINARY(16))
+
+    def generate(self) -> str:
+        return ulid()
+
+    def process_bind_param(
+        self, value: t.Optional[t.Any], dialect: sa.Dialect
+    ) -> t.Any:
+        if value is None:
+            return value
+
+        int_value = _ulid_to_int(value)
+        if self._is_native(dialect):
+            return uuid.UUID(int=int_value)
+        return int_value.to_bytes(16, "big")
+
+    def process_result_value(
+        self, value: t.Optional[t.Any], dialect: sa.Dialect
+    ) -> t.Any:
+        if value is None:
+            return value
+        if isinstance(value, uuid.UUID):
+            return _ulid_to_str(value.int)
+        return _ulid_to_str(int.from_bytes(value, "big"))
+
+
+class Snowflake(_ClientDefaultType):
+    """
+    64-bit time-ordered integer type, values are generated by a `SnowflakeGenerator`
+    for `node_id` and `epoch` unless the column defines a default.
+    """
+
+    impl = sa.BigInteger
+    cache_ok = True
+
+    def __init__(self, node_id: int = 0, epoch: int = SNOWFLAKE_EPOCH) -> None:
+        super().__init__()
+        self.node_id = node_id
+        self.epoch = epoch
+        self._generator = get_snowflake_generator(node_id, epoch)
+
+    def generate(self) -> int:
+        return self._generator()
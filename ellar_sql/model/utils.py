@@ -1,4 +1,5 @@
 import re
+import typing as t
 
 import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
@@ -70,3 +71,76 @@ def should_set_table_name(cls: type) -> bool:
         )
 
     return True
+
+
+def get_select_entity(statement: sa.sql.Select[t.Any]) -> t.Optional[t.Type[t.Any]]:
+    """
+    Returns the mapped class of a statement selecting a single ORM entity,
+    e.g. `select(User)`, otherwise `None`.
+    """
+    descriptions = statement.column_descriptions
+
+    if len(descriptions) != 1:
+        return None
+
+    entity = descriptions[0]["entity"]
+    if entity is None or descriptions[0]["expr"] is not entity:
+        return None
+    return t.cast(t.Type[t.Any], entity)
+
+
+def _coerce_ident_value(
+    column_type: sa.types.TypeEngine[t.Any], value: t.Any, dialect: sa.Dialect
+) -> t.Any:
+    if value is None:
+        return value
+
+    if isinstance(column_type, sa.TypeDecorator):
+        try:
+            # the value the column would be loaded with, e.g. a `UUID` for a `GUID`
+            return column_type.process_result_value(
+                column_type.process_bind_param(value, dialect), dialect
+            )
+        except NotImplementedError:
+            return _coerce_ident_value(column_type.impl_instance, value, dialect)
+        except (TypeError, ValueError):
+            return value
+
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return value
+
+    if python_type is bool or isinstance(value, python_type):
+        return value
+    try:
+        return python_type(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def get_primary_key_identity(
+    mapper: sa_orm.Mapper[t.Any], ident: t.Any, dialect: sa.Dialect
+) -> t.Tuple[t.Any, ...]:
+    """
+    Returns the primary key tuple of `ident`, a value, tuple or dictionary like
+    `Session.get` accepts, with values converted to the type of the loaded values,
+    e.g. `"1"` to `1` for an integer primary key, so that it matches
+    `Mapper.primary_key_from_instance` of the loaded instance.
+    """
+    if isinstance(ident, dict):
+        values = tuple(
+            ident[mapper.get_property_by_column(c).key] for c in mapper.primary_key
+        )
+    elif isinstance(ident, (tuple, list)):
+        values = tuple(ident)
+    else:
+        values = (ident,)
+
+    if len(values) != len(mapper.primary_key):
+        return values
+
+    return tuple(
+        _coerce_ident_value(column.type, value, dialect)
+        for column, value in zip(mapper.primary_key, values)
+    )
@@ -49,6 +49,10 @@ async def session_middleware(
         raise ex
     finally:
         # Always clean up
+        loader = getattr(connection.state, "model_loader", None)
+        if loader is not None:
+            loader.close()
+
         if session.is_active:
             res = session.close()
             if isinstance(res, t.Coroutine):
@@ -83,7 +87,12 @@ class EllarSQLModule(ModuleBase, IModuleSetup):
         migration_options: t.Union[t.Dict[str, t.Any], MigrationOption],
         session_options: t.Optional[t.Dict[str, t.Any]] = None,
         engine_options: t.Optional[t.Dict[str, t.Any]] = None,
-        models: t.Optional[t.List[str]] = None,
+        models: t.Optional[t.Union[t.List[str], t.Dict[str, t.List[str]]]] = None,
+        lazy_models: bool = False,
+        query_cache_size: t.Optional[int] = None,
+        file_upload_workers: t.Optional[int] = None,
+        file_deletion: t.Optional[t.Dict[str, t.Any]] = None,
+        file_processing: t.Optional[t.Dict[str, t.Any]] = None,
         echo: bool = False,
         root_path: t.Optional[str] = None,
     ) -> "DynamicModule":
@@ -100,6 +109,11 @@ class EllarSQLModule(ModuleBase, IModuleSetup):
                 "engine_options": engine_options,
                 "echo": echo,
                 "models": models,
+                "lazy_models": lazy_models,
+                "query_cache_size": query_cache_size,
+                "file_upload_workers": file_upload_workers,
+                "file_deletion": file_deletion,
+                "file_processing": file_processing,
                 "session_options": session_options,
                 "migration_options": migration_options,
                 "root_path": root_path,
@@ -116,6 +130,11 @@ class EllarSQLModule(ModuleBase, IModuleSetup):
             common_session_options=sql_alchemy_config.session_options,
             echo=sql_alchemy_config.echo,
             models=sql_alchemy_config.models,
+            lazy_models=sql_alchemy_config.lazy_models,
+            query_cache_size=sql_alchemy_config.query_cache_size,
+            file_upload_workers=sql_alchemy_config.file_upload_workers,
+            file_deletion=sql_alchemy_config.file_deletion,
+            file_processing=sql_alchemy_config.file_processing,
             root_path=sql_alchemy_config.root_path,
             migration_options=sql_alchemy_config.migration_options,
         )
@@ -1,3 +1,4 @@
+import hashlib
 import typing as t
 from abc import abstractmethod
 from math import ceil
@@ -10,6 +11,7 @@ from ellar.threading import run_as_sync
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ellar_sql.model.base import ModelBase
+from ellar_sql.model.utils import get_select_entity
 from ellar_sql.services import EllarSQLService
 
 
@@ -253,12 +255,20 @@ class Paginator(PaginatorBase):
         max_per_page: t.Optional[int] = 100,
         error_out: bool = True,
         count: bool = True,
+        light: bool = False,
     ) -> None:
         if isinstance(model, type) and issubclass(model, ModelBase):
             self._select = sa.select(model)
         else:
             self._select = t.cast(sa.sql.Select, model)
 
+        self._light_entity: t.Optional[t.Type[ModelBase]] = None
+        if light:
+            entity = get_select_entity(self._select)
+            # only model selects are loaded as records, other selects already return rows
+            if isinstance(entity, type) and issubclass(entity, ModelBase):
+                self._light_entity = entity
+
         self._created_session = False
 
         self._session: t.Union[sa_orm.Session, AsyncSession] = (
@@ -294,18 +304,31 @@ class Paginator(PaginatorBase):
             return list(res)
         return self._query_items_sync()
 
-    def _query_items_sync(self) -> t.List[t.Any]:
+    def _get_items_select(self) -> sa.sql.Select[t.Any]:
         select = self._select.limit(self.per_page).offset(self._query_offset)
-        return list(self._session.execute(select).unique().scalars())
+
+        if self._light_entity is not None:
+            return select.with_only_columns(*self._light_entity.__mms__.columns)
+        return select
+
+    def _get_items_from_result(self, result: sa.Result[t.Any]) -> t.List[t.Any]:
+        if self._light_entity is not None:
+            record_type = self._light_entity.get_record_type()
+            return [record_type._make(row) for row in result.tuples()]
+        return list(result.unique().scalars())
+
+    def _query_items_sync(self) -> t.List[t.Any]:
+        select = self._get_items_select()
+        return self._get_items_from_result(self._session.execute(select))
 
     @run_as_sync
     async def _query_items_async(self) -> t.List[t.Any]:
         session = t.cast(AsyncSession, self._session)
 
-        select = self._select.limit(self.per_page).offset(self._query_offset)
+        select = self._get_items_select()
         res = await session.execute(select)
 
-        return list(res.unique().scalars())
+        return self._get_items_from_result(res)
 
     def _query_count(self) -> int:
         if self._is_async:
@@ -330,4 +353,69 @@ class Paginator(PaginatorBase):
         return out.scalar()  # type:ignore[return-value]
 
     def _get_init_kwargs(self) -> t.Dict[str, t.Any]:
-        return {"model": self._select}
+        return {"model": self._select, "light": self._light_entity is not None}
+
+
+class PageFingerprint(Paginator):
+    """
+    Paginator that loads only the primary key, version and `columns` values of the page items
+    to compute an `etag` for the page without loading and serializing the items.
+
+    Without `columns`, all columns of the model are fingerprinted,
+    so that any change of the page items changes the `etag`.
+    """
+
+    def __init__(
+        self,
+        model: t.Union[t.Type[ModelBase], sa.sql.Select[t.Any]],
+        columns: t.Sequence[str] = (),
+        session: t.Optional[t.Union[sa_orm.Session, AsyncSession]] = None,
+        page: int = 1,
+        per_page: int = 20,
+        max_per_page: t.Optional[int] = 100,
+        error_out: bool = True,
+        count: bool = True,
+        light: bool = False,
+    ) -> None:
+        # `light` is accepted for Paginator options compatibility,
+        # a fingerprint always selects only key and version values.
+        self._columns = columns
+        super().__init__(
+            model=model,
+            session=session,
+            page=page,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            error_out=error_out,
+            count=count,
+        )
+
+    def _get_items_select(self) -> sa.sql.Select[t.Any]:
+        select = super()._get_items_select()
+        entity = get_select_entity(select)
+
+        if entity is None:
+            # not a single entity select, rows are fingerprinted as selected
+            return select
+
+        mapper: sa_orm.Mapper[t.Any] = sa.inspect(entity)
+        keys = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+
+        if mapper.version_id_col is not None:
+            keys.append(mapper.get_property_by_column(mapper.version_id_col).key)
+
+        columns = self._columns or [prop.key for prop in mapper.column_attrs]
+        keys.extend(key for key in columns if key not in keys)
+        return select.with_only_columns(*(getattr(entity, key) for key in keys))
+
+    def _get_items_from_result(self, result: sa.Result[t.Any]) -> t.List[t.Any]:
+        return [tuple(row) for row in result.all()]
+
+    def _get_init_kwargs(self) -> t.Dict[str, t.Any]:
+        return {"model": self._select, "columns": self._columns}
+
+    @property
+    def etag(self) -> str:
+        """A weak ETag computed from the page position, total and items values"""
+        content = repr((self.page, self.per_page, self.total, self.items))
+        return f'W/"{hashlib.sha1(content.encode()).hexdigest()}"'
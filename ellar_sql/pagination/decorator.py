@@ -12,6 +12,7 @@ from pydantic import BaseModel
 
 from ellar_sql.model.base import ModelBase
 
+from .utils import etag_matches, serialize_page
 from .view import PageNumberPagination, PaginationBase
 
 
@@ -20,6 +21,9 @@ def paginate(
     model: t.Optional[t.Union[t.Type[ModelBase], sa.sql.Select[t.Any]]] = None,
     as_template_context: bool = False,
     item_schema: t.Optional[t.Type[BaseModel]] = None,
+    schema_projection: bool = True,
+    fast_serialization: bool = False,
+    etag_columns: t.Optional[t.Sequence[str]] = None,
     **paginator_options: t.Any,
 ) -> t.Callable:
     """
@@ -29,6 +33,10 @@ def paginate(
     :param model: SQLAlchemy Model or SQLAlchemy Select Statement
     :param as_template_context: If True adds `paginator` object to templating context data
     :param item_schema: Pagination Object Schema for serializing object and creating response schema documentation
+    :param schema_projection: If True, only columns and relationships read by `item_schema` are loaded
+    :param fast_serialization: If True, paginated result is serialized to a JSON response with `item_schema`
+    :param etag_columns: If set, enables ETag support with a page fingerprint of primary keys and `etag_columns` values,
+        all model columns when empty
     :param paginator_options: Other keyword args for initializing `pagination_class`
     :return: TCallable
     """
@@ -45,6 +53,9 @@ def paginate(
             pagination_class=pagination_class or PageNumberPagination,
             as_template_context=as_template_context,
             item_schema=item_schema,
+            schema_projection=schema_projection,
+            fast_serialization=fast_serialization,
+            etag_columns=etag_columns,
             paginator_options=paginator_options,
         )
 
@@ -61,9 +72,15 @@ class _PaginationOperation:
         paginator_options: t.Dict[str, t.Any],
         as_template_context: bool = False,
         item_schema: t.Optional[t.Type[BaseModel]] = None,
+        schema_projection: bool = True,
+        fast_serialization: bool = False,
+        etag_columns: t.Optional[t.Sequence[str]] = None,
     ) -> None:
         self._original_route_function = route_function
         self._pagination_view = pagination_class(**paginator_options)
+        self._projection_schema = item_schema if schema_projection else None
+        self._fast_serialization_schema = item_schema if fast_serialization else None
+        self._etag_columns = etag_columns
         _, _, view = self._get_route_function_wrapper(as_template_context, item_schema)
         self.as_view = functools.wraps(route_function)(view)
 
@@ -96,6 +113,38 @@ class _PaginationOperation:
 
         return filter_query, extra_context
 
+    def _api_paginate(
+        self, items: t.Any, paginate_input: t.Any, context: ecm.IExecutionContext
+    ) -> t.Any:
+        connection = context.switch_to_http_connection()
+        request = connection.get_request()
+        etag: t.Optional[str] = None
+
+        if self._etag_columns is not None:
+            etag = self._pagination_view.api_fingerprint(
+                items, paginate_input, request, columns=self._etag_columns
+            )
+            if etag_matches(etag, request.headers.get("if-none-match")):
+                return ecm.Response(status_code=304, headers={"ETag": etag})
+
+        res = self._pagination_view.api_paginate(
+            items,
+            paginate_input,
+            request,
+            item_schema=self._projection_schema,
+        )
+
+        if self._fast_serialization_schema is not None:
+            return ecm.Response(
+                content=serialize_page(res, self._fast_serialization_schema),
+                media_type="application/json",
+                headers={"ETag": etag} if etag else None,
+            )
+
+        if etag:
+            connection.get_response().headers["ETag"] = etag
+        return res
+
     def _get_route_function_wrapper(
         self, as_template_context: bool, item_schema: t.Type[BaseModel]
     ) -> t.Tuple[ecm.params.ExtraEndpointArg, ecm.params.ExtraEndpointArg, t.Callable]:
@@ -135,11 +184,7 @@ class _PaginationOperation:
             items = self._original_route_function(*args, **func_kwargs)
 
             if not as_template_context:
-                return self._pagination_view.api_paginate(
-                    items,
-                    paginate_input,
-                    context.switch_to_http_connection().get_request(),
-                )
+                return self._api_paginate(items, paginate_input, context)
 
             filter_query, extra_context = self._prepare_template_response(items)
 
@@ -173,11 +218,7 @@ class _AsyncPaginationOperation(_PaginationOperation):
             request = context.switch_to_http_connection().get_request()
 
             if not as_template_context:
-                return self._pagination_view.api_paginate(
-                    items,
-                    paginate_input,
-                    request,
-                )
+                return self._api_paginate(items, paginate_input, context)
 
             filter_query, extra_context = self._prepare_template_response(items)
 
@@ -1,5 +1,15 @@
+import functools
+import typing as t
 from urllib import parse
 
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+from pydantic import BaseModel, TypeAdapter
+
+from ellar_sql.model.utils import get_select_entity
+
+_page_type_adapter: TypeAdapter[t.Dict[str, t.Any]] = TypeAdapter(t.Dict[str, t.Any])
+
 
 def replace_query_param(url: str, key: str, val: int) -> str:
     """
@@ -23,3 +33,140 @@ def remove_query_param(url: str, key: str) -> str:
     query_dict.pop(key, None)
     query = parse.urlencode(sorted(query_dict.items()), doseq=True)
     return parse.urlunsplit((scheme, netloc, path, query, fragment))
+
+
+def _get_schema_type(annotation: t.Any) -> t.Optional[t.Type[BaseModel]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    for arg in t.get_args(annotation):
+        schema_type = _get_schema_type(arg)
+        if schema_type is not None:
+            return schema_type
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def get_schema_load_options(
+    entity: t.Type[t.Any],
+    schema: t.Type[BaseModel],
+    _path: t.FrozenSet[t.Tuple[t.Type[t.Any], t.Type[BaseModel]]] = frozenset(),
+) -> t.Optional[t.Tuple[sa_orm.interfaces.ORMOption, ...]]:
+    """
+    Computes `load_only`/`selectinload` loader options for the attributes
+    `schema` reads from `entity`.
+
+    Returns `None` when the schema reads anything that is not a mapped column
+    or relationship, e.g. a property or computed field, since projecting
+    the query will then make unloaded attributes inaccessible.
+
+    Self-referencing schemas, e.g. a `Node` with `children: List["Node"]`,
+    only get a `selectinload` without nested options for the relationship
+    that refers back to a schema already on the path.
+    """
+    _path = _path | {(entity, schema)}
+    mapper = sa.inspect(entity, raiseerr=False)
+
+    if not isinstance(mapper, sa_orm.Mapper) or schema.model_computed_fields:
+        return None
+
+    columns: t.List[t.Any] = []
+    relationships: t.List[sa_orm.interfaces.ORMOption] = []
+
+    for name, field in schema.model_fields.items():
+        key = field.validation_alias or field.alias or name
+
+        if not isinstance(key, str):
+            return None
+
+        if key in mapper.column_attrs:
+            columns.append(getattr(entity, key))
+
+        elif key in mapper.relationships:
+            loader = sa_orm.selectinload(getattr(entity, key))
+            nested_schema = _get_schema_type(field.annotation)
+
+            nested_entity = mapper.relationships[key].mapper.class_
+
+            if (
+                nested_schema is not None
+                and (nested_entity, nested_schema) not in _path
+            ):
+                nested_options = get_schema_load_options(
+                    nested_entity, nested_schema, _path
+                )
+                if nested_options:
+                    loader = loader.options(*nested_options)
+
+            relationships.append(loader)
+        else:
+            return None
+
+    if not columns:
+        columns = [getattr(entity, c.key) for c in mapper.primary_key]
+
+    return (sa_orm.load_only(*columns), *relationships)
+
+
+def apply_schema_projection(
+    statement: sa.sql.Select[t.Any], schema: t.Type[BaseModel]
+) -> sa.sql.Select[t.Any]:
+    """
+    Restricts `statement` to the columns and relationships `schema` serializes.
+
+    Only single entity selects without existing loader options are projected,
+    any other statement is returned as is.
+    """
+    if statement._with_options:
+        # loading has been customized by the route function.
+        return statement
+
+    entity = get_select_entity(statement)
+    if entity is None:
+        return statement
+
+    options = get_schema_load_options(entity, schema)
+    if not options:
+        return statement
+
+    return statement.options(*options)
+
+
+@functools.lru_cache(maxsize=256)
+def get_items_type_adapter(item_schema: t.Type[BaseModel]) -> TypeAdapter[t.Any]:
+    """Returns a cached `TypeAdapter` for a list of `item_schema`"""
+    return TypeAdapter(t.List[item_schema])  # type:ignore[valid-type]
+
+
+def serialize_page(data: t.Dict[str, t.Any], item_schema: t.Type[BaseModel]) -> bytes:
+    """
+    Serializes a paginated response to JSON bytes.
+
+    `items` are validated in a single pass through a cached list adapter and,
+    other page values like `next` and `previous` links are generated by the
+    pagination class and so, are written without validation.
+    """
+    items_adapter = get_items_type_adapter(item_schema)
+    page = dict(data)
+    page["items"] = items_adapter.validate_python(data["items"], from_attributes=True)
+    return _page_type_adapter.dump_json(page)
+
+
+def etag_matches(etag: str, if_none_match: t.Optional[str]) -> bool:
+    """
+    Checks `etag` against an `If-None-Match` header value using weak comparison.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for value in if_none_match.split(","):
+        value = value.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        if value == opaque_tag:
+            return True
+    return False
@@ -10,8 +10,8 @@ from pydantic import BaseModel, Field
 from ellar_sql.model.base import ModelBase
 from ellar_sql.schemas import BasicPaginationSchema, PageNumberPaginationSchema
 
-from .base import Paginator
-from .utils import remove_query_param, replace_query_param
+from .base import PageFingerprint, Paginator
+from .utils import apply_schema_projection, remove_query_param, replace_query_param
 
 
 class PaginationBase(ABC):
@@ -43,6 +43,19 @@ class PaginationBase(ABC):
             assert working_model is not None, "Model Can not be None"
         return working_model
 
+    def project_model(
+        self,
+        model: t.Union[t.Type[ModelBase], sa.sql.Select[t.Any]],
+        item_schema: t.Optional[t.Type[BaseModel]] = None,
+    ) -> t.Union[t.Type[ModelBase], sa.sql.Select[t.Any]]:
+        """Limits loaded columns and relationships to those `item_schema` reads"""
+        if item_schema is None:
+            return model
+
+        if isinstance(model, type) and issubclass(model, ModelBase):
+            model = sa.select(model)
+        return apply_schema_projection(model, item_schema)
+
     @abstractmethod
     def api_paginate(
         self,
@@ -63,6 +76,24 @@ class PaginationBase(ABC):
     ) -> t.Dict[str, t.Any]:
         pass  # pragma: no cover
 
+    def api_fingerprint(
+        self,
+        model: t.Union[t.Type[ModelBase], sa.sql.Select[t.Any]],
+        input_schema: t.Any,
+        request: ec.Request,
+        columns: t.Sequence[str] = (),
+        **params: t.Any,
+    ) -> str:
+        """
+        Return an ETag for the page `api_paginate` will produce.
+        Only called when `etag_columns` is set, pagination classes without
+        ETag support don't need to implement it.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support ETag fingerprinting, "
+            "`etag_columns` can't be used with it."
+        )
+
     if t.TYPE_CHECKING:
 
         def __init__(self, **kwargs: t.Any) -> None: ...
@@ -73,6 +104,7 @@ class PageNumberPagination(PaginationBase):
         page: int = Field(1, gt=0)
 
     paginator_class: t.Type[Paginator] = Paginator
+    page_fingerprint_class: t.Type[PageFingerprint] = PageFingerprint
     page_query_param: str = "page"
 
     def __init__(
@@ -82,6 +114,7 @@ class PageNumberPagination(PaginationBase):
         per_page: int = 20,
         max_per_page: int = 100,
         error_out: bool = True,
+        light: bool = False,
     ) -> None:
         super().__init__()
         self._model = model
@@ -89,6 +122,7 @@ class PageNumberPagination(PaginationBase):
             "per_page": per_page,
             "max_per_page": max_per_page,
             "error_out": error_out,
+            "light": light,
         }
 
     def get_output_schema(self, item_schema: t.Type[BaseModel]) -> t.Type[BaseModel]:
@@ -102,6 +136,7 @@ class PageNumberPagination(PaginationBase):
         **params: t.Any,
     ) -> t.Any:
         working_model = self.validate_model(model, self._model)
+        working_model = self.project_model(working_model, params.get("item_schema"))
 
         paginator = self.paginator_class(
             model=working_model, page=input_schema.page, **self._paginator_init_kwargs
@@ -124,6 +159,24 @@ class PageNumberPagination(PaginationBase):
         )
         return {"paginator": paginator}
 
+    def api_fingerprint(
+        self,
+        model: t.Union[t.Type[ModelBase], sa.sql.Select, t.Any],
+        input_schema: Input,
+        request: ec.Request,
+        columns: t.Sequence[str] = (),
+        **params: t.Any,
+    ) -> str:
+        working_model = self.validate_model(model, self._model)
+
+        fingerprint = self.page_fingerprint_class(
+            model=working_model,
+            columns=columns,
+            page=input_schema.page,
+            **self._paginator_init_kwargs,
+        )
+        return fingerprint.etag
+
     def _get_paginated_response(
         self, *, base_url: str, paginator: Paginator
     ) -> t.Dict[str, t.Any]:
@@ -165,6 +218,7 @@ class LimitOffsetPagination(PaginationBase):
         offset: int = Field(0, ge=0)
 
     paginator_class: t.Type[Paginator] = Paginator
+    page_fingerprint_class: t.Type[PageFingerprint] = PageFingerprint
 
     def __init__(
         self,
@@ -173,6 +227,7 @@ class LimitOffsetPagination(PaginationBase):
         limit: int = 50,
         max_limit: int = 100,
         error_out: bool = True,
+        light: bool = False,
     ) -> None:
         super().__init__()
         self._model = model
@@ -182,6 +237,7 @@ class LimitOffsetPagination(PaginationBase):
         self._paginator_init_kwargs = {
             "error_out": error_out,
             "max_per_page": max_limit,
+            "light": light,
         }
         self.Input = self.create_input(limit)  # type:ignore[misc]
 
@@ -205,6 +261,7 @@ class LimitOffsetPagination(PaginationBase):
         **params: t.Any,
     ) -> t.Any:
         working_model = self.validate_model(model, self._model)
+        working_model = self.project_model(working_model, params.get("item_schema"))
 
         page = input_schema.offset or 1
         per_page: int = min(input_schema.limit, self._max_limit)
@@ -241,3 +298,25 @@ class LimitOffsetPagination(PaginationBase):
             **self._paginator_init_kwargs,
         )
         return {"paginator": paginator}
+
+    def api_fingerprint(
+        self,
+        model: t.Union[t.Type[ModelBase], sa.sql.Select[t.Any], t.Any],
+        input_schema: Input,
+        request: ec.Request,
+        columns: t.Sequence[str] = (),
+        **params: t.Any,
+    ) -> str:
+        working_model = self.validate_model(model, self._model)
+
+        page = input_schema.offset or 1
+        per_page: int = min(input_schema.limit, self._max_limit)
+
+        fingerprint = self.page_fingerprint_class(
+            model=working_model,
+            columns=columns,
+            page=page,
+            per_page=per_page,
+            **self._paginator_init_kwargs,
+        )
+        return fingerprint.etag
@@ -1,9 +1,21 @@
-from .utils import first_or_404, first_or_none, get_or_404, get_or_none, one_or_404
+from .loader import ModelLoader
+from .utils import (
+    first_or_404,
+    first_or_none,
+    get_many_or_404,
+    get_or_404,
+    get_or_none,
+    get_request_loader,
+    one_or_404,
+)
 
 __all__ = [
     "get_or_404",
+    "get_many_or_404",
     "one_or_404",
     "first_or_404",
     "first_or_none",
     "get_or_none",
+    "get_request_loader",
+    "ModelLoader",
 ]
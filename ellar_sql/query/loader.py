@@ -0,0 +1,161 @@
+import asyncio
+import typing as t
+
+import sqlalchemy as sa
+import sqlalchemy.event as sa_event
+import sqlalchemy.orm as sa_orm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ellar_sql.model.utils import get_primary_key_identity
+
+_O = t.TypeVar("_O", bound=object)
+
+# session events after which loaded instances and misses may be stale
+_CACHE_CLEARING_EVENTS = (
+    "after_flush",
+    "after_commit",
+    "after_rollback",
+    "after_soft_rollback",
+)
+
+
+class ModelLoader:
+    """
+    Batches primary key lookups into a single `WHERE pk IN (...)` query per model.
+
+    All `load` calls issued within the same event loop iteration are dispatched
+    together once the loop is free, and loaded instances are cached
+    until the session is flushed, committed or rolled back.
+    `close` stops listening to the session events.
+
+    E.g.:
+    ```python
+        loader = ModelLoader(session)
+        user, group = await asyncio.gather(
+            loader.load(User, 1), loader.load(Group, 1)
+        )
+    ```
+    """
+
+    def __init__(self, session: t.Union[sa_orm.Session, AsyncSession]) -> None:
+        self._session = session
+        self._cache: t.Dict[t.Tuple[t.Any, ...], t.Any] = {}
+        self._pending: t.Dict[
+            t.Type[t.Any], t.Dict[t.Tuple[t.Any, ...], "asyncio.Future[t.Any]"]
+        ] = {}
+        self._dispatch_scheduled = False
+        # dispatch tasks, referenced until done so they are not garbage collected
+        self._dispatch_tasks: t.Set["asyncio.Task[None]"] = set()
+        self._lock = asyncio.Lock()
+
+        self._sync_session = (
+            session.sync_session if isinstance(session, AsyncSession) else session
+        )
+        for identifier in _CACHE_CLEARING_EVENTS:
+            sa_event.listen(self._sync_session, identifier, self._on_session_event)
+
+    def _on_session_event(self, *args: t.Any) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Clears loaded instances cache"""
+        self._cache.clear()
+
+    def close(self) -> None:
+        """Clears the cache and stops listening to the session events"""
+        self.clear()
+        for identifier in _CACHE_CLEARING_EVENTS:
+            if sa_event.contains(
+                self._sync_session, identifier, self._on_session_event
+            ):
+                sa_event.remove(self._sync_session, identifier, self._on_session_event)
+
+    def _get_primary_key(
+        self, mapper: sa_orm.Mapper[t.Any], ident: t.Any
+    ) -> t.Tuple[t.Any, ...]:
+        dialect = self._sync_session.get_bind(mapper=mapper).dialect
+        return get_primary_key_identity(mapper, ident, dialect)
+
+    async def load(self, entity: t.Type[_O], ident: t.Any) -> t.Optional[_O]:
+        """Loads `entity` instance by primary key `ident` or returns `None`"""
+        mapper = sa_orm.class_mapper(entity)
+        primary_key = self._get_primary_key(mapper, ident)
+        identity_key = mapper.identity_key_from_primary_key(primary_key)
+
+        if identity_key in self._cache:
+            return t.cast(t.Optional[_O], self._cache[identity_key])
+
+        instance = self._session.identity_map.get(identity_key)
+        if instance is not None and not sa.inspect(instance).expired:
+            return t.cast(_O, instance)
+
+        pending = self._pending.setdefault(mapper.class_, {})
+        future = pending.get(primary_key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = pending[primary_key] = loop.create_future()
+
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(self._start_dispatch)
+
+        return t.cast(t.Optional[_O], await future)
+
+    async def load_many(
+        self, entity: t.Type[_O], idents: t.Iterable[t.Any]
+    ) -> t.List[t.Optional[_O]]:
+        """Loads `entity` instances for `idents` with missing instances as `None`"""
+        return list(
+            await asyncio.gather(*(self.load(entity, ident) for ident in idents))
+        )
+
+    def _start_dispatch(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self) -> None:
+        async with self._lock:
+            self._dispatch_scheduled = False
+            pending, self._pending = self._pending, {}
+
+            # entities are queried one after the other
+            # since a session does not support concurrent operations.
+            for entity, futures in pending.items():
+                try:
+                    instances = await self._query(entity, list(futures))
+                except Exception as ex:
+                    for future in futures.values():
+                        if not future.done():
+                            future.set_exception(ex)
+                    continue
+
+                mapper = sa_orm.class_mapper(entity)
+                for primary_key, future in futures.items():
+                    identity_key = mapper.identity_key_from_primary_key(primary_key)
+                    instance = instances.get(primary_key)
+                    self._cache[identity_key] = instance
+
+                    if not future.done():
+                        future.set_result(instance)
+
+    async def _query(
+        self, entity: t.Type[t.Any], primary_keys: t.List[t.Tuple[t.Any, ...]]
+    ) -> t.Dict[t.Tuple[t.Any, ...], t.Any]:
+        mapper = sa_orm.class_mapper(entity)
+        columns = mapper.primary_key
+
+        if len(columns) == 1:
+            condition = columns[0].in_([key[0] for key in primary_keys])
+        else:
+            condition = sa.tuple_(*columns).in_(primary_keys)
+
+        result = self._session.execute(sa.select(entity).where(condition))
+        if isinstance(result, t.Coroutine):
+            result = await result
+
+        return {
+            mapper.primary_key_from_instance(instance): instance
+            for instance in result.scalars()
+        }
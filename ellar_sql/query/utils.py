@@ -1,15 +1,97 @@
+import contextlib
 import typing as t
 
 import ellar.common as ecm
 import sqlalchemy as sa
 import sqlalchemy.exc as sa_exc
+import sqlalchemy.orm as sa_orm
 from ellar.core import current_injector
+from ellar.di import request_context_var
+from ellar.utils.functional import empty
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import State
 
+from ellar_sql.model.utils import get_primary_key_identity
 from ellar_sql.services import EllarSQLService
 
+from .loader import ModelLoader
+
 _O = t.TypeVar("_O", bound=object)
 
 
+def _get_request_state() -> t.Optional[State]:
+    request_context = request_context_var.get(empty)
+    if request_context is empty:
+        return None
+
+    host_context = getattr(request_context, "host_context", None)
+    if host_context is None:
+        return None
+
+    return host_context.switch_to_http_connection().get_client().state
+
+
+def get_request_session() -> t.Optional[t.Union[sa_orm.Session, AsyncSession]]:
+    """
+    Returns the session created for the current request by `session_middleware`
+    or `None` when called outside a request.
+    """
+    state = _get_request_state()
+    if state is None:
+        return None
+    return getattr(state, "session", None)
+
+
+def get_request_loader() -> t.Optional[ModelLoader]:
+    """
+    Returns a `ModelLoader` bound to the current request session
+    or `None` when called outside a request.
+    """
+    state = _get_request_state()
+    if state is None or getattr(state, "session", None) is None:
+        return None
+
+    loader = getattr(state, "model_loader", None)
+    if loader is None:
+        loader = ModelLoader(state.session)
+        state.model_loader = loader
+    return t.cast(ModelLoader, loader)
+
+
+async def _get(entity: t.Type[_O], ident: t.Any, **kwargs: t.Any) -> t.Optional[_O]:
+    loader = get_request_loader() if not kwargs else None
+
+    if loader is not None:
+        return await loader.load(entity, ident)
+
+    async with _get_session() as session:
+        value = session.get(entity, ident, **kwargs)
+
+        if isinstance(value, t.Coroutine):
+            value = await value
+
+    return t.cast(t.Optional[_O], value)
+
+
+@contextlib.asynccontextmanager
+async def _get_session() -> t.AsyncIterator[t.Union[sa_orm.Session, AsyncSession]]:
+    session = get_request_session()
+
+    if session is not None:
+        yield session
+        return
+
+    db_service = current_injector.get(EllarSQLService)
+    session = db_service.session_factory()
+
+    try:
+        yield session
+    finally:
+        res = session.close()
+        if isinstance(res, t.Coroutine):
+            await res
+
+
 async def get_or_404(
     entity: t.Type[_O],
     ident: t.Any,
@@ -18,13 +100,7 @@ async def get_or_404(
     **kwargs: t.Any,
 ) -> _O:
     """ """
-    db_service = current_injector.get(EllarSQLService)
-    session = db_service.session_factory_maker()()
-
-    value = session.get(entity, ident, **kwargs)
-
-    if isinstance(value, t.Coroutine):
-        value = await value
+    value = await _get(entity, ident, **kwargs)
 
     if value is None:
         raise ecm.NotFound(detail=error_message)
@@ -38,13 +114,7 @@ async def get_or_none(
     **kwargs: t.Any,
 ) -> t.Optional[_O]:
     """ """
-    db_service = current_injector.get(EllarSQLService)
-    session = db_service.session_factory_maker()()
-
-    value = session.get(entity, ident, **kwargs)
-
-    if isinstance(value, t.Coroutine):
-        value = await value
+    value = await _get(entity, ident, **kwargs)
 
     if value is None:
         return None
@@ -52,18 +122,71 @@ async def get_or_none(
     return t.cast(_O, value)
 
 
+async def get_many_or_404(
+    entity: t.Type[_O],
+    idents: t.Iterable[t.Any],
+    *,
+    error_message: t.Optional[str] = None,
+) -> t.List[_O]:
+    """
+    Fetches `entity` instances for all `idents` with a single query.
+    Instances are returned in the order of `idents`
+    and `NotFound` is raised if any of them does not exist.
+    """
+    idents = list(idents)
+    if not idents:
+        return []
+
+    mapper = sa_orm.class_mapper(entity)
+    primary_key = mapper.primary_key
+
+    async with _get_session() as session:
+        sync_session = (
+            session.sync_session if isinstance(session, AsyncSession) else session
+        )
+        dialect = sync_session.get_bind(mapper=mapper).dialect
+        # converted to the loaded values, e.g. "1" to 1, before removing duplicates
+        keys = list(
+            dict.fromkeys(
+                get_primary_key_identity(mapper, ident, dialect) for ident in idents
+            )
+        )
+
+        if len(primary_key) == 1:
+            condition = primary_key[0].in_([key[0] for key in keys])
+        else:
+            condition = sa.tuple_(*primary_key).in_(keys)
+
+        result = session.execute(sa.select(entity).where(condition))
+
+        if isinstance(result, t.Coroutine):
+            result = await result
+
+        instances = {
+            mapper.primary_key_from_instance(obj): obj for obj in result.scalars()
+        }
+
+    values = []
+    for key in keys:
+        value = instances.get(key)  # type:ignore[call-overload]
+
+        if value is None:
+            raise ecm.NotFound(detail=error_message)
+        values.append(value)
+
+    return values
+
+
 async def first_or_404(
     statement: sa.sql.Select[t.Any], *, error_message: t.Optional[str] = None
 ) -> t.Any:
     """ """
-    db_service = current_injector.get(EllarSQLService)
-    session = db_service.session_factory()
-
-    result = session.execute(statement)
-    if isinstance(result, t.Coroutine):
-        result = await result
+    async with _get_session() as session:
+        result = session.execute(statement)
+        if isinstance(result, t.Coroutine):
+            result = await result
 
-    value = result.scalar()
+        value = result.scalar()
 
     if value is None:
         raise ecm.NotFound(detail=error_message)
@@ -73,14 +196,12 @@ async def first_or_404(
 
 async def first_or_none(statement: sa.sql.Select[t.Any]) -> t.Any:
     """ """
-    db_service = current_injector.get(EllarSQLService)
-    session = db_service.session_factory()
-
-    result = session.execute(statement)
-    if isinstance(result, t.Coroutine):
-        result = await result
+    async with _get_session() as session:
+        result = session.execute(statement)
+        if isinstance(result, t.Coroutine):
+            result = await result
 
-    value = result.scalar()
+        value = result.scalar()
 
     if value is None:
         return None
@@ -92,15 +213,13 @@ async def one_or_404(
     statement: sa.sql.Select[t.Any], *, error_message: t.Optional[str] = None
 ) -> t.Any:
     """ """
-    db_service = current_injector.get(EllarSQLService)
-    session = db_service.session_factory()
-
-    try:
-        result = session.execute(statement)
+    async with _get_session() as session:
+        try:
+            result = session.execute(statement)
 
-        if isinstance(result, t.Coroutine):
-            result = await result
+            if isinstance(result, t.Coroutine):
+                result = await result
 
-        return result.scalar_one()
-    except (sa_exc.NoResultFound, sa_exc.MultipleResultsFound) as ex:
-        raise ecm.NotFound(detail=error_message) from ex
+            return result.scalar_one()
+        except (sa_exc.NoResultFound, sa_exc.MultipleResultsFound) as ex:
+            raise ecm.NotFound(detail=error_message) from ex
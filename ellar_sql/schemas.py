@@ -9,8 +9,10 @@ from typing_extensions import Annotated
 
 T = t.TypeVar("T")
 
+_http_url_adapter: TypeAdapter[HttpUrl] = TypeAdapter(HttpUrl)
+
 Url = Annotated[
-    str, BeforeValidator(lambda value: str(TypeAdapter(HttpUrl).validate_python(value)))
+    str, BeforeValidator(lambda value: str(_http_url_adapter.validate_python(value)))
 ]
 
 
@@ -82,7 +84,12 @@ class SQLAlchemyConfig(ecm.Serializer):
     echo: bool = False
     engine_options: t.Optional[t.Dict[str, t.Any]] = None
 
-    models: t.Optional[t.List[str]] = None
+    models: t.Optional[t.Union[t.List[str], t.Dict[str, t.List[str]]]] = None
+    lazy_models: bool = False
+    query_cache_size: t.Optional[int] = None
+    file_upload_workers: t.Optional[int] = None
+    file_deletion: t.Optional[t.Dict[str, t.Any]] = None
+    file_processing: t.Optional[t.Dict[str, t.Any]] = None
 
 
 @dataclass
@@ -90,6 +97,13 @@ class ModelMetaStore:
     base_config: ModelBaseConfig
     pk_column: t.Optional[sa_orm.ColumnProperty] = None
     columns: t.List[sa_orm.ColumnProperty] = field(default_factory=lambda: [])
+    # cache of data exporters by (include, exclude, exclude_none) options
+    exporters: t.Dict[
+        t.Tuple[t.Optional[t.FrozenSet[str]], t.Optional[t.FrozenSet[str]], bool],
+        t.Callable[[t.Any], t.Dict[str, t.Any]],
+    ] = field(default_factory=lambda: {})
+    # immutable record type for rows selected without ORM instances
+    record_type: t.Optional[t.Type[t.Any]] = None
 
     def __post_init__(self) -> None:
         if self.columns:
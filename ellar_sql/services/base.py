@@ -1,5 +1,6 @@
 import os
 import typing as t
+from contextlib import contextmanager
 from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
@@ -7,10 +8,7 @@ import sqlalchemy.exc as sa_exc
 import sqlalchemy.orm as sa_orm
 from ellar.common.exceptions import ImproperConfiguration
 from ellar.threading.sync_worker import execute_coroutine
-from ellar.utils.importer import (
-    get_main_directory_by_stack,
-    module_import,
-)
+from ellar.utils.importer import get_main_directory_by_stack
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -18,6 +16,9 @@ from sqlalchemy.ext.asyncio import (
 
 from ellar_sql.constant import (
     DEFAULT_KEY,
+    FILE_DELETION_QUEUE,
+    FILE_PROCESSING_QUEUE,
+    FILE_UPLOAD_WORKERS,
 )
 from ellar_sql.model import (
     make_metadata,
@@ -27,6 +28,12 @@ from ellar_sql.schemas import MigrationOption
 from ellar_sql.session import ModelSession
 
 from .metadata_engine import MetaDataEngine
+from .model_registry import ModelRegistry
+from .statement_cache import HotStatement, StatementCache, StatementCacheStats
+
+if t.TYPE_CHECKING:
+    from ellar_sql.model.typeDecorator.file.deletion import FileDeletionQueue
+    from ellar_sql.model.typeDecorator.file.processing import FileProcessingQueue
 
 
 class EllarSQLService:
@@ -40,7 +47,12 @@ class EllarSQLService:
         *,
         common_session_options: t.Optional[t.Dict[str, t.Any]] = None,
         common_engine_options: t.Optional[t.Dict[str, t.Any]] = None,
-        models: t.Optional[t.List[str]] = None,
+        models: t.Optional[t.Union[t.List[str], t.Dict[str, t.List[str]]]] = None,
+        lazy_models: bool = False,
+        query_cache_size: t.Optional[int] = None,
+        file_upload_workers: t.Optional[int] = None,
+        file_deletion: t.Optional[t.Dict[str, t.Any]] = None,
+        file_processing: t.Optional[t.Dict[str, t.Any]] = None,
         echo: bool = False,
         root_path: t.Optional[str] = None,
         migration_options: t.Optional[MigrationOption] = None,
@@ -51,9 +63,38 @@ class EllarSQLService:
         ] = WeakKeyDictionary()
 
         self._engines.setdefault(self, {})
-        self._session_options = common_session_options or {}
+        self._session_options = dict(common_session_options or {})
+        if file_upload_workers is not None:
+            self._session_options["info"] = {
+                **self._session_options.get("info", {}),
+                FILE_UPLOAD_WORKERS: file_upload_workers,
+            }
+
+        self.file_deletion_queue: t.Optional["FileDeletionQueue"] = None
+        if file_deletion is not None:
+            from ellar_sql.model.typeDecorator.file.deletion import FileDeletionQueue
+
+            self.file_deletion_queue = FileDeletionQueue(**file_deletion)
+            self._session_options["info"] = {
+                **self._session_options.get("info", {}),
+                FILE_DELETION_QUEUE: self.file_deletion_queue,
+            }
+
+        self.file_processing_queue: t.Optional["FileProcessingQueue"] = None
+        if file_processing is not None:
+            from ellar_sql.model.typeDecorator.file.processing import (
+                FileProcessingQueue,
+            )
 
-        self._common_engine_options = common_engine_options or {}
+            self.file_processing_queue = FileProcessingQueue(**file_processing)
+            self._session_options["info"] = {
+                **self._session_options.get("info", {}),
+                FILE_PROCESSING_QUEUE: self.file_processing_queue,
+            }
+
+        self._common_engine_options = dict(common_engine_options or {})
+        if query_cache_size is not None:
+            self._common_engine_options.setdefault("query_cache_size", query_cache_size)
         self._execution_path = get_main_directory_by_stack(root_path or "__main__", 2)
 
         self.migration_options = migration_options or MigrationOption(
@@ -62,7 +103,10 @@ class EllarSQLService:
         self.migration_options.validate_directory(self._execution_path)
         self._has_async_engine_driver: bool = False
 
-        self._setup(databases, models=models, echo=echo)
+        self._model_registry = ModelRegistry(models)
+        self._statement_cache = StatementCache()
+
+        self._setup(databases, lazy_models=lazy_models, echo=echo)
         self.session_factory = self.session_factory_maker()
 
     @property
@@ -83,14 +127,67 @@ class EllarSQLService:
     def _setup(
         self,
         databases: t.Union[str, t.Dict[str, t.Any]],
-        models: t.Optional[t.List[str]] = None,
+        lazy_models: bool = False,
         echo: bool = False,
     ) -> None:
-        for model in models or []:
-            module_import(model)
+        if lazy_models:
+            self._model_registry.listen()
+        else:
+            self._model_registry.load()
 
         self._build_engines(databases, echo)
 
+    def load_models(self, *databases: str, configure: bool = False) -> None:
+        """
+        Imports model modules of `databases` or all model modules if no database is provided.
+
+        :param configure: Configures all SQLAlchemy mappers after models are imported,
+            instead of on the first query or model instance. Useful as a warm-up on application startup.
+        """
+        self._model_registry.load(*databases)
+
+        if configure:
+            sa_orm.configure_mappers()
+
+    def register_statements(
+        self, *statements: t.Union[sa.Executable, HotStatement]
+    ) -> int:
+        """
+        Registers frequently executed statements and compiles them into every database
+        engine compiled cache, so they are not compiled on their first execution.
+
+        Returns the number of statements compiled.
+        """
+        hot_statements = [
+            s if isinstance(s, HotStatement) else HotStatement(s) for s in statements
+        ]
+        self._statement_cache.add(*hot_statements)
+        return self._statement_cache.compile(self.engines.values(), hot_statements)
+
+    def compile_statements(self) -> int:
+        """
+        Compiles all registered statements, e.g. after engines compiled cache was cleared.
+        Returns the number of statements compiled.
+        """
+        return self._statement_cache.compile(self.engines.values())
+
+    @contextmanager
+    def capture_statements(self) -> t.Iterator[t.List[HotStatement]]:
+        """
+        Captures statements executed within the context, e.g. during a warmup run,
+        and registers them with `register_statements` on exit.
+        """
+        with self._statement_cache.capture(self.engines.values()) as captured:
+            yield captured
+        self.register_statements(*captured)
+
+    def get_statement_cache_stats(self) -> t.Dict[str, StatementCacheStats]:
+        """Returns compiled statement cache hits, misses and size for each database"""
+        return {
+            key: self._statement_cache.get_stats(engine)
+            for key, engine in self._engines[self].items()
+        }
+
     def _build_engines(
         self, databases: t.Union[str, t.Dict[str, t.Any]], echo: bool
     ) -> None:
@@ -255,6 +352,7 @@ class EllarSQLService:
         # if engine.dialect.is_async:
         #     return AsyncEngine(engine)
 
+        self._statement_cache.track(engine)
         return engine
 
     def _get_metadata_and_engine(
@@ -263,12 +361,15 @@ class EllarSQLService:
         engines = self._engines[self]
 
         if database == "__all__":
+            self._model_registry.load()
             keys: t.List[str] = list(get_all_metadata())
         elif isinstance(database, str):
             keys = [database]
         else:
             keys = database
 
+        self._model_registry.load(*keys)
+
         result: t.List[MetaDataEngine] = []
 
         for key in keys:
@@ -0,0 +1,95 @@
+import threading
+import typing as t
+import weakref
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+from ellar.utils.importer import module_import
+
+# registries importing their modules before SQLAlchemy configures mappers,
+# dropped once loaded or when their service is garbage collected
+_listening_registries: "weakref.WeakSet[ModelRegistry]" = weakref.WeakSet()
+_listener_lock = threading.Lock()
+_listener_registered = False
+
+
+def _load_listening_registries() -> None:
+    # registries created while importing models are loaded in the same pass
+    while True:
+        pending = list(_listening_registries)
+        if not pending:
+            return
+
+        for registry in pending:
+            registry.load()
+            _listening_registries.discard(registry)
+
+
+class ModelRegistry:
+    """
+    Keeps track of python modules that defines `model.Model` models and imports them
+    once, either all at once or only the modules of a database when it's used.
+
+    `models` is a list of modules or a dictionary of database key to list of modules.
+    """
+
+    def __init__(
+        self, models: t.Optional[t.Union[t.List[str], t.Dict[str, t.List[str]]]] = None
+    ) -> None:
+        self._pending: t.Dict[t.Optional[str], t.List[str]] = {}
+
+        if isinstance(models, dict):
+            for key, modules in models.items():
+                self._pending[key] = list(modules)
+        else:
+            self._pending[None] = list(models or [])
+
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """`True` if all model modules have been imported"""
+        return not any(self._pending.values())
+
+    def load(self, *databases: str) -> None:
+        """
+        Imports model modules of `databases` and modules not assigned to a database.
+        All modules are imported if no database is provided.
+
+        No lock is held while importing, concurrent imports of a module are serialized
+        by Python's import system, so that a thread configuring mappers can't deadlock
+        with one declaring models.
+        """
+        if self.loaded:
+            return
+
+        keys = list(self._pending) if not databases else [None, *databases]
+
+        for key in keys:
+            for module in list(self._pending.get(key, [])):
+                module_import(module)
+                # only remove after a successful import
+                with self._lock:
+                    modules = self._pending.get(key, [])
+                    if module in modules:
+                        modules.remove(module)
+
+    def listen(self) -> None:
+        """
+        Imports all model modules before SQLAlchemy configures mappers, which happens
+        on the first query or model instance. This ensures relationships to models
+        in modules not yet imported can be resolved.
+        """
+        global _listener_registered
+
+        if self.loaded:
+            return
+
+        with _listener_lock:
+            _listening_registries.add(self)
+            if not _listener_registered:
+                # a single listener for all registries, which only holds them weakly
+                sa.event.listen(
+                    sa_orm.Mapper, "before_configured", _load_listening_registries
+                )
+                _listener_registered = True
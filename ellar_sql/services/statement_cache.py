@@ -0,0 +1,188 @@
+import contextlib
+import dataclasses
+import typing as t
+
+import sqlalchemy as sa
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.sql import compiler
+
+
+class HotStatement(t.NamedTuple):
+    statement: sa.Executable
+    # sorted parameter keys, used when compiling INSERT and UPDATE statements
+    column_keys: t.Tuple[str, ...] = ()
+    for_executemany: bool = False
+
+
+@dataclasses.dataclass
+class StatementCacheStats:
+    """Compiled statement cache statistics of an engine"""
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+    capacity: t.Optional[int] = None
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def compile_statement(engine: sa.Engine, hot_statement: HotStatement) -> bool:
+    """
+    Compiles `hot_statement` into `engine` compiled cache, the same way
+    it would be compiled when executed. Returns `False` if the statement
+    can not be cached or was already in the cache.
+    """
+    compiled_cache = engine._compiled_cache
+    dialect = engine.dialect
+    statement = hot_statement.statement
+
+    if compiled_cache is None or not isinstance(statement, sa.ClauseElement):
+        return False
+
+    _, _, cache_hit = statement._compile_w_cache(
+        dialect=dialect,
+        compiled_cache=compiled_cache,
+        column_keys=list(hot_statement.column_keys),
+        for_executemany=hot_statement.for_executemany,
+        schema_translate_map=None,
+        linting=dialect.compiler_linting | compiler.WARN_LINTING,
+    )
+    return cache_hit is CacheStats.CACHE_MISS
+
+
+def _get_hot_statement(
+    statement: t.Any, multiparams: t.Any, params: t.Any
+) -> HotStatement:
+    if multiparams:
+        return HotStatement(
+            statement, tuple(sorted(multiparams[0])), len(multiparams) > 1
+        )
+    if params:
+        return HotStatement(statement, tuple(sorted(params)))
+    return HotStatement(statement)
+
+
+def _get_hot_statement_key(
+    hot_statement: HotStatement,
+) -> t.Optional[t.Tuple[t.Any, ...]]:
+    statement = hot_statement.statement
+    cache_key = (
+        statement._generate_cache_key()
+        if isinstance(statement, sa.ClauseElement)
+        else None
+    )
+    if cache_key is None:
+        return None
+    return cache_key.key, hot_statement.column_keys, hot_statement.for_executemany
+
+
+def _get_cache_hit(result: t.Any) -> t.Optional[CacheStats]:
+    context = getattr(result, "context", None)
+    return getattr(context, "cache_hit", None)
+
+
+class StatementCache:
+    """
+    Keeps hot statements to precompile into engines compiled cache
+    and tracks engines cache hits and misses.
+    """
+
+    def __init__(self) -> None:
+        self._hot_statements: t.List[HotStatement] = []
+        self._stats: t.Dict[sa.Engine, StatementCacheStats] = {}
+
+    @property
+    def hot_statements(self) -> t.List[HotStatement]:
+        return list(self._hot_statements)
+
+    def track(self, engine: sa.Engine) -> None:
+        if engine not in self._stats:
+            self._stats[engine] = StatementCacheStats(
+                capacity=getattr(engine._compiled_cache, "capacity", None)
+            )
+            sa.event.listen(engine, "after_execute", self._after_execute)
+
+    def _after_execute(
+        self,
+        conn: sa.Connection,
+        clauseelement: t.Any,
+        multiparams: t.Any,
+        params: t.Any,
+        execution_options: t.Any,
+        result: t.Any,
+    ) -> None:
+        stats = self._stats.get(conn.engine)
+        if stats is None:
+            return
+
+        cache_hit = _get_cache_hit(result)
+        # stats are best effort, concurrent increments are not locked
+        if cache_hit is CacheStats.CACHE_HIT:
+            stats.hits += 1
+        elif cache_hit is CacheStats.CACHE_MISS:
+            stats.misses += 1
+
+    def get_stats(self, engine: sa.Engine) -> StatementCacheStats:
+        stats = self._stats.get(engine) or StatementCacheStats()
+        return dataclasses.replace(
+            stats,
+            size=len(engine._compiled_cache or {}),
+            capacity=getattr(engine._compiled_cache, "capacity", None),
+        )
+
+    def add(self, *hot_statements: HotStatement) -> None:
+        keys = {_get_hot_statement_key(h) for h in self._hot_statements}
+
+        for hot_statement in hot_statements:
+            key = _get_hot_statement_key(hot_statement)
+
+            if key is None or key not in keys:
+                self._hot_statements.append(hot_statement)
+                keys.add(key)
+
+    def compile(
+        self,
+        engines: t.Iterable[sa.Engine],
+        hot_statements: t.Optional[t.Sequence[HotStatement]] = None,
+    ) -> int:
+        """Compiles hot statements for all `engines`, returns the number of new cache entries"""
+        compiled = 0
+
+        for engine in engines:
+            for hot_statement in (
+                self._hot_statements if hot_statements is None else hot_statements
+            ):
+                if compile_statement(engine, hot_statement):
+                    compiled += 1
+        return compiled
+
+    @contextlib.contextmanager
+    def capture(
+        self, engines: t.Iterable[sa.Engine]
+    ) -> t.Iterator[t.List[HotStatement]]:
+        """Records statements executed on `engines` while the context is active"""
+        captured: t.List[HotStatement] = []
+
+        def _capture(
+            conn: sa.Connection,
+            clauseelement: t.Any,
+            multiparams: t.Any,
+            params: t.Any,
+            execution_options: t.Any,
+            result: t.Any,
+        ) -> None:
+            # only statements that went through the compiled cache are captured
+            if _get_cache_hit(result) in (CacheStats.CACHE_HIT, CacheStats.CACHE_MISS):
+                captured.append(_get_hot_statement(clauseelement, multiparams, params))
+
+        engines = list(engines)
+        for engine in engines:
+            sa.event.listen(engine, "after_execute", _capture)
+        try:
+            yield captured
+        finally:
+            for engine in engines:
+                sa.event.remove(engine, "after_execute", _capture)
@@ -0,0 +1,326 @@
+import functools
+import os
+import shutil
+import sqlite3
+import tempfile
+import typing as t
+from contextlib import asynccontextmanager, closing, contextmanager
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+from ellar.threading.sync_worker import execute_coroutine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.util import await_only
+
+from ellar_sql.services import EllarSQLService
+
+_T = t.TypeVar("_T")
+
+
+def _run(
+    engine: sa.Engine,
+    fn: t.Callable[[sa.Connection], _T],
+    **execution_options: t.Any,
+) -> _T:
+    """Calls `fn` with a connection of `engine`, on a worker event loop for async drivers"""
+    if not engine.dialect.is_async:
+        with engine.connect() as connection:
+            return fn(connection.execution_options(**execution_options))
+
+    async def _run_async() -> _T:
+        async with AsyncEngine(engine).connect() as connection:
+            await connection.execution_options(**execution_options)
+            return await connection.run_sync(fn)
+
+    return t.cast(_T, execute_coroutine(_run_async()))
+
+
+def _backup_sqlite(connection: sa.Connection, path: str, restore: bool) -> None:
+    driver_connection: t.Any = connection.connection.driver_connection
+
+    if isinstance(driver_connection, sqlite3.Connection):
+        with closing(sqlite3.connect(path)) as file_connection:
+            if restore:
+                file_connection.backup(driver_connection)
+            else:
+                driver_connection.backup(file_connection)
+        return
+
+    # aiosqlite, `await_only` runs in the greenlet of `AsyncConnection.run_sync`
+    import aiosqlite
+
+    if restore:
+        snapshot_connection = await_only(aiosqlite.connect(path))
+        try:
+            await_only(snapshot_connection.backup(driver_connection))
+        finally:
+            await_only(snapshot_connection.close())
+        return
+
+    with closing(sqlite3.connect(path, check_same_thread=False)) as target:
+        await_only(driver_connection.backup(target))
+
+
+class DatabaseSnapshot:
+    """
+    Snapshot of the databases of an `EllarSQLService` after `create_all`,
+    copied back by `restore` instead of dropping and creating every table for each test.
+
+    SQLite databases are copied with the backup API and PostgreSQL databases are created
+    again from a `TEMPLATE` database. Databases of other dialects are dropped and created again.
+
+    :param db_service: Service whose databases are snapshotted.
+    :param databases: Bind keys of the snapshotted databases, all databases by default.
+    """
+
+    def __init__(self, db_service: EllarSQLService, *databases: str) -> None:
+        self.db_service = db_service
+        self._databases = databases
+        self._directory: t.Optional[str] = None
+        # sqlite snapshot file or postgresql template database of each bind key
+        self._snapshots: t.Dict[str, str] = {}
+        self._clones: t.List[t.Tuple[sa.Engine, str]] = []
+
+    @property
+    def databases(self) -> t.List[str]:
+        return list(self._databases or self.db_service.engines)
+
+    def _get_directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="ellar-sql-snapshot-")
+        return self._directory
+
+    def _get_engine(self, key: str) -> sa.Engine:
+        try:
+            return self.db_service.engines[key]
+        except KeyError:
+            raise sa.exc.UnboundExecutionError(
+                f"Bind key '{key}' is not in 'Database' config."
+            ) from None
+
+    def create(self) -> None:
+        """Creates the tables of the databases, then snapshots them"""
+        self.db_service.create_all(*self._databases)
+
+        for key in self.databases:
+            engine = self._get_engine(key)
+
+            if engine.dialect.name == "sqlite":
+                path = os.path.join(self._get_directory(), f"{key}.db")
+                if os.path.exists(path):
+                    os.remove(path)
+                _run(
+                    engine,
+                    functools.partial(_backup_sqlite, path=path, restore=False),
+                    isolation_level="AUTOCOMMIT",
+                )
+                self._snapshots[key] = path
+
+            elif engine.dialect.name == "postgresql":
+                template = f"{engine.url.database}_snapshot"
+                engine.dispose()
+                self._execute_on_server(
+                    engine,
+                    f"DROP DATABASE IF EXISTS {self._quote(engine, template)}",
+                    f"CREATE DATABASE {self._quote(engine, template)} "
+                    f"TEMPLATE {self._quote(engine, engine.url.database)}",
+                )
+                self._snapshots[key] = template
+
+    def restore(self, *databases: str) -> None:
+        """
+        Copies the snapshot back to the databases, all snapshotted databases by default.
+        Sessions using the databases should be closed first.
+
+        PostgreSQL databases are dropped and created again, the pool of the service
+        engine is disposed but every other connection to the database, e.g. of another
+        engine or process, must be closed first or `DROP DATABASE` fails.
+        """
+        for key in databases or self.databases:
+            engine = self._get_engine(key)
+            snapshot = self._snapshots.get(key)
+
+            if snapshot is None:
+                self.db_service.drop_all(key)
+                self.db_service.create_all(key)
+
+            elif engine.dialect.name == "sqlite":
+                _run(
+                    engine,
+                    functools.partial(_backup_sqlite, path=snapshot, restore=True),
+                    isolation_level="AUTOCOMMIT",
+                )
+
+            else:
+                engine.dispose()
+                self._execute_on_server(
+                    engine,
+                    f"DROP DATABASE IF EXISTS {self._quote(engine, engine.url.database)}",
+                    f"CREATE DATABASE {self._quote(engine, engine.url.database)} "
+                    f"TEMPLATE {self._quote(engine, snapshot)}",
+                )
+
+    def clone(self, key: str, name: str) -> sa.URL:
+        """
+        Creates a new database `name` from the snapshot of the `key` database and returns its url,
+        e.g. to give each pytest-xdist worker its own database.
+
+        Raises `sqlalchemy.exc.ArgumentError` when the database has no snapshot.
+        """
+        engine = self._get_engine(key)
+        snapshot = self._snapshots.get(key)
+
+        if snapshot is None:
+            raise sa.exc.ArgumentError(
+                f"Bind key '{key}' has no snapshot to clone, databases of the "
+                f"'{engine.dialect.name}' dialect can only be cloned after `create` "
+                "on SQLite and PostgreSQL."
+            )
+
+        if engine.dialect.name == "sqlite":
+            path = os.path.join(self._get_directory(), f"{name}.db")
+            shutil.copyfile(snapshot, path)
+            return engine.url.set(database=path)
+
+        self._execute_on_server(
+            engine,
+            f"DROP DATABASE IF EXISTS {self._quote(engine, name)}",
+            f"CREATE DATABASE {self._quote(engine, name)} "
+            f"TEMPLATE {self._quote(engine, snapshot)}",
+        )
+        self._clones.append((engine, name))
+        return engine.url.set(database=name)
+
+    def drop(self) -> None:
+        """Removes the snapshots and the databases created by `clone`"""
+        for engine, name in self._clones:
+            self._execute_on_server(
+                engine, f"DROP DATABASE IF EXISTS {self._quote(engine, name)}"
+            )
+        self._clones.clear()
+
+        for key, snapshot in self._snapshots.items():
+            engine = self._get_engine(key)
+            if engine.dialect.name == "postgresql":
+                self._execute_on_server(
+                    engine, f"DROP DATABASE IF EXISTS {self._quote(engine, snapshot)}"
+                )
+        self._snapshots.clear()
+
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    @classmethod
+    def _quote(cls, engine: sa.Engine, name: t.Optional[str]) -> str:
+        return engine.dialect.identifier_preparer.quote(t.cast(str, name))
+
+    @classmethod
+    def _execute_on_server(cls, engine: sa.Engine, *statements: str) -> None:
+        """Runs `statements` on the `postgres` database, outside of a transaction"""
+        server = sa.create_engine(
+            engine.url.set(database="postgres"), poolclass=sa.pool.NullPool
+        )
+        try:
+
+            def _execute(connection: sa.Connection) -> None:
+                for statement in statements:
+                    connection.exec_driver_sql(statement)
+
+            _run(server, _execute, isolation_level="AUTOCOMMIT")
+        finally:
+            server.dispose()
+
+
+def _begin_test_transaction(connection: sa.Connection) -> t.Any:
+    """Begins the transaction rolled back after a test, returns the driver isolation level to restore"""
+    if connection.dialect.name != "sqlite":
+        connection.begin()
+        return None
+
+    # pysqlite and aiosqlite only emit BEGIN before DML, SAVEPOINTs need it first
+    dbapi_connection: t.Any = connection.connection.dbapi_connection
+    isolation_level = dbapi_connection.isolation_level
+    dbapi_connection.isolation_level = None
+    connection.begin()
+    connection.exec_driver_sql("BEGIN")
+    return isolation_level
+
+
+def _rollback_test_transaction(
+    connection: sa.Connection, isolation_level: t.Any
+) -> None:
+    transaction = connection.get_transaction()
+    if transaction is not None:
+        transaction.rollback()
+
+    if connection.dialect.name == "sqlite":
+        dbapi_connection: t.Any = connection.connection.dbapi_connection
+        dbapi_connection.isolation_level = isolation_level
+
+
+@contextmanager
+def savepoint_session(db_service: EllarSQLService) -> t.Iterator[sa_orm.Session]:
+    """
+    Yields a `ModelSession` whose commits release SAVEPOINTs of transactions
+    rolled back on exit, so that each test leaves the databases unchanged.
+
+    Sessions created by `db_service.session_factory`, e.g. the `Session` injected
+    in the application, join the same transactions until exit.
+    """
+    connections = {key: engine.connect() for key, engine in db_service.engines.items()}
+    isolation_levels = {
+        key: _begin_test_transaction(connection)
+        for key, connection in connections.items()
+    }
+
+    session_factory = db_service.session_factory
+    db_service.session_factory = db_service.session_factory_maker(
+        join_transaction_mode="create_savepoint"
+    )
+    db_service.session_factory.configure(engines=connections)
+
+    session = t.cast(sa_orm.Session, db_service.session_factory())
+    try:
+        yield session
+    finally:
+        session.close()
+        db_service.session_factory = session_factory
+        for key, connection in connections.items():
+            _rollback_test_transaction(connection, isolation_levels[key])
+            connection.close()
+
+
+@asynccontextmanager
+async def async_savepoint_session(
+    db_service: EllarSQLService,
+) -> t.AsyncIterator[AsyncSession]:
+    """`savepoint_session` of services with async database drivers"""
+    connections = {
+        key: await AsyncEngine(engine).connect()
+        for key, engine in db_service.engines.items()
+    }
+    isolation_levels = {
+        key: await connection.run_sync(_begin_test_transaction)
+        for key, connection in connections.items()
+    }
+
+    session_factory = db_service.session_factory
+    db_service.session_factory = db_service.session_factory_maker(
+        join_transaction_mode="create_savepoint"
+    )
+    db_service.session_factory.configure(
+        engines={
+            key: connection.sync_connection for key, connection in connections.items()
+        }
+    )
+
+    session = t.cast(AsyncSession, db_service.session_factory())
+    try:
+        yield session
+    finally:
+        await session.close()
+        db_service.session_factory = session_factory
+        for key, connection in connections.items():
+            await connection.run_sync(_rollback_test_transaction, isolation_levels[key])
+            await connection.close()
@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+import pytest
+
+import ellar_sql
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def _get_imported_modules(statement: str, *modules: str) -> list:
+    code = (
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {modules!r} if m in sys.modules))"
+    )
+    output = _run_python("-c", code).stdout.strip()
+    return output.split(",") if output else []
+
+
+def test_import_ellar_sql_does_not_load_submodules():
+    assert (
+        _get_imported_modules(
+            "import ellar_sql",
+            "sqlalchemy",
+            "ellar.core",
+            "ellar_sql.module",
+            "ellar_sql.services",
+        )
+        == []
+    )
+
+
+def test_import_model_does_not_load_optional_features():
+    assert (
+        _get_imported_modules(
+            "from ellar_sql import model",
+            "alembic",
+            "ellar_storage",
+            "sqlalchemy_file",
+            "ellar_sql.cli",
+            "ellar_sql.pagination",
+            "ellar_sql.query",
+            "ellar_sql.model.typeDecorator.file",
+        )
+        == []
+    )
+
+
+def test_import_module_does_not_load_optional_features():
+    assert (
+        _get_imported_modules(
+            "from ellar_sql import EllarSQLModule",
+            "ellar_storage",
+            "sqlalchemy_file",
+            "ellar_sql.pagination",
+            "ellar_sql.model.typeDecorator.file",
+        )
+        == []
+    )
+
+
+def test_file_fields_are_loaded_on_access():
+    assert _get_imported_modules(
+        "from ellar_sql import model\nmodel.typeDecorator.FileField",
+        "sqlalchemy_file",
+        "ellar_sql.model.typeDecorator.file",
+    ) == ["sqlalchemy_file", "ellar_sql.model.typeDecorator.file"]
+
+
+def test_lazy_exports():
+    from ellar_sql.services import EllarSQLService
+
+    assert ellar_sql.EllarSQLService is EllarSQLService
+    assert set(ellar_sql.__all__).issubset(dir(ellar_sql))
+
+    with pytest.raises(AttributeError):
+        ellar_sql.UnknownExport  # noqa: B018
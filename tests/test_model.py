@@ -3,6 +3,9 @@ from datetime import datetime
 import pytest
 
 from ellar_sql import model
+from ellar_sql.constant import DEFAULT_KEY
+from ellar_sql.model.base import _get_model_base
+from ellar_sql.model.database_binds import get_metadata
 from ellar_sql.model.mixins import get_registered_models
 from ellar_sql.schemas import ModelBaseConfig
 
@@ -345,3 +348,15 @@ def test_too_many_bases(ignore_base):
             __base_config__ = ModelBaseConfig(
                 use_bases=[model.DeclarativeBase, model.DeclarativeBaseNoMeta]
             )
+
+
+def test_models_share_declarative_base(ignore_base):
+    class User(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+
+    class Post(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+
+    assert User.__bases__ == Post.__bases__
+    assert User.__bases__[0] is _get_model_base((model.Model,), [model.DeclarativeBase])
+    assert User.__mapper__.registry is get_metadata(DEFAULT_KEY).registry
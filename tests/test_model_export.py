@@ -85,6 +85,162 @@ class TestModelExport:
         assert user.dict(exclude={"email", "name"}).keys() == {"address", "city", "id"}
         # db_service.session_factory.close()
 
+    def test_model_export_many(self, db_service, ignore_base):
+        user_factory = get_model_factory(db_service)
+
+        db_service.create_all()
+
+        users = [
+            user_factory(name=f"Ellar {i}", email=f"ellar{i}@support.com", city=None)
+            for i in range(3)
+        ]
+        user_model = user_factory._meta.model
+
+        assert user_model.dicts(users, include={"id", "name"}) == [
+            {"id": 1, "name": "Ellar 0"},
+            {"id": 2, "name": "Ellar 1"},
+            {"id": 3, "name": "Ellar 2"},
+        ]
+        assert user_model.dicts(users, exclude_none=True)[0] == users[0].dict(
+            exclude_none=True
+        )
+
+    def test_model_export_with_unloaded_column(self, db_service, ignore_base):
+        user_factory = get_model_factory(db_service)
+        user_model = user_factory._meta.model
+
+        db_service.create_all()
+        user_factory(name="Ellar", email="ellar@support.com", city="Andersonchester")
+
+        session = db_service.session_factory()
+        user = session.execute(
+            model.select(user_model).options(model.defer(user_model.city))
+        ).scalar_one()
+
+        # `__dict__` holds the instance state instead of the deferred column
+        assert "city" not in user.__dict__
+        assert user.dict() == {
+            "address": None,
+            "city": "Andersonchester",
+            "email": "ellar@support.com",
+            "id": 1,
+            "name": "Ellar",
+        }
+        session.close()
+
+    def test_model_exporter_is_cached(self, db_service, ignore_base):
+        user_factory = get_model_factory(db_service)
+        user_model = user_factory._meta.model
+
+        exporter = user_model._get_exporter({"id", "name"}, None)
+
+        assert user_model._get_exporter({"name", "id"}, None) is exporter
+        assert user_model._get_exporter({"id", "name"}, set()) is exporter
+        assert user_model._get_exporter({"id"}, None) is not exporter
+
+
+class TestModelColumnarExport:
+    def _seed(self, db_service):
+        user_factory = get_model_factory(db_service)
+        db_service.create_all()
+
+        for i in range(3):
+            user_factory(name=f"Ellar {i}", email=f"ellar{i}@support.com", city=None)
+        return user_factory._meta.model
+
+    def test_to_columns_from_select(self, db_service, ignore_base):
+        user_model = self._seed(db_service)
+        session = db_service.session_factory()
+
+        columns = user_model.to_columns(
+            model.select(user_model).where(user_model.id > 1).order_by(user_model.id),
+            session=session,
+        )
+        assert columns == {
+            "id": [2, 3],
+            "name": ["Ellar 1", "Ellar 2"],
+            "email": ["ellar1@support.com", "ellar2@support.com"],
+            "address": [None, None],
+            "city": [None, None],
+        }
+        # rows are not hydrated to model instances
+        assert len(session.identity_map) == 0
+
+        columns = user_model.to_columns(
+            model.select(user_model.id, user_model.name).where(user_model.id > 5),
+            session=session,
+        )
+        assert columns == {"id": [], "name": []}
+        session.close()
+
+    def test_to_columns_from_instances(self, db_service, ignore_base):
+        user_model = self._seed(db_service)
+        session = db_service.session_factory()
+
+        users = session.execute(model.select(user_model)).scalars()
+        columns = user_model.to_columns(users)
+
+        assert columns["id"] == [1, 2, 3]
+        assert columns["name"] == ["Ellar 0", "Ellar 1", "Ellar 2"]
+        session.close()
+
+    def test_select_light(self, db_service, ignore_base):
+        user_model = self._seed(db_service)
+        session = db_service.session_factory()
+
+        records = user_model.select_light(
+            model.select(user_model).where(user_model.id > 1), session=session
+        )
+
+        assert [record.name for record in records] == ["Ellar 1", "Ellar 2"]
+        assert records[0]._asdict() == {
+            "id": 2,
+            "name": "Ellar 1",
+            "email": "ellar1@support.com",
+            "address": None,
+            "city": None,
+        }
+        assert type(records[0]) is user_model.get_record_type()
+        assert len(session.identity_map) == 0
+
+        with pytest.raises(AssertionError):
+            user_model.select_light(model.select(user_model.id))
+        session.close()
+
+    def test_to_arrays(self, db_service, ignore_base):
+        np = pytest.importorskip("numpy")
+        user_model = self._seed(db_service)
+        session = db_service.session_factory()
+
+        arrays = user_model.to_arrays(session=session)
+
+        assert arrays["id"].dtype == np.int64
+        assert arrays["id"].sum() == 6
+        assert arrays["name"].dtype == object
+        assert list(arrays["city"]) == [None, None, None]
+        session.close()
+
+    def test_to_arrays_keeps_nulls(self, db_service, ignore_base):
+        np = pytest.importorskip("numpy")
+
+        class Flag(model.Model):
+            id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+            enabled: model.Mapped[bool] = model.Column(model.Boolean, nullable=True)
+            score: model.Mapped[float] = model.Column(model.Float, nullable=True)
+
+        db_service.create_all()
+        session = db_service.session_factory()
+        session.add_all([Flag(enabled=True, score=1.5), Flag(enabled=None, score=None)])
+        session.commit()
+
+        arrays = Flag.to_arrays(session=session)
+
+        assert arrays["id"].dtype == np.int64
+        assert arrays["enabled"].dtype == object
+        assert list(arrays["enabled"]) == [True, None]
+        assert list(arrays["score"]) == [1.5, None]
+        session.close()
+
 
 @pytest.mark.asyncio
 class TestModelExportAsync:
@@ -142,3 +298,18 @@ class TestModelExportAsync:
         user = user_factory()
 
         assert user.dict(exclude={"email", "name"}).keys() == {"address", "city", "id"}
+
+    async def test_to_columns_async(self, db_service_async, ignore_base):
+        user_factory = get_model_factory(db_service_async)
+
+        db_service_async.create_all()
+
+        user_factory(name="Ellar", email="ellar@support.com", city="Andersonchester")
+        user_model = user_factory._meta.model
+
+        session = db_service_async.session_factory()
+        columns = user_model.to_columns(session=session)
+
+        assert columns["name"] == ["Ellar"]
+        assert columns["city"] == ["Andersonchester"]
+        await session.close()
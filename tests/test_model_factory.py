@@ -5,6 +5,7 @@ import factory
 import pytest
 from factory import FactoryError
 from factory.alchemy import SESSION_PERSISTENCE_COMMIT, SESSION_PERSISTENCE_FLUSH
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import relationship
 
@@ -97,7 +98,7 @@ class TestModelFactory:
 
         group = group_factory()
         assert f"<Group (pending {id(group)})>" == repr(group)
-        assert group.dict().keys() != {"name", "user_id", "id"}
+        assert group.dict().keys() == {"name", "user_id", "id"}
         session.close()
 
     def test_model_factory_session_flush(self, db_service, ignore_base):
@@ -171,6 +172,82 @@ class TestModelFactory:
 
         session.close()
 
+    def test_model_factory_create_batch(self, db_service, ignore_base):
+        session = db_service.session_factory()
+        group_factory = create_group_model(
+            user={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_COMMIT,
+            },
+            group={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_COMMIT,
+                "sqlalchemy_batch_persistence": True,
+            },
+        )
+        db_service.create_all()
+
+        commits = []
+        event.listen(session, "after_commit", commits.append)
+
+        groups = group_factory.create_batch(5)
+
+        assert len({group.id for group in groups}) == 5
+        assert all(group.user.id == group.user_id for group in groups)
+        # one commit for the batch, instead of one per group and user
+        assert len(commits) == 1
+        session.close()
+
+    def test_model_factory_create_batch_get_or_create(self, db_service, ignore_base):
+        session = db_service.session_factory()
+        group_factory = create_group_model(
+            user={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_FLUSH,
+            },
+            group={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_FLUSH,
+                "sqlalchemy_get_or_create": ("name",),
+            },
+        )
+        db_service.create_all()
+
+        groups = group_factory.create_batch(2, name="same group")
+        assert groups[0] is groups[1]
+
+        class BatchGroupFactory(group_factory):
+            class Meta:
+                sqlalchemy_batch_persistence = True
+
+        with pytest.raises(FactoryError, match="sqlalchemy_get_or_create"):
+            BatchGroupFactory.create_batch(2)
+        session.close()
+
+    def test_model_factory_create_batch_flushes_each_instance(
+        self, db_service, ignore_base
+    ):
+        session = db_service.session_factory()
+        group_factory = create_group_model(
+            user={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_FLUSH,
+            },
+            group={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_FLUSH,
+            },
+        )
+
+        class GroupWithUserIdFactory(group_factory):
+            user_id = factory.SelfAttribute("user.id")
+
+        db_service.create_all()
+
+        groups = GroupWithUserIdFactory.create_batch(2)
+        assert all(group.user_id == group.user.id is not None for group in groups)
+        session.close()
+
 
 @pytest.mark.asyncio
 class TestModelFactoryAsync:
@@ -210,7 +287,7 @@ class TestModelFactoryAsync:
 
         group = group_factory()
         assert f"<Group (pending {id(group)})>" == repr(group)
-        assert group.dict().keys() != {"name", "user_id", "id"}
+        assert group.dict().keys() == {"name", "user_id", "id"}
         await session.close()
 
     async def test_model_factory_session_flush_async(
@@ -305,3 +382,51 @@ class TestModelFactoryAsync:
         with pytest.raises(FactoryError):
             group_factory()
         await session.close()
+
+    async def test_model_factory_create_batch_async(
+        self, db_service_async, ignore_base
+    ):
+        session = db_service_async.session_factory()
+        group_factory = create_group_model(
+            user={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_COMMIT,
+            },
+            group={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_COMMIT,
+                "sqlalchemy_batch_persistence": True,
+            },
+        )
+        db_service_async.create_all()
+
+        groups = await group_factory.create_batch_async(3)
+        assert len({group.id for group in groups}) == 3
+        assert all(group.dict().keys() == {"name", "user_id", "id"} for group in groups)
+
+        group = await group_factory.create_async(name="new group")
+        assert group.name == "new group"
+        assert group.id is not None
+        await session.close()
+
+    async def test_model_factory_create_async_get_or_create(
+        self, db_service_async, ignore_base
+    ):
+        session = db_service_async.session_factory()
+        group_factory = create_group_model(
+            user={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_FLUSH,
+            },
+            group={
+                "sqlalchemy_session": session,
+                "sqlalchemy_session_persistence": SESSION_PERSISTENCE_FLUSH,
+                "sqlalchemy_get_or_create": ("name",),
+            },
+        )
+        db_service_async.create_all()
+
+        group = await group_factory.create_async(name="same group")
+        groups = await group_factory.create_batch_async(2, name="same group")
+        assert groups[0] is groups[1] is group
+        await session.close()
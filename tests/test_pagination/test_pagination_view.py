@@ -5,11 +5,13 @@ import pytest
 from ellar.testing import TestClient
 
 from ellar_sql import (
+    EllarSQLService,
     LimitOffsetPagination,
     PageNumberPagination,
     model,
     paginate,
 )
+from ellar_sql.pagination.view import PaginationBase
 
 from .seed import seed_100_users
 
@@ -316,3 +318,146 @@ def test_api_paginate_with_limit_offset_case_invalid(ignore_base, app_setup):
         @paginate(pagination_class=LimitOffsetPagination)
         def paginated_user():
             pass
+
+
+@pytest.mark.parametrize(
+    "pagination_class, kw, query, expected",
+    [
+        (
+            PageNumberPagination,
+            {"per_page": 2},
+            "/list?page=2",
+            {
+                "count": 100,
+                "next": "http://testserver/list?page=3",
+                "previous": "http://testserver/list",
+                "items": [
+                    {"id": 3, "name": "User Number 3"},
+                    {"id": 4, "name": "User Number 4"},
+                ],
+            },
+        ),
+        (
+            LimitOffsetPagination,
+            {"limit": 2},
+            "/list?offset=2",
+            {
+                "count": 100,
+                "items": [
+                    {"id": 3, "name": "User Number 3"},
+                    {"id": 4, "name": "User Number 4"},
+                ],
+            },
+        ),
+    ],
+)
+def test_api_paginate_fast_serialization(
+    ignore_base, app_setup, pagination_class, kw, query, expected
+):
+    user_model = seed_100_users()
+
+    @ecm.get("/list")
+    @paginate(
+        item_schema=UserSerializer,
+        pagination_class=pagination_class,
+        fast_serialization=True,
+        **kw,
+    )
+    def paginated_user():
+        return model.select(user_model)
+
+    app = app_setup(routers=[paginated_user])
+    client = TestClient(app)
+
+    res = client.get(query)
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/json"
+    assert res.json() == expected
+
+
+@pytest.mark.parametrize("etag_columns", [["name"], []])
+@pytest.mark.parametrize("fast_serialization", [False, True])
+@pytest.mark.parametrize(
+    "pagination_class, kw",
+    [(LimitOffsetPagination, {"limit": 5}), (PageNumberPagination, {"per_page": 5})],
+)
+def test_api_paginate_etag(
+    ignore_base, app_setup, pagination_class, kw, fast_serialization, etag_columns
+):
+    user_model = seed_100_users()
+
+    @ecm.get("/list")
+    @paginate(
+        item_schema=UserSerializer,
+        pagination_class=pagination_class,
+        etag_columns=etag_columns,
+        fast_serialization=fast_serialization,
+        **kw,
+    )
+    def paginated_user():
+        return model.select(user_model)
+
+    app = app_setup(routers=[paginated_user])
+    client = TestClient(app)
+
+    res = client.get("/list")
+    assert res.status_code == 200
+    etag = res.headers["etag"]
+    assert etag.startswith('W/"')
+
+    res = client.get("/list", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["etag"] == etag
+    assert res.content == b""
+
+    session = app.injector.get(EllarSQLService).session_factory()
+    session.execute(
+        model.update(user_model)
+        .where(user_model.id == 1)
+        .values(name="Updated User Number 1")
+    )
+    session.commit()
+    session.close()
+
+    res = client.get("/list", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+    assert res.json()["items"][0] == {"id": 1, "name": "Updated User Number 1"}
+
+
+def test_api_paginate_light(ignore_base, app_setup):
+    user_model = seed_100_users()
+
+    @ecm.get("/list")
+    @paginate(item_schema=UserSerializer, per_page=2, light=True)
+    def paginated_user():
+        return model.select(user_model)
+
+    app = app_setup(routers=[paginated_user])
+    client = TestClient(app)
+
+    res = client.get("/list")
+
+    assert res.status_code == 200
+    assert res.json()["items"] == [
+        {"id": 1, "name": "User Number 1"},
+        {"id": 2, "name": "User Number 2"},
+    ]
+
+
+def test_custom_pagination_without_etag_support():
+    class NoPagination(PaginationBase):
+        def get_output_schema(self, item_schema):
+            return item_schema
+
+        def api_paginate(self, model, input_schema, request, **params):
+            return []
+
+        def pagination_context(self, model, input_schema, request, **params):
+            return {}
+
+    pagination = NoPagination()
+
+    with pytest.raises(NotImplementedError, match="NoPagination"):
+        pagination.api_fingerprint(None, None, None, columns=["name"])
@@ -97,3 +97,27 @@ async def test_error_out(ignore_base, app_ctx, anyio_backend):
         p = Paginator(model=user_model, page=page, per_page=per_page, error_out=False)
         assert p.per_page == 20
         assert p.page == 1
+
+
+async def test_light_paginator(ignore_base, app_ctx, anyio_backend):
+    user_model = seed_100_users()
+
+    p = Paginator(model=user_model, per_page=10, page=2, light=True)
+    record = p.items[0]
+
+    assert isinstance(record, user_model.get_record_type())
+    assert (record.id, record.name) == (11, "User Number 11")
+    with pytest.raises(AttributeError):
+        record.name = "Changed"
+
+    p = p.next()
+    assert p.items[0].id == 21
+    assert isinstance(p.items[0], tuple)
+
+
+async def test_light_paginator_async(ignore_base, app_ctx_async, anyio_backend):
+    user_model = seed_100_users()
+
+    p = Paginator(model=user_model, per_page=10, light=True)
+    assert [record.id for record in p.items] == list(range(1, 11))
+    assert p.total == 100
@@ -0,0 +1,129 @@
+import typing as t
+
+import ellar.common as ecm
+from ellar.testing import TestClient
+
+from ellar_sql import model, paginate
+from ellar_sql.pagination.utils import apply_schema_projection
+
+from .seed import seed_100_users
+
+
+def _create_models():
+    class Author(model.Model):
+        id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+        name: model.Mapped[str] = model.Column(model.String)
+        biography: model.Mapped[str] = model.Column(model.Text, nullable=True)
+        books: model.Mapped[t.List["Book"]] = model.relationship(
+            "Book", back_populates="author"
+        )
+
+    class Book(model.Model):
+        id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+        title: model.Mapped[str] = model.Column(model.String)
+        content: model.Mapped[str] = model.Column(model.Text, nullable=True)
+        author_id: model.Mapped[int] = model.Column(model.ForeignKey("author.id"))
+        author: model.Mapped[Author] = model.relationship(
+            "Author", back_populates="books"
+        )
+
+    return Author, Book
+
+
+class BookSchema(ecm.Serializer):
+    title: str
+
+
+class AuthorSchema(ecm.Serializer):
+    name: str
+    books: t.List[BookSchema]
+
+
+class AuthorPropertySchema(ecm.Serializer):
+    name: str
+    display_name: str
+
+
+def _loaded_columns(statement: model.Select) -> str:
+    return str(statement.compile()).split("FROM")[0]
+
+
+def test_schema_projection_loads_only_schema_columns(ignore_base):
+    author, _ = _create_models()
+
+    statement = apply_schema_projection(model.select(author), AuthorSchema)
+    columns = _loaded_columns(statement)
+
+    assert "author.name" in columns
+    assert "author.id" in columns
+    assert "author.biography" not in columns
+
+
+def test_schema_projection_skips_unknown_attributes(ignore_base):
+    author, _ = _create_models()
+
+    statement = model.select(author)
+    assert apply_schema_projection(statement, AuthorPropertySchema) is statement
+
+
+def test_schema_projection_skips_customized_statements(ignore_base):
+    author, _ = _create_models()
+
+    statement = model.select(author).options(model.joinedload(author.books))
+    assert apply_schema_projection(statement, AuthorSchema) is statement
+
+    statement = model.select(author.id, author.name)
+    assert apply_schema_projection(statement, AuthorSchema) is statement
+
+
+def test_api_paginate_with_schema_projection(ignore_base, app_setup):
+    user_model = seed_100_users()
+
+    class UserNameSchema(ecm.Serializer):
+        name: str
+
+    @ecm.get("/list")
+    @paginate(item_schema=UserNameSchema, per_page=5)
+    def paginated_user():
+        return model.select(user_model)
+
+    app = app_setup(routers=[paginated_user])
+    client = TestClient(app)
+
+    res = client.get("/list")
+
+    assert res.status_code == 200
+    assert res.json()["items"][0] == {"name": "User Number 1"}
+
+
+class NodeSchema(ecm.Serializer):
+    name: str
+    children: t.List["NodeSchema"]
+
+
+def test_schema_projection_self_referencing_schema(ignore_base, db_service):
+    class Node(model.Model):
+        id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+        name: model.Mapped[str] = model.Column(model.String)
+        parent_id: model.Mapped[t.Optional[int]] = model.Column(
+            model.ForeignKey("node.id"), nullable=True
+        )
+        children: model.Mapped[t.List["Node"]] = model.relationship("Node")
+
+    statement = apply_schema_projection(model.select(Node), NodeSchema)
+    assert statement._with_options
+    assert "node.name" in _loaded_columns(statement)
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    root = Node(name="root", children=[Node(name="leaf", children=[])])
+    session.add(root)
+    session.commit()
+    session.expunge_all()
+
+    node = session.execute(statement.where(Node.name == "root")).scalar_one()
+    assert NodeSchema.model_validate(node, from_attributes=True).model_dump() == {
+        "name": "root",
+        "children": [{"name": "leaf", "children": []}],
+    }
+    session.close()
@@ -0,0 +1,225 @@
+import asyncio
+import typing as t
+import uuid
+
+import ellar.common as ecm
+import pytest
+from ellar.testing import TestClient
+from ellar.threading.sync_worker import execute_coroutine
+
+from ellar_sql import EllarSQLService, get_or_404, get_or_none, model
+from ellar_sql.query import ModelLoader
+
+
+def _create_models():
+    class User(model.Model):
+        id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+        name: model.Mapped[str] = model.Column(model.String)
+
+    class Group(model.Model):
+        id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+        name: model.Mapped[str] = model.Column(model.String)
+
+    return User, Group
+
+
+def _seed(db_service):
+    user_model, group_model = _create_models()
+    db_service.create_all()
+
+    session = db_service.session_factory()
+    session.add_all([user_model(name=f"User {i}") for i in range(1, 6)])
+    session.add_all([group_model(name=f"Group {i}") for i in range(1, 3)])
+    for res in (session.commit(), session.close()):
+        if isinstance(res, t.Coroutine):
+            execute_coroutine(res)
+
+    return user_model, group_model
+
+
+def _track_statements(engine):
+    statements = []
+
+    @model.event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.asyncio
+class TestModelLoader:
+    async def test_loads_are_batched_per_model(self, db_service, ignore_base):
+        user_model, group_model = _seed(db_service)
+        statements = _track_statements(db_service.engine)
+
+        session = db_service.session_factory()
+        loader = ModelLoader(session)
+
+        users, group, missing = await asyncio.gather(
+            loader.load_many(user_model, [3, 1, 5]),
+            loader.load(group_model, 2),
+            loader.load(user_model, 10),
+        )
+
+        assert [user.name for user in users] == ["User 3", "User 1", "User 5"]
+        assert group.name == "Group 2"
+        assert missing is None
+        assert len(statements) == 2
+
+        # cached for the session
+        assert await loader.load(user_model, 1) is users[1]
+        assert await loader.load(user_model, 10) is None
+        assert len(statements) == 2
+        session.close()
+
+    async def test_loads_convert_idents_to_primary_key_types(
+        self, db_service, ignore_base
+    ):
+        user_model, _ = _seed(db_service)
+
+        class Token(model.Model):
+            id = model.Column(model.GUID(), primary_key=True)
+            name = model.Column(model.String)
+
+        token_id = uuid.uuid4()
+        db_service.create_all()
+        session = db_service.session_factory()
+        session.add(Token(id=token_id, name="token"))
+        session.commit()
+        session.close()
+
+        session = db_service.session_factory()
+        loader = ModelLoader(session)
+
+        user, token, same_token = await asyncio.gather(
+            loader.load(user_model, "1"),
+            loader.load(Token, str(token_id)),
+            loader.load(Token, token_id.hex.upper()),
+        )
+
+        assert user is session.get(user_model, 1)
+        assert token.name == "token"
+        assert same_token is token
+        session.close()
+
+    async def test_cache_is_cleared_on_flush(self, db_service, ignore_base):
+        user_model, _ = _seed(db_service)
+
+        session = db_service.session_factory()
+        loader = ModelLoader(session)
+
+        assert await loader.load(user_model, 10) is None
+
+        session.add(user_model(id=10, name="User 10"))
+        session.flush()
+
+        user = await loader.load(user_model, 10)
+        assert user.name == "User 10"
+        session.close()
+
+    async def test_cache_is_cleared_on_commit_and_rollback(
+        self, db_service, ignore_base
+    ):
+        user_model, _ = _seed(db_service)
+
+        session = db_service.session_factory()
+        loader = ModelLoader(session)
+        assert await loader.load(user_model, 10) is None
+
+        # added by another transaction
+        other_session = db_service.session_factory()
+        other_session.add(user_model(id=10, name="User 10"))
+        other_session.commit()
+        other_session.close()
+
+        session.rollback()
+        user = await loader.load(user_model, 10)
+        assert user.name == "User 10"
+
+        user.name = "Renamed"
+        session.commit()
+        assert loader._cache == {}
+        session.close()
+
+    async def test_close_removes_session_listeners(self, db_service, ignore_base):
+        user_model, _ = _seed(db_service)
+
+        session = db_service.session_factory()
+        loader = ModelLoader(session)
+        assert await loader.load(user_model, 1) is not None
+
+        loader.close()
+        assert not model.event.contains(
+            session, "after_commit", loader._on_session_event
+        )
+        assert loader._cache == {}
+        session.close()
+
+    async def test_loads_with_async_session(self, db_service_async, ignore_base):
+        user_model, group_model = _seed(db_service_async)
+        statements = _track_statements(db_service_async.engine)
+
+        session = db_service_async.session_factory()
+        loader = ModelLoader(session)
+
+        users, groups = await asyncio.gather(
+            loader.load_many(user_model, [1, 2]),
+            loader.load_many(group_model, [1, 2]),
+        )
+
+        assert [user.name for user in users] == ["User 1", "User 2"]
+        assert [group.name for group in groups] == ["Group 1", "Group 2"]
+        assert len(statements) == 2
+        await session.close()
+
+
+def test_get_or_none_batches_lookups_during_request(ignore_base, app_setup):
+    user_model, _ = _create_models()
+
+    @ecm.get("/users")
+    async def get_users():
+        users = await asyncio.gather(
+            *(get_or_none(user_model, ident) for ident in range(1, 7))
+        )
+        return [user.name if user else None for user in users]
+
+    app = app_setup(routers=[get_users])
+    db_service = app.injector.get(EllarSQLService)
+    db_service.create_all()
+
+    session = db_service.session_factory()
+    session.add_all([user_model(name=f"User {i}") for i in range(1, 6)])
+    session.commit()
+    session.close()
+
+    statements = _track_statements(db_service.engine)
+
+    client = TestClient(app)
+    res = client.get("/users")
+
+    assert res.status_code == 200
+    assert res.json() == ["User 1", "User 2", "User 3", "User 4", "User 5", None]
+    assert len(statements) == 1
+
+
+def test_get_or_404_with_string_ident_during_request(ignore_base, app_setup):
+    user_model, _ = _create_models()
+
+    @ecm.get("/users/{user_id}")
+    async def get_user(user_id: str):
+        user = await get_or_404(user_model, user_id)
+        return user.name
+
+    app = app_setup(routers=[get_user])
+    db_service = app.injector.get(EllarSQLService)
+    db_service.create_all()
+
+    session = db_service.session_factory()
+    session.add(user_model(name="User 1"))
+    session.commit()
+    session.close()
+
+    client = TestClient(app)
+    assert client.get("/users/1").json() == "User 1"
+    assert client.get("/users/2").status_code == 404
@@ -1,14 +1,19 @@
 import typing as t
+import uuid
 
+import ellar.common as ecm
 import pytest
 from ellar.app import App
 from ellar.common import NotFound
+from ellar.core import Request
+from ellar.testing import TestClient
 from ellar.threading.sync_worker import execute_coroutine
 
 from ellar_sql import (
     EllarSQLService,
     first_or_404,
     first_or_none,
+    get_many_or_404,
     get_or_404,
     get_or_none,
     model,
@@ -24,7 +29,7 @@ def _create_model():
     return User
 
 
-def _seed_model(app: App):
+def _seed_model(app: App, *names: str):
     user_model = _create_model()
     db_service = app.injector.get(EllarSQLService)
 
@@ -32,7 +37,8 @@ def _seed_model(app: App):
 
     db_service.create_all()
 
-    session.add(user_model(name="First User"))
+    for name in names or ("First User",):
+        session.add(user_model(name=name))
     res = session.commit()
 
     if isinstance(res, t.Coroutine):
@@ -131,3 +137,85 @@ async def test_one_or_404_async_works(ignore_base, app_ctx_async, anyio_backend)
 
         with pytest.raises(NotFound):
             await one_or_404(model.select(user_model).where(user_model.id == 2))
+
+
+async def test_get_many_or_404_works(ignore_base, app_ctx, anyio_backend):
+    user_model = _seed_model(app_ctx, "First User", "Second User")
+
+    users = await get_many_or_404(user_model, [2, 1, 2])
+    assert [user.name for user in users] == ["Second User", "First User"]
+
+    # idents are converted to the primary key type
+    users = await get_many_or_404(user_model, ["2", 1, 2])
+    assert [user.name for user in users] == ["Second User", "First User"]
+
+    assert await get_many_or_404(user_model, []) == []
+
+    with pytest.raises(NotFound):
+        await get_many_or_404(user_model, [1, 3])
+
+
+async def test_get_many_or_404_async_works(ignore_base, app_ctx_async, anyio_backend):
+    if anyio_backend == "asyncio":
+        user_model = _seed_model(app_ctx_async, "First User", "Second User")
+
+        users = await get_many_or_404(user_model, [1, 2])
+        assert [user.name for user in users] == ["First User", "Second User"]
+
+        with pytest.raises(NotFound):
+            await get_many_or_404(user_model, [3])
+
+
+def test_query_utils_reuse_request_session(ignore_base, app_setup):
+    user_model = _create_model()
+
+    @ecm.get("/user/{user_id:int}")
+    async def get_user(user_id: int, request: ecm.Inject[Request]):
+        user = await get_or_404(user_model, user_id)
+        first = await first_or_404(model.select(user_model))
+        return {
+            "name": user.name,
+            "same_session": model.object_session(user) is request.state.session,
+            "identity_map": first is user,
+        }
+
+    app = app_setup(routers=[get_user])
+    db_service = app.injector.get(EllarSQLService)
+    db_service.create_all()
+
+    session = db_service.session_factory()
+    session.add(user_model(name="First User"))
+    session.commit()
+    session.close()
+
+    client = TestClient(app)
+    res = client.get("/user/1")
+
+    assert res.status_code == 200
+    assert res.json() == {
+        "name": "First User",
+        "same_session": True,
+        "identity_map": True,
+    }
+
+
+async def test_get_many_or_404_converts_guid_idents(
+    ignore_base, app_ctx, anyio_backend
+):
+    class Token(model.Model):
+        id = model.Column(model.GUID(), primary_key=True)
+        name = model.Column(model.String)
+
+    db_service = app_ctx.injector.get(EllarSQLService)
+    db_service.create_all()
+    token_ids = [uuid.uuid4(), uuid.uuid4()]
+
+    session = db_service.session_factory()
+    session.add_all(
+        [Token(id=token_id, name=str(i)) for i, token_id in enumerate(token_ids)]
+    )
+    session.commit()
+    session.close()
+
+    tokens = await get_many_or_404(Token, [str(token_ids[1]), token_ids[0].hex])
+    assert [token.name for token in tokens] == ["1", "0"]
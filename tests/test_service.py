@@ -1,5 +1,12 @@
+import gc
+import sys
+import textwrap
+import weakref
+
 import pytest
+import sqlalchemy as sa
 import sqlalchemy.exc as sa_exc
+import sqlalchemy.orm as sa_orm
 from ellar.common.exceptions import ImproperConfiguration
 
 from ellar_sql import model
@@ -10,6 +17,10 @@ from ellar_sql.model.database_binds import (
 )
 from ellar_sql.schemas import ModelBaseConfig
 from ellar_sql.services import EllarSQLService
+from ellar_sql.services.model_registry import (
+    _listening_registries,
+    _load_listening_registries,
+)
 
 
 def test_service_default_setup_create_all(db_service, ignore_base):
@@ -305,3 +316,181 @@ async def test_using_create_drop_reflect_async_for_sync_engine_work(
         session.execute(model.select(User)).scalars()
 
     db_service.reflect()
+
+
+@pytest.fixture()
+def models_modules(tmp_path, monkeypatch):
+    names = []
+
+    def _write(name, source):
+        (tmp_path / f"{name}.py").write_text(textwrap.dedent(source))
+        names.append(name)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield _write
+
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+_lazy_user_module = """
+from ellar_sql import model
+
+
+class LazyUser(model.Model):
+    id = model.Column(model.Integer, primary_key=True)
+"""
+
+_lazy_post_module = """
+from ellar_sql import model
+
+
+class LazyPost(model.Model):
+    __database__ = "a"
+    id = model.Column(model.Integer, primary_key=True)
+"""
+
+
+def test_lazy_models_are_imported_on_create_all(tmp_path, models_modules, ignore_base):
+    models_modules("lazy_user_models", _lazy_user_module)
+
+    db_service = EllarSQLService(
+        databases="sqlite:///:memory:",
+        models=["lazy_user_models"],
+        lazy_models=True,
+        root_path=str(tmp_path),
+    )
+    assert "lazy_user_models" not in sys.modules
+
+    db_service.create_all()
+    assert "lazy_user_models" in sys.modules
+    assert "lazy_user" in get_metadata(DEFAULT_KEY).metadata.tables
+
+
+def test_lazy_models_are_imported_per_database(tmp_path, models_modules, ignore_base):
+    models_modules("lazy_user_models", _lazy_user_module)
+    models_modules("lazy_post_models", _lazy_post_module)
+
+    db_service = EllarSQLService(
+        databases={
+            "a": "sqlite:///app2.db",
+            "default": "sqlite:///app.db",
+        },
+        models={"default": ["lazy_user_models"], "a": ["lazy_post_models"]},
+        lazy_models=True,
+        root_path=str(tmp_path),
+    )
+
+    db_service.create_all("a")
+    assert "lazy_post_models" in sys.modules
+    assert "lazy_user_models" not in sys.modules
+
+    db_service.load_models()
+    assert "lazy_user_models" in sys.modules
+
+
+def test_lazy_models_are_imported_before_mappers_configuration(
+    tmp_path, models_modules, ignore_base
+):
+    models_modules("lazy_user_models", _lazy_user_module)
+
+    db_service = EllarSQLService(
+        databases="sqlite:///:memory:",
+        models=["lazy_user_models"],
+        lazy_models=True,
+        root_path=str(tmp_path),
+    )
+
+    class Profile(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        user_id = model.Column(model.ForeignKey("lazy_user.id"))
+        user = model.relationship("LazyUser")
+
+    assert "lazy_user_models" not in sys.modules
+
+    model.configure_mappers()
+    assert Profile.user.property.mapper.class_.__name__ == "LazyUser"
+    assert db_service._model_registry.loaded
+    assert db_service._model_registry not in _listening_registries
+
+
+def test_lazy_models_listener_does_not_hold_services(
+    tmp_path, models_modules, ignore_base
+):
+    models_modules("lazy_user_models", _lazy_user_module)
+
+    registries = []
+    for _ in range(3):
+        db_service = EllarSQLService(
+            databases="sqlite:///:memory:",
+            models=["lazy_user_models"],
+            lazy_models=True,
+            root_path=str(tmp_path),
+        )
+        registries.append(weakref.ref(db_service._model_registry))
+        assert db_service._model_registry in _listening_registries
+
+    del db_service
+    gc.collect()
+
+    # registries of discarded services are dropped, all share a single listener
+    assert all(registry() is None for registry in registries)
+    assert len(_listening_registries) == 0
+    assert sa.event.contains(
+        sa_orm.Mapper, "before_configured", _load_listening_registries
+    )
+
+
+def test_register_statements_precompiles_statements(db_service, ignore_base):
+    class User(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        name = model.Column(model.String)
+
+    db_service.create_all()
+    statement = model.select(User).where(User.name == "First User")
+
+    assert db_service.register_statements(statement) == 1
+    assert db_service.register_statements(statement) == 0
+    assert db_service.get_statement_cache_stats()[DEFAULT_KEY].size == 1
+
+    session = db_service.session_factory()
+    session.execute(model.select(User).where(User.name == "Second User")).all()
+    session.close()
+
+    stats = db_service.get_statement_cache_stats()[DEFAULT_KEY]
+    assert (stats.hits, stats.misses) == (1, 0)
+    assert stats.hit_ratio == 1.0
+
+
+def test_capture_statements_registers_executed_statements(db_service, ignore_base):
+    class User(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        name = model.Column(model.String)
+
+    db_service.create_all()
+    session = db_service.session_factory()
+
+    with db_service.capture_statements() as captured:
+        session.add(User(name="First User"))
+        session.commit()
+        session.execute(model.select(User)).all()
+        session.execute(model.select(User)).all()
+
+    session.close()
+
+    assert len(captured) == 3
+    assert captured[0].column_keys == ("name",)
+
+    db_service.engine._compiled_cache.clear()
+    assert db_service.compile_statements() == 2
+
+
+def test_query_cache_size(tmp_path, ignore_base):
+    db_service = EllarSQLService(
+        databases="sqlite:///:memory:",
+        query_cache_size=10,
+        root_path=str(tmp_path),
+    )
+    stats = db_service.get_statement_cache_stats()[DEFAULT_KEY]
+    assert stats.capacity == 10
+    assert stats.size == 0
@@ -0,0 +1,132 @@
+import pytest
+import sqlalchemy as sa
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.testing import (
+    DatabaseSnapshot,
+    async_savepoint_session,
+    savepoint_session,
+)
+
+
+def create_note_model():
+    class Note(model.Model):
+        id: model.Mapped[int] = model.Column(model.Integer, primary_key=True)
+        text: model.Mapped[str] = model.Column(model.String)
+
+    return Note
+
+
+def _count(session, model_class):
+    return session.execute(sa.select(sa.func.count()).select_from(model_class)).scalar()
+
+
+class TestDatabaseSnapshot:
+    def test_restore_sqlite_memory(self, db_service, ignore_base):
+        note = create_note_model()
+        snapshot = DatabaseSnapshot(db_service)
+        snapshot.create()
+
+        session = db_service.session_factory()
+        session.add(note(text="seeded"))
+        session.commit()
+        assert _count(session, note) == 1
+        session.close()
+
+        snapshot.restore()
+
+        session = db_service.session_factory()
+        assert _count(session, note) == 0
+        session.close()
+        snapshot.drop()
+
+    def test_restore_and_clone_sqlite_file(self, tmp_path, ignore_base):
+        note = create_note_model()
+        db_service = EllarSQLService(
+            databases={"default": f"sqlite:///{tmp_path / 'app.db'}"},
+            root_path=str(tmp_path),
+        )
+        snapshot = DatabaseSnapshot(db_service, "default")
+        snapshot.create()
+
+        session = db_service.session_factory()
+        session.add(note(text="seeded"))
+        session.commit()
+        session.close()
+
+        snapshot.restore("default")
+        session = db_service.session_factory()
+        assert _count(session, note) == 0
+        session.close()
+
+        url = snapshot.clone("default", "worker_1")
+        engine = sa.create_engine(url)
+        with engine.connect() as connection:
+            assert sa.inspect(connection).get_table_names() == ["note"]
+        engine.dispose()
+
+        snapshot.drop()
+        with pytest.raises(sa.exc.ArgumentError, match="'sqlite' dialect"):
+            snapshot.clone("default", "worker_2")
+
+    @pytest.mark.asyncio
+    async def test_restore_sqlite_async(self, db_service_async, ignore_base):
+        note = create_note_model()
+        snapshot = DatabaseSnapshot(db_service_async)
+        snapshot.create()
+
+        session = db_service_async.session_factory()
+        session.add(note(text="seeded"))
+        await session.commit()
+        await session.close()
+
+        snapshot.restore()
+
+        session = db_service_async.session_factory()
+        count = await session.execute(sa.select(sa.func.count()).select_from(note))
+        assert count.scalar() == 0
+        await session.close()
+        snapshot.drop()
+
+
+class TestSavepointSession:
+    def test_savepoint_session_rolls_back(self, db_service, ignore_base):
+        note = create_note_model()
+        db_service.create_all()
+        session_factory = db_service.session_factory
+
+        with savepoint_session(db_service) as session:
+            session.add(note(text="first"))
+            session.commit()
+
+            # sessions of the service join the same transaction
+            other_session = db_service.session_factory()
+            assert _count(other_session, note) == 1
+            other_session.close()
+
+            session.add(note(text="second"))
+            session.rollback()
+            assert _count(session, note) == 1
+
+        assert db_service.session_factory is session_factory
+        session = db_service.session_factory()
+        assert _count(session, note) == 0
+        session.close()
+
+    @pytest.mark.asyncio
+    async def test_async_savepoint_session_rolls_back(
+        self, db_service_async, ignore_base
+    ):
+        note = create_note_model()
+        db_service_async.create_all()
+
+        async with async_savepoint_session(db_service_async) as session:
+            session.add(note(text="first"))
+            await session.commit()
+            count = await session.execute(sa.select(sa.func.count()).select_from(note))
+            assert count.scalar() == 1
+
+        session = db_service_async.session_factory()
+        count = await session.execute(sa.select(sa.func.count()).select_from(note))
+        assert count.scalar() == 0
+        await session.close()
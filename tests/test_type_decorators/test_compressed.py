@@ -0,0 +1,141 @@
+import lzma
+import zlib
+
+import pytest
+
+from ellar_sql import model
+from ellar_sql.model.typeDecorator import LazyTypeDecorator, LazyValue
+
+PAYLOAD = {"items": [{"id": i, "name": "item"} for i in range(100)]}
+
+
+def _create_documents(db_service, **kwargs):
+    class Document(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        data = model.Column(model.CompressedJSON(**kwargs))
+        text = model.Column(model.CompressedText(**kwargs))
+        binary = model.Column(model.CompressedBinary(**kwargs))
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add_all(
+        [
+            Document(data=PAYLOAD, text="text " * 100, binary=b"\x00" * 100),
+            Document(data=None, text=None, binary=None),
+        ]
+    )
+    session.commit()
+    session.expunge_all()
+    return Document, session
+
+
+@pytest.mark.parametrize("codec", [zlib, lzma])
+def test_compressed_column_types(db_service, ignore_base, codec):
+    Document, session = _create_documents(db_service, codec=codec)
+
+    stored = session.execute(model.text("SELECT data, text FROM document")).first()
+    assert codec.decompress(stored.text) == b"text " * 100
+    assert len(stored.data) < len(str(PAYLOAD))
+
+    documents = session.execute(model.select(Document).order_by(Document.id)).scalars()
+    assert [(d.data, d.text, d.binary) for d in documents] == [
+        (PAYLOAD, "text " * 100, b"\x00" * 100),
+        (None, None, None),
+    ]
+
+
+def test_compressed_column_is_decompressed_on_access(db_service, ignore_base):
+    Document, session = _create_documents(db_service)
+
+    document = session.get(Document, 1)
+    assert isinstance(document.__dict__["data"], LazyValue)
+
+    assert document.data == PAYLOAD
+    assert document.__dict__["data"] == PAYLOAD
+    assert not session.dirty
+
+    document.text = "updated"
+    session.commit()
+    session.expunge_all()
+    assert session.get(Document, 1).text == "updated"
+
+    # selected columns are decompressed when fetched
+    value = session.execute(model.select(Document.binary).limit(1)).scalar()
+    assert value == b"\x00" * 100
+    assert session.execute(
+        model.select(Document.id, Document.text).where(Document.id == 1)
+    ).one() == (1, "updated")
+    session.close()
+
+
+def test_compressed_column_export_helpers(db_service, ignore_base):
+    Document, session = _create_documents(db_service)
+
+    document = session.get(Document, 1)
+    assert isinstance(document.__dict__["text"], LazyValue)
+    assert document.dict()["text"] == "text " * 100
+    assert document.__dict__["text"] == "text " * 100
+
+    assert Document.to_columns(session=session)["data"] == [PAYLOAD, None]
+    records = Document.select_light(session=session)
+    assert [record.binary for record in records] == [b"\x00" * 100, None]
+    session.close()
+
+
+def test_lazy_type_repr_and_abstract_methods():
+    assert repr(LazyValue(b"raw", bytes)) == "<LazyValue bytes>"
+
+    class Incomplete(LazyTypeDecorator):
+        impl = model.LargeBinary
+        cache_ok = True
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_compressed_column_eager(db_service, ignore_base):
+    Document, session = _create_documents(db_service, lazy=False)
+
+    document = session.get(Document, 1)
+    assert document.__dict__["data"] == PAYLOAD
+    assert session.execute(model.select(Document.text).limit(1)).scalar() == (
+        "text " * 100
+    )
+
+
+def test_compressed_column_attributes_are_instrumented(db_service, ignore_base):
+    class Archive(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        kind = model.Column(model.String)
+        data = model.Column(model.CompressedJSON())
+
+        __mapper_args__ = {"polymorphic_on": "kind", "polymorphic_identity": "base"}
+
+        def __getattribute__(self, name):
+            return super().__getattribute__(name)
+
+    class MonthlyArchive(Archive):
+        id = model.Column(model.ForeignKey("archive.id"), primary_key=True)
+
+        __mapper_args__ = {"polymorphic_identity": "monthly"}
+
+    # only the lazy column attribute is wrapped
+    assert "__getattribute__" in Archive.__dict__
+    assert isinstance(Archive.data, model.orm.InstrumentedAttribute)
+    assert isinstance(MonthlyArchive.data, model.orm.InstrumentedAttribute)
+    assert isinstance(Archive.id, model.orm.InstrumentedAttribute)
+    assert "data" in model.inspect(Archive).all_orm_descriptors
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add(MonthlyArchive(data=PAYLOAD))
+    session.commit()
+    session.expunge_all()
+
+    archive = session.execute(model.select(Archive)).scalar_one()
+    assert isinstance(archive, MonthlyArchive)
+    assert isinstance(archive.__dict__["data"], LazyValue)
+    assert archive.data == PAYLOAD
+    assert archive.__dict__["data"] == PAYLOAD
+    assert not session.dirty
+    session.close()
@@ -0,0 +1,211 @@
+import hashlib
+from contextlib import asynccontextmanager
+
+import pytest
+from ellar.core import injector_context
+from ellar_storage import StorageService
+from libcloud.storage.types import ObjectDoesNotExistError
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.model.typeDecorator.file.blobs import (
+    BLOB_TABLE_NAME,
+    _insert_reference,
+    add_reference,
+)
+
+
+class Avatar(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    image = model.Column(model.typeDecorator.FileField(deduplicate=True))
+
+
+class Album(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    photos = model.Column(
+        model.typeDecorator.FileField(deduplicate=True, multiple=True)
+    )
+
+
+@asynccontextmanager
+async def _init_app(app_setup, **sql_module):
+    app = app_setup(sql_module=sql_module)
+    db_service = app.injector.get(EllarSQLService)
+
+    db_service.create_all("default")
+    session = db_service.session_factory()
+
+    async with injector_context(app.injector):
+        yield app, db_service, session
+
+    db_service.drop_all("default")
+
+
+def _ref_counts(session):
+    table = Avatar.__table__.metadata.tables[BLOB_TABLE_NAME]
+    return dict(session.execute(model.select(table.c.path, table.c.ref_count)).all())
+
+
+def _exists(app, path):
+    try:
+        app.injector.get(StorageService).get(path)
+        return True
+    except ObjectDoesNotExistError:
+        return False
+
+
+def test_blob_table_is_added_to_metadata():
+    table = Avatar.__table__.metadata.tables[BLOB_TABLE_NAME]
+    assert set(table.c.keys()) == {"path", "ref_count"}
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_stored_file(app_setup, monkeypatch):
+    async with _init_app(app_setup) as (app, db_service, session):
+        save_content = StorageService.save_content
+        saved = []
+
+        def _save_content(storage_service, *args, **kwargs):
+            saved.append(kwargs["name"])
+            return save_content(storage_service, *args, **kwargs)
+
+        monkeypatch.setattr(StorageService, "save_content", _save_content)
+
+        first, second = Avatar(image=b"avatar"), Avatar(image=b"avatar")
+        session.add_all([first, second, Avatar(image=b"other")])
+        session.commit()
+
+        digest = hashlib.sha256(b"avatar").hexdigest()
+        assert first.image.file_id == second.image.file_id == digest
+        assert first.image.content_hash == digest
+        assert first.image.path == second.image.path
+        assert saved == [digest, hashlib.sha256(b"other").hexdigest()]
+        assert _ref_counts(session)[first.image.path] == 2
+
+        session.delete(first)
+        session.commit()
+        assert _ref_counts(session)[second.image.path] == 1
+        assert _exists(app, second.image.path)
+
+        session.delete(second)
+        session.commit()
+        assert second.image.path not in _ref_counts(session)
+        assert not _exists(app, second.image.path)
+
+
+@pytest.mark.asyncio
+async def test_replaced_file_is_released(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        first, second = Avatar(image=b"avatar"), Avatar(image=b"avatar")
+        session.add_all([first, second])
+        session.commit()
+        path = first.image.path
+
+        first.image = b"new avatar"
+        session.commit()
+        assert _ref_counts(session)[path] == 1
+        assert _exists(app, path)
+
+        second.image = b"new avatar"
+        session.commit()
+        assert path not in _ref_counts(session)
+        assert not _exists(app, path)
+        assert _ref_counts(session)[second.image.path] == 2
+
+
+@pytest.mark.asyncio
+async def test_rollback_keeps_referenced_files(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        avatar = Avatar(image=b"avatar")
+        session.add(avatar)
+        session.commit()
+
+        session.add(Avatar(image=b"avatar"))
+        session.add(Avatar(image=b"rolled back"))
+        session.flush()
+        rolled_back_path = (
+            session.execute(model.select(Avatar).where(Avatar.id == 3))
+            .scalar_one()
+            .image.path
+        )
+        session.rollback()
+
+        assert _ref_counts(session) == {avatar.image.path: 1}
+        assert _exists(app, avatar.image.path)
+        assert not _exists(app, rolled_back_path)
+
+
+@pytest.mark.asyncio
+async def test_multiple_files_references(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        album = Album(photos=[b"photo", b"photo", b"other"])
+        session.add(album)
+        session.commit()
+        path, other_path = album.photos[0].path, album.photos[2].path
+        assert album.photos[1].path == path
+        assert _ref_counts(session) == {path: 2, other_path: 1}
+
+        album.photos.append(b"photo")
+        session.commit()
+        assert _ref_counts(session) == {path: 3, other_path: 1}
+
+        album.photos.pop(2)
+        session.commit()
+        assert _ref_counts(session) == {path: 3}
+        assert not _exists(app, other_path)
+
+
+@pytest.mark.asyncio
+async def test_parallel_uploads_are_deduplicated(app_setup):
+    async with _init_app(app_setup, file_upload_workers=4) as (
+        app,
+        db_service,
+        session,
+    ):
+        avatars = [Avatar(image=b"avatar") for _ in range(4)]
+        session.add_all(avatars)
+        session.commit()
+
+        assert len({avatar.image.path for avatar in avatars}) == 1
+        assert _ref_counts(session) == {avatars[0].image.path: 4}
+
+
+@pytest.mark.asyncio
+async def test_deleted_file_is_uploaded_again(app_setup, monkeypatch):
+    async with _init_app(app_setup) as (app, db_service, session):
+        avatar = Avatar(image=b"avatar")
+        session.add(avatar)
+        session.commit()
+        path = avatar.image.path
+
+        session.delete(avatar)
+        get = StorageService.get
+
+        def _get(storage_service, file_path):
+            # the unreferenced file is deleted after being found by the upload
+            stored_file = get(storage_service, file_path)
+            monkeypatch.setattr(StorageService, "get", get)
+            session.commit()
+            return stored_file
+
+        monkeypatch.setattr(StorageService, "get", _get)
+        new_session = db_service.session_factory()
+        new_session.add(Avatar(image=b"avatar"))
+        new_session.commit()
+
+        assert _exists(app, path)
+        assert _ref_counts(new_session) == {path: 1}
+
+
+@pytest.mark.asyncio
+async def test_references_are_upserted(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        table = Avatar.__table__.metadata.tables[BLOB_TABLE_NAME]
+
+        with db_service.engine.begin() as connection:
+            assert add_reference(connection, table, "test/a") is False
+            assert add_reference(connection, table, "test/a", 2) is True
+            # a row inserted by a concurrent transaction is incremented
+            assert _insert_reference(connection, table, "test/a", 1) is True
+            assert _insert_reference(connection, table, "test/b", 1) is False
+
+        assert _ref_counts(session) == {"test/a": 4, "test/b": 1}
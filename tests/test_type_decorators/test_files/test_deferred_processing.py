@@ -0,0 +1,196 @@
+import base64
+import io
+from contextlib import asynccontextmanager
+
+import pytest
+from ellar.core import injector_context
+from ellar_storage import StorageService
+from PIL import Image
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.constant import FILE_PROCESSING_QUEUE
+from ellar_sql.model.typeDecorator import ImageField
+from ellar_sql.model.typeDecorator.file import (
+    File,
+    FileProcessingQueue,
+    Processor,
+    ThumbnailGenerator,
+)
+
+
+class _FailingProcessor(Processor):
+    def process(self, file, upload_storage=None):
+        file.store_content(b"partial", upload_storage=upload_storage)
+        raise RuntimeError("processing failed")
+
+
+class Photo(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    image = model.Column(ImageField(thumbnail_size=(4, 4), defer_thumbnail=True))
+    images = model.Column(
+        ImageField(
+            multiple=True,
+            deferred_processors=[ThumbnailGenerator((4, 4))],
+        )
+    )
+
+
+class Scan(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    image = model.Column(ImageField(deferred_processors=[_FailingProcessor()]))
+
+
+@pytest.fixture
+def image_content():
+    return base64.b64decode(
+        "iVBORw0KGgoAAAANSUhEUgAAAAoAAAAKCAYAAACNMs+9AAAAAXNSR0IArs4c6QAAAHNJREFUKFOdkLEKwCAMRM/JwUFwdPb"
+        "/v8RPEDcdBQcHJyUt0hQ6hGY6Li8XEhVjXM45aK3xVXNOtNagcs6LRAgB1toX23tHSgkUpEopyxhzGRw"
+        "+EHljjBv03oM3KJYP1lofkJoHJs3T/4Gi1aJjxO+RPnwDur2EF1gNZukAAAAASUVORK5CYII="
+    )
+
+
+@asynccontextmanager
+async def _init_app(app_setup, **file_processing):
+    app = app_setup(sql_module={"file_processing": file_processing})
+    db_service = app.injector.get(EllarSQLService)
+
+    db_service.create_all("default")
+    session = db_service.session_factory()
+
+    async with injector_context(app.injector):
+        yield app, db_service, session
+
+    db_service.file_processing_queue.shutdown()
+    db_service.drop_all("default")
+
+
+def _image(content):
+    return File(content, filename="photo.png", content_type="image/png")
+
+
+def _load_thumbnail(app, file):
+    stored_file = app.injector.get(StorageService).get(file["thumbnail"]["path"])
+    return Image.open(io.BytesIO(stored_file.read()))
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_is_generated_after_commit(app_setup, image_content):
+    async with _init_app(app_setup) as (app, db_service, session):
+        queue = db_service.file_processing_queue
+        assert session.info[FILE_PROCESSING_QUEUE] is queue
+
+        photo = Photo(image=_image(image_content))
+        session.add(photo)
+        session.flush()
+        assert photo.image["thumbnail"] is None
+        assert len(photo.image["files"]) == 1
+
+        session.commit()
+        assert queue.join(timeout=5)
+
+        session.expire_all()
+        image = session.get(Photo, photo.id).image
+        assert len(image["files"]) == 2
+        assert image["thumbnail"]["path"] == image["files"][1]
+        assert max(_load_thumbnail(app, image).size) == 4
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_is_generated_with_async_driver(app_setup, image_content):
+    app = app_setup(
+        sql_module={
+            "databases": {"default": "sqlite+aiosqlite://"},
+            "file_processing": {},
+        }
+    )
+    db_service = app.injector.get(EllarSQLService)
+    db_service.create_all("default")
+
+    async with injector_context(app.injector):
+        session = db_service.session_factory()
+        photo = Photo(image=_image(image_content))
+        session.add(photo)
+        await session.flush()
+        photo_id = photo.id
+        await session.commit()
+        assert db_service.file_processing_queue.join(timeout=5)
+
+        image = (await session.get(Photo, photo_id)).image
+        assert len(image["files"]) == 2
+        assert max(_load_thumbnail(app, image).size) == 4
+        await session.close()
+
+    db_service.file_processing_queue.shutdown()
+    db_service.drop_all("default")
+
+
+@pytest.mark.asyncio
+async def test_thumbnails_of_multiple_files(app_setup, image_content):
+    async with _init_app(app_setup, synchronous=True) as (app, db_service, session):
+        photo = Photo(images=[_image(image_content), _image(image_content)])
+        session.add(photo)
+        session.commit()
+
+        session.expire_all()
+        images = session.get(Photo, photo.id).images
+        assert [f["file_id"] for f in images] == [f["file_id"] for f in photo.images]
+        for image in images:
+            assert max(_load_thumbnail(app, image).size) == 4
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_on_process_pool(app_setup, image_content):
+    async with _init_app(app_setup, process_workers=1) as (app, db_service, session):
+        photo = Photo(image=_image(image_content))
+        session.add(photo)
+        session.commit()
+        assert db_service.file_processing_queue.join(timeout=30)
+
+        session.expire_all()
+        image = session.get(Photo, photo.id).image
+        assert max(_load_thumbnail(app, image).size) == 4
+
+
+@pytest.mark.asyncio
+async def test_replaced_files_are_not_processed(app_setup, image_content):
+    async with _init_app(app_setup, synchronous=True) as (app, db_service, session):
+        photo = Photo(image=_image(image_content))
+        session.add(photo)
+        session.flush()
+
+        photo.image = _image(image_content)
+        session.commit()
+
+        session.expire_all()
+        image = session.get(Photo, photo.id).image
+        assert image["file_id"] == photo.image["file_id"]
+        assert image["thumbnail"] is not None
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_files_are_not_processed(app_setup, image_content):
+    queue = FileProcessingQueue(synchronous=True)
+
+    async with _init_app(app_setup, synchronous=True) as (app, db_service, session):
+        session.info[FILE_PROCESSING_QUEUE] = queue
+        session.add(Photo(image=_image(image_content)))
+        session.flush()
+        session.rollback()
+
+        session.add(Photo())
+        session.commit()
+        assert queue.join(timeout=5)
+        assert session.execute(model.select(Photo.image)).scalar_one() is None
+
+
+@pytest.mark.asyncio
+async def test_failed_processing_keeps_stored_file(app_setup, image_content):
+    async with _init_app(app_setup, synchronous=True) as (app, db_service, session):
+        scan = Scan(image=_image(image_content))
+        session.add(scan)
+        session.commit()
+
+        session.expire_all()
+        image = session.get(Scan, scan.id).image
+        assert image["files"] == scan.image["files"]
+        assert app.injector.get(StorageService).get(image["path"]) is not None
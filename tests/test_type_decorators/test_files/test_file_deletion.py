@@ -0,0 +1,277 @@
+import json
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+
+import pytest
+from ellar.core import injector_context
+from ellar_storage import StorageService
+from libcloud.storage.types import ObjectDoesNotExistError
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.constant import FILE_DELETION_QUEUE
+from ellar_sql.model.typeDecorator.file import FileDeletionQueue
+
+
+class Document(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    content = model.Column(model.typeDecorator.FileField)
+
+
+class _FailingDeletes:
+    def __init__(self, monkeypatch, failures):
+        self.failures = failures
+        self.calls = []
+        self.threads = []
+        delete = StorageService.delete
+
+        def _delete(storage_service, path):
+            self.calls.append(path)
+            self.threads.append(threading.current_thread().name)
+            if self.failures:
+                self.failures -= 1
+                raise OSError("storage unavailable")
+            return delete(storage_service, path)
+
+        monkeypatch.setattr(StorageService, "delete", _delete)
+
+
+@asynccontextmanager
+async def _init_app(app_setup, **file_deletion):
+    app = app_setup(sql_module={"file_deletion": file_deletion})
+    db_service = app.injector.get(EllarSQLService)
+
+    db_service.create_all("default")
+    session = db_service.session_factory()
+
+    async with injector_context(app.injector):
+        yield app, db_service, session
+
+    db_service.file_deletion_queue.stop()
+    db_service.drop_all("default")
+
+
+def _assert_deleted(app, paths):
+    storage_service = app.injector.get(StorageService)
+    for path in paths:
+        with pytest.raises(ObjectDoesNotExistError):
+            storage_service.get(path)
+
+
+@pytest.mark.asyncio
+async def test_files_are_deleted_in_background(app_setup, tmp_path):
+    journal_path = str(tmp_path / "deletions.json")
+
+    async with _init_app(app_setup, journal_path=journal_path) as (
+        app,
+        db_service,
+        session,
+    ):
+        queue = db_service.file_deletion_queue
+        assert session.info[FILE_DELETION_QUEUE] is queue
+
+        documents = [Document(content=f"content {i}".encode()) for i in range(5)]
+        session.add_all(documents)
+        session.commit()
+        paths = [d.content.path for d in documents]
+
+        for document in documents:
+            session.delete(document)
+        session.commit()
+
+        assert queue.join(timeout=5)
+        assert queue.pending == []
+        assert queue.journal_file == f"{journal_path}.{os.getpid()}"
+        assert not os.path.exists(queue.journal_file)
+        _assert_deleted(app, paths)
+
+        session.add(Document(content=b"rollback"))
+        session.flush()
+        path = session.execute(model.select(Document)).scalar_one().content.path
+        session.rollback()
+
+        assert queue.join(timeout=5)
+        _assert_deleted(app, [path])
+
+
+@pytest.mark.asyncio
+async def test_failed_deletions_are_retried(app_setup, monkeypatch):
+    deletes = _FailingDeletes(monkeypatch, failures=2)
+
+    async with _init_app(app_setup, synchronous=True, retry_delay=0) as (
+        app,
+        db_service,
+        session,
+    ):
+        document = Document(content=b"content")
+        session.add(document)
+        session.commit()
+        path = document.content.path
+
+        session.delete(document)
+        session.commit()
+
+        queue = db_service.file_deletion_queue
+        assert queue.pending == []
+        assert deletes.calls == [path, path, path]
+        _assert_deleted(app, [path])
+
+
+@pytest.mark.asyncio
+async def test_deletions_are_dropped_after_max_retries(app_setup, monkeypatch, caplog):
+    deletes = _FailingDeletes(monkeypatch, failures=10)
+
+    async with _init_app(app_setup, synchronous=True, retry_delay=0, max_retries=1) as (
+        app,
+        db_service,
+        session,
+    ):
+        document = Document(content=b"content")
+        session.add(document)
+        session.commit()
+
+        session.delete(document)
+        session.commit()
+
+        assert db_service.file_deletion_queue.pending == []
+        assert len(deletes.calls) == 2
+        assert any(
+            record.levelno == logging.WARNING and "Giving up" in record.message
+            for record in caplog.records
+        )
+
+
+@pytest.mark.asyncio
+async def test_pending_deletions_survive_restarts(app_setup, tmp_path):
+    journal_path = str(tmp_path / "deletions.json")
+
+    async with _init_app(app_setup, journal_path=journal_path) as (
+        app,
+        db_service,
+        session,
+    ):
+        document = Document(content=b"content")
+        session.add(document)
+        session.commit()
+        path = document.content.path
+
+        # journal left by a process stopped before deleting the file
+        with open(journal_path, "w") as journal:
+            json.dump([path], journal)
+
+        restarted_queue = FileDeletionQueue(journal_path=journal_path)
+        assert restarted_queue.pending == [path]
+
+        restarted_queue.start()
+        assert restarted_queue.join(timeout=5)
+        restarted_queue.stop()
+
+        assert not os.path.exists(journal_path)
+        assert not os.path.exists(restarted_queue.journal_file)
+        _assert_deleted(app, [path])
+
+
+def test_journals_of_running_processes_are_not_taken_over(tmp_path):
+    journal_path = str(tmp_path / "deletions.json")
+
+    running_journal = f"{journal_path}.{os.getppid()}"
+    with open(running_journal, "w") as journal:
+        json.dump(["running/file"], journal)
+
+    stopped_pid = 2**22 + 1  # above the maximum pid of linux
+    with open(f"{journal_path}.{stopped_pid}", "w") as journal:
+        json.dump(["stopped/file"], journal)
+
+    queue = FileDeletionQueue(journal_path=journal_path)
+    assert queue.pending == ["stopped/file"]
+    assert json.loads(open(queue.journal_file).read()) == {"add": ["stopped/file"]}
+    assert json.loads(open(running_journal).read()) == ["running/file"]
+    assert not os.path.exists(f"{journal_path}.{stopped_pid}")
+
+
+def test_journal_is_appended(tmp_path):
+    journal_path = str(tmp_path / "deletions.json")
+    queue = FileDeletionQueue(journal_path=journal_path, batch_size=10)
+
+    with queue._condition:
+        queue._pending.update({"a": [0, 0.0], "b": [0, 0.0], "c": [0, 0.0]})
+        queue._append_journal("add", ["a", "b"])
+        queue._append_journal("add", ["c"])
+        del queue._pending["a"]
+        queue._append_journal("done", ["a"])
+
+    with open(queue.journal_file) as journal:
+        assert [json.loads(line) for line in journal] == [
+            {"add": ["a", "b"]},
+            {"add": ["c"]},
+            {"done": ["a"]},
+        ]
+
+    # a line partially written by a stopped process is ignored
+    with open(queue.journal_file, "a") as journal:
+        journal.write('{"done": ["b"')
+    assert FileDeletionQueue._read_journal(queue.journal_file) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_deleted_concurrently(app_setup, monkeypatch):
+    deletes = _FailingDeletes(monkeypatch, failures=0)
+
+    async with _init_app(app_setup, synchronous=True, max_workers=4) as (
+        app,
+        db_service,
+        session,
+    ):
+        documents = [Document(content=f"content {i}".encode()) for i in range(6)]
+        session.add_all(documents)
+        session.commit()
+        paths = [d.content.path for d in documents]
+
+        for document in documents:
+            session.delete(document)
+        session.commit()
+
+        assert db_service.file_deletion_queue.pending == []
+        assert sorted(deletes.calls) == sorted(paths)
+        assert {name.split("_")[0] for name in deletes.threads} == {
+            "ellar-sql-file-deletion"
+        }
+        _assert_deleted(app, paths)
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_journal_failures(app_setup, tmp_path, monkeypatch):
+    journal_path = str(tmp_path / "deletions.json")
+    append_journal = FileDeletionQueue._append_journal
+    failures = []
+
+    def _append_journal(queue, action, paths):
+        if action == "done" and not failures:
+            failures.append(paths)
+            raise OSError("disk full")
+        return append_journal(queue, action, paths)
+
+    monkeypatch.setattr(FileDeletionQueue, "_append_journal", _append_journal)
+
+    async with _init_app(app_setup, journal_path=journal_path) as (
+        app,
+        db_service,
+        session,
+    ):
+        queue = db_service.file_deletion_queue
+
+        for content in (b"first", b"second"):
+            document = Document(content=content)
+            session.add(document)
+            session.commit()
+            path = document.content.path
+
+            session.delete(document)
+            session.commit()
+
+            assert queue.join(timeout=5)
+            _assert_deleted(app, [path])
+
+        assert len(failures) == 1
+        assert queue._thread.is_alive()
@@ -0,0 +1,107 @@
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from ellar.core import injector_context
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.model.typeDecorator.file import File
+
+
+class Upload(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    content = model.Column(
+        model.typeDecorator.FileField(
+            metadata_columns=["size", "content_type", "uploaded_at", "content_hash"]
+        )
+    )
+
+
+@asynccontextmanager
+async def _init_app(app_setup):
+    app = app_setup()
+    db_service = app.injector.get(EllarSQLService)
+
+    db_service.create_all("default")
+    session = db_service.session_factory()
+
+    async with injector_context(app.injector):
+        yield app, db_service, session
+
+    db_service.drop_all("default")
+
+
+def test_metadata_columns_are_added_to_table():
+    table = Upload.__table__
+    assert table.c.content_size.type.python_type is int
+    assert isinstance(table.c.content_uploaded_at.type, sa.DateTime)
+    assert table.c.content_content_type.index
+    assert table.c.content_content_hash.nullable
+
+
+def test_invalid_metadata_columns():
+    with pytest.raises(sa.exc.ArgumentError, match="Unknown file metadata columns"):
+        model.typeDecorator.FileField(metadata_columns=["width"])
+
+    with pytest.raises(sa.exc.ArgumentError, match="multiple"):
+        model.typeDecorator.FileField(metadata_columns=["size"], multiple=True)
+
+    with pytest.raises(sa.exc.ArgumentError, match="not a metadata column"):
+        Upload.content.file_column("filename")
+
+
+@pytest.mark.asyncio
+async def test_metadata_columns_are_kept_in_sync(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        upload = Upload(content=File(b"content", content_type="text/plain"))
+        session.add(upload)
+        session.commit()
+
+        assert upload.content_size == 7
+        assert upload.content_content_type == "text/plain"
+        assert upload.content_content_hash == hashlib.sha256(b"content").hexdigest()
+        assert isinstance(upload.content_uploaded_at, datetime)
+
+        upload.content = File(b"<p>new content</p>", content_type="text/html")
+        session.commit()
+        session.expire_all()
+
+        row = session.execute(
+            sa.select(Upload.content_size, Upload.content_content_type).where(
+                Upload.id == upload.id
+            )
+        ).one()
+        assert tuple(row) == (18, "text/html")
+
+        upload = session.get(Upload, upload.id)
+        upload.content = None
+        session.commit()
+        assert upload.content_size is None
+        assert upload.content_content_type is None
+
+
+@pytest.mark.asyncio
+async def test_query_helpers(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        session.add_all(
+            [
+                Upload(content=File(b"a" * 10, content_type="image/png")),
+                Upload(content=File(b"a" * 100, content_type="image/jpeg")),
+                Upload(content=File(b"a" * 1000, content_type="text/plain")),
+                Upload(content=File(b"a" * 5, content_type="image_x/png")),
+            ]
+        )
+        session.commit()
+
+        def _sizes(*criteria):
+            return sorted(
+                session.execute(sa.select(Upload.content_size).where(*criteria))
+                .scalars()
+                .all()
+            )
+
+        assert _sizes(Upload.content.content_type_matches("image/*")) == [10, 100]
+        assert _sizes(Upload.content.content_type_matches("text/plain")) == [1000]
+        assert _sizes(Upload.content.file_column("size") > 50) == [100, 1000]
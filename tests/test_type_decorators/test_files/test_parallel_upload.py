@@ -0,0 +1,141 @@
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from ellar.core import injector_context
+from ellar_storage import StorageService
+from libcloud.storage.types import ObjectDoesNotExistError
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.constant import FILE_UPLOAD_WORKERS
+
+
+class Gallery(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    cover = model.Column(model.typeDecorator.FileField)
+    images = model.Column(model.typeDecorator.FileField(multiple=True))
+
+
+class _ConcurrentUploads:
+    def __init__(self, monkeypatch):
+        self.active = 0
+        self.max_active = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+        save_content = StorageService.save_content
+
+        def _save_content(storage_service, *args, **kwargs):
+            with self._lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                self.threads.add(threading.get_ident())
+            try:
+                time.sleep(0.05)
+                if kwargs["extra"]["meta_data"]["filename"] == "fail.txt":
+                    raise OSError("upload failed")
+                return save_content(storage_service, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+        monkeypatch.setattr(StorageService, "save_content", _save_content)
+
+
+@pytest.mark.asyncio
+class TestParallelUpload:
+    @asynccontextmanager
+    async def init_app(self, app_setup, monkeypatch, **sql_module):
+        app = app_setup(sql_module={"file_upload_workers": 4, **sql_module})
+        db_service = app.injector.get(EllarSQLService)
+
+        db_service.create_all("default")
+        session = db_service.session_factory()
+        uploads = _ConcurrentUploads(monkeypatch)
+
+        async with injector_context(app.injector):
+            yield app, session, uploads
+
+        db_service.drop_all("default")
+
+    async def test_files_of_a_flush_are_uploaded_concurrently(
+        self, app_setup, monkeypatch
+    ) -> None:
+        async with self.init_app(app_setup, monkeypatch) as (app, session, uploads):
+            assert session.info[FILE_UPLOAD_WORKERS] == 4
+
+            session.add(Gallery(cover=b"cover", images=[b"first", b"second"]))
+            session.add(Gallery(cover=b"other cover", images=[b"third"]))
+            session.commit()
+
+            assert uploads.max_active > 1
+            assert threading.get_ident() not in uploads.threads
+
+            galleries = session.execute(
+                model.select(Gallery).order_by(Gallery.id)
+            ).scalars()
+            assert [
+                (g.cover.file.read(), [i.file.read() for i in g.images])
+                for g in galleries
+            ] == [(b"cover", [b"first", b"second"]), (b"other cover", [b"third"])]
+
+    async def test_new_files_of_updated_rows_are_uploaded(
+        self, app_setup, monkeypatch
+    ) -> None:
+        async with self.init_app(app_setup, monkeypatch) as (app, session, uploads):
+            gallery = Gallery(cover=b"cover", images=[b"first"])
+            session.add(gallery)
+            session.commit()
+
+            gallery.images.append(b"second")
+            gallery.cover = b"new cover"
+            session.flush()
+            paths = [gallery.cover.path, gallery.images[1].path]
+            session.rollback()
+
+            storage_service = app.injector.get(StorageService)
+            for path in paths:
+                with pytest.raises(ObjectDoesNotExistError):
+                    storage_service.get(path)
+
+    async def test_uploaded_files_are_deleted_when_an_upload_fails(
+        self, app_setup, monkeypatch
+    ) -> None:
+        async with self.init_app(app_setup, monkeypatch) as (app, session, uploads):
+            gallery = Gallery(
+                images=[
+                    b"first",
+                    model.typeDecorator.File(b"content", filename="fail.txt"),
+                    b"second",
+                ]
+            )
+            session.add(gallery)
+
+            with pytest.raises(OSError, match="upload failed"):
+                session.flush()
+
+            paths = [i.path for i in gallery.images if i.get("saved")]
+            assert len(paths) == 2
+            session.rollback()
+
+            storage_service = app.injector.get(StorageService)
+            for path in paths:
+                with pytest.raises(ObjectDoesNotExistError):
+                    storage_service.get(path)
+
+    async def test_files_are_uploaded_sequentially_by_default(
+        self, app_setup, monkeypatch
+    ) -> None:
+        async with self.init_app(app_setup, monkeypatch, file_upload_workers=None) as (
+            app,
+            session,
+            uploads,
+        ):
+            assert FILE_UPLOAD_WORKERS not in session.info
+
+            session.add(Gallery(cover=b"cover", images=[b"first", b"second"]))
+            session.commit()
+
+            assert uploads.max_active == 1
+            assert uploads.threads == {threading.get_ident()}
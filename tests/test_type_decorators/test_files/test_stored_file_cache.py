@@ -0,0 +1,110 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from ellar.core import injector_context
+from ellar_storage import StorageService
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.model.typeDecorator.file import (
+    File,
+    StoredFileCache,
+    invalidate_stored_files,
+)
+
+
+class CachedAttachment(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    content = model.Column(model.typeDecorator.FileField)
+
+
+class _CountingGets:
+    def __init__(self, monkeypatch):
+        self.paths = []
+        get = StorageService.get
+
+        def _get(storage_service, path):
+            self.paths.append(path)
+            return get(storage_service, path)
+
+        monkeypatch.setattr(StorageService, "get", _get)
+
+
+@asynccontextmanager
+async def _init_app(app_setup):
+    app = app_setup()
+    db_service = app.injector.get(EllarSQLService)
+
+    db_service.create_all("default")
+    session = db_service.session_factory()
+    File.stored_file_cache.clear()
+
+    async with injector_context(app.injector):
+        yield app, db_service, session
+
+    db_service.drop_all("default")
+
+
+@pytest.mark.asyncio
+async def test_stored_files_are_cached(app_setup, monkeypatch):
+    async with _init_app(app_setup) as (app, db_service, session):
+        attachment = CachedAttachment(content=b"content")
+        session.add(attachment)
+        session.commit()
+
+        gets = _CountingGets(monkeypatch)
+        assert attachment.content.file.read() == b"content"
+        assert attachment.content.file is attachment.content.file
+        assert attachment.content.get_cdn_url() == attachment.content.url
+        assert gets.paths == [attachment.content.path]
+
+
+@pytest.mark.asyncio
+async def test_replaced_and_deleted_files_are_invalidated(app_setup):
+    async with _init_app(app_setup) as (app, db_service, session):
+        attachment = CachedAttachment(content=b"content")
+        session.add(attachment)
+        session.commit()
+
+        assert attachment.content.file is not None
+        assert len(File.stored_file_cache) == 1
+
+        attachment.content = b"new content"
+        session.commit()
+        assert len(File.stored_file_cache) == 0
+        assert attachment.content.file.read() == b"new content"
+
+        assert len(File.stored_file_cache) == 1
+        session.delete(attachment)
+        session.commit()
+        assert len(File.stored_file_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_and_expires(app_setup, monkeypatch):
+    async with _init_app(app_setup) as (app, db_service, session):
+        attachments = [
+            CachedAttachment(content=f"content {i}".encode()) for i in range(3)
+        ]
+        session.add_all(attachments)
+        session.commit()
+        paths = [a.content.path for a in attachments]
+        storage_service = app.injector.get(StorageService)
+
+        cache = StoredFileCache(maxsize=2)
+        assert cache.ttl == 60
+        for path in paths:
+            cache.get(storage_service, path)
+        assert len(cache) == 2
+
+        gets = _CountingGets(monkeypatch)
+        cache.get(storage_service, paths[2])
+        cache.get(storage_service, paths[0])
+        assert gets.paths == [paths[0]]
+
+        invalidate_stored_files(paths)
+        assert len(cache) == 0
+
+        cache = StoredFileCache(maxsize=2, ttl=0)
+        cache.get(storage_service, paths[0])
+        cache.get(storage_service, paths[0])
+        assert gets.paths == [paths[0], paths[0], paths[0]]
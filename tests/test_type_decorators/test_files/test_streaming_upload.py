@@ -0,0 +1,80 @@
+import hashlib
+import io
+
+import pytest
+from ellar.core import injector_context
+from ellar_storage import StorageService
+from starlette.datastructures import Headers, UploadFile
+
+from ellar_sql import EllarSQLService, model
+from ellar_sql.model.typeDecorator.file.file import ContentStream
+
+CONTENT = bytes(range(256)) * 1024 + b"end"
+
+
+class SmallChunksFile(model.typeDecorator.File):
+    chunk_size = 1000
+
+
+class Video(model.Model):
+    id = model.Column(model.Integer, autoincrement=True, primary_key=True)
+    content = model.Column(model.typeDecorator.FileField(upload_type=SmallChunksFile))
+
+
+def test_content_stream_reads_fixed_size_chunks():
+    fileobj = io.BytesIO(CONTENT)
+    fileobj.seek(100)
+
+    stream = ContentStream(fileobj, chunk_size=1000)
+    chunks = list(stream)
+
+    assert b"".join(chunks) == CONTENT
+    assert {len(chunk) for chunk in chunks[:-1]} == {1000}
+    assert stream.completed
+    assert stream.size == len(CONTENT)
+    assert stream.hexdigest() == hashlib.sha256(CONTENT).hexdigest()
+    assert fileobj.tell() == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_file_is_streamed_in_chunks(app_setup, monkeypatch):
+    app = app_setup()
+    db_service = app.injector.get(EllarSQLService)
+    db_service.create_all("default")
+    session = db_service.session_factory()
+
+    chunk_sizes = []
+    save_content = StorageService.save_content
+
+    def _save_content(storage_service, *args, content=None, **kwargs):
+        assert isinstance(content, ContentStream)
+
+        def _chunks():
+            for chunk in content:
+                chunk_sizes.append(len(chunk))
+                yield chunk
+
+        return save_content(storage_service, *args, content=_chunks(), **kwargs)
+
+    monkeypatch.setattr(StorageService, "save_content", _save_content)
+
+    upload_file = UploadFile(
+        io.BytesIO(CONTENT),
+        size=len(CONTENT),
+        filename="video.mp4",
+        headers=Headers({"content-type": "video/mp4"}),
+    )
+
+    async with injector_context(app.injector):
+        session.add(Video(content=upload_file))
+        session.commit()
+
+        video = session.execute(model.select(Video)).scalar_one()
+        assert video.content.file.read() == CONTENT
+        assert video.content.size == len(CONTENT)
+        assert video.content.content_hash == hashlib.sha256(CONTENT).hexdigest()
+        assert video.content.content_type == "video/mp4"
+
+    assert max(chunk_sizes) == 1000
+    assert sum(chunk_sizes) == len(CONTENT)
+    db_service.drop_all("default")
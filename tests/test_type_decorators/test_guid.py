@@ -1,5 +1,9 @@
 import uuid
 
+import pytest
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.dialects.mssql import pymssql
+
 from ellar_sql import model
 
 
@@ -23,3 +27,79 @@ def test_guid_column_type(db_service, ignore_base):
 
     guid = session.execute(model.select(Guid)).scalar()
     assert guid.id == uid
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_guid_storage_modes(db_service, ignore_base, binary):
+    uid = uuid.uuid4()
+
+    class Guid(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        uid = model.Column(model.GUID(binary=binary))
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add_all([Guid(uid=uid), Guid(uid=str(uid)), Guid(uid=None)])
+    session.commit()
+
+    result = session.execute(model.select(Guid.uid).order_by(Guid.id)).scalars()
+    assert list(result) == [uid, uid, None]
+
+    stored = session.execute(model.text("SELECT uid FROM guid")).scalar()
+    assert stored == (uid.bytes if binary else uid.hex)
+
+    guid = session.execute(model.select(Guid).where(Guid.uid == str(uid))).scalar()
+    assert guid.uid == uid
+    assert isinstance(guid.uid, uuid.UUID)
+
+
+@pytest.mark.parametrize(
+    "dialect, binary, column_type",
+    [
+        (sqlite.dialect(), False, "CHAR(32)"),
+        (sqlite.dialect(), True, "BINARY(16)"),
+        (mysql.dialect(), True, "BINARY(16)"),
+        (postgresql.dialect(), True, "UUID"),
+        # supports a native UUID type, which existing columns don't use
+        (pymssql.dialect(), False, "CHAR(32)"),
+    ],
+)
+def test_guid_dialect_type(ignore_base, dialect, binary, column_type):
+    table = model.Table(
+        "guid_table", model.MetaData(), model.Column("uid", model.GUID(binary=binary))
+    )
+    ddl = str(model.schema.CreateTable(table).compile(dialect=dialect))
+    assert f"uid {column_type}" in ddl
+
+
+@pytest.mark.parametrize(
+    "native, dialect, column_type",
+    [
+        (True, pymssql.dialect(), "UNIQUEIDENTIFIER"),
+        (["mssql"], pymssql.dialect(), "UNIQUEIDENTIFIER"),
+        (["mssql"], postgresql.dialect(), "CHAR(32)"),
+        (False, postgresql.dialect(), "CHAR(32)"),
+    ],
+)
+def test_guid_native_dialects(ignore_base, native, dialect, column_type):
+    guid = model.GUID(native=native)
+    table = model.Table("guid_table", model.MetaData(), model.Column("uid", guid))
+    ddl = str(model.schema.CreateTable(table).compile(dialect=dialect))
+    assert f"uid {column_type}" in ddl
+
+    uid = uuid.uuid4()
+    bound = guid.bind_processor(dialect)(uid)
+    assert guid.result_processor(dialect, None)(bound) == uid
+
+
+def test_guid_statements_are_cacheable(ignore_base):
+    class Guid(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        uid = model.Column(model.GUID(binary=True))
+
+    first = model.select(Guid).where(Guid.uid == uuid.uuid4())._generate_cache_key()
+    second = model.select(Guid).where(Guid.uid == uuid.uuid4())._generate_cache_key()
+
+    assert first is not None
+    assert first == second
+    assert model.GUID(binary=True)._static_cache_key != model.GUID()._static_cache_key
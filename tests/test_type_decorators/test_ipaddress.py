@@ -1,3 +1,8 @@
+import ipaddress
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
 from ellar_sql import model
 
 
@@ -15,3 +20,97 @@ def test_ipaddress_column_type(db_service, ignore_base):
 
     ip_address = session.execute(model.select(IPAddress)).scalar()
     assert str(ip_address.ip) == ip
+
+
+def _create_addresses(db_service, compact):
+    class IPAddress(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        ip = model.Column(model.GenericIP(compact=compact), index=True)
+        network = model.Column(model.GenericNetwork(compact=compact))
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add_all(
+        [
+            IPAddress(ip="10.0.0.1", network="10.0.0.0/8"),
+            IPAddress(ip="10.1.2.3", network="10.1.0.0/16"),
+            IPAddress(ip="11.0.0.1", network="11.0.0.0/24"),
+            IPAddress(ip="2001:db8::1", network="2001:db8::/32"),
+            IPAddress(ip=ipaddress.ip_address("2001:db9::1"), network=None),
+        ]
+    )
+    session.commit()
+    return IPAddress, session
+
+
+def test_ipaddress_compact_storage(db_service, ignore_base):
+    IPAddress, session = _create_addresses(db_service, compact=True)
+
+    stored = session.execute(model.text("SELECT ip, network FROM ip_address")).first()
+    assert stored.ip == b"\x04" + int(ipaddress.ip_address("10.0.0.1")).to_bytes(
+        16, "big"
+    )
+    assert len(stored.network) == 18
+
+    addresses = session.execute(
+        model.select(IPAddress).order_by(IPAddress.id)
+    ).scalars()
+    assert [(str(a.ip), a.network and str(a.network)) for a in addresses] == [
+        ("10.0.0.1", "10.0.0.0/8"),
+        ("10.1.2.3", "10.1.0.0/16"),
+        ("11.0.0.1", "11.0.0.0/24"),
+        ("2001:db8::1", "2001:db8::/32"),
+        ("2001:db9::1", None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "network, ips, networks",
+    [
+        ("10.0.0.0/8", ["10.0.0.1", "10.1.2.3"], ["10.0.0.0/8", "10.1.0.0/16"]),
+        ("10.1.0.0/16", ["10.1.2.3"], ["10.1.0.0/16"]),
+        (
+            "0.0.0.0/0",
+            ["10.0.0.1", "10.1.2.3", "11.0.0.1"],
+            ["10.0.0.0/8", "10.1.0.0/16", "11.0.0.0/24"],
+        ),
+        ("2001:db8::/32", ["2001:db8::1"], ["2001:db8::/32"]),
+        ("2001::/16", ["2001:db8::1", "2001:db9::1"], ["2001:db8::/32"]),
+    ],
+)
+def test_ipaddress_in_network(db_service, ignore_base, network, ips, networks):
+    IPAddress, session = _create_addresses(db_service, compact=True)
+
+    result = session.execute(
+        model.select(IPAddress.ip).where(IPAddress.ip.in_network(network))
+    ).scalars()
+    assert sorted(str(ip) for ip in result) == ips
+
+    result = session.execute(
+        model.select(IPAddress.network).where(IPAddress.network.in_network(network))
+    ).scalars()
+    assert sorted(str(n) for n in result) == networks
+
+
+def test_ipaddress_in_network_compiles_to_range(ignore_base):
+    table = model.Table(
+        "ips",
+        model.MetaData(),
+        model.Column("ip", model.GenericIP(compact=True)),
+        model.Column("text_ip", model.GenericIP()),
+    )
+
+    first = table.c.ip.in_network("10.0.0.0/8")
+    second = table.c.ip.in_network("192.168.0.0/16")
+    assert first._generate_cache_key() == second._generate_cache_key()
+
+    assert str(first.compile(dialect=sqlite.dialect())) == ("ips.ip BETWEEN ? AND ?")
+    assert str(first.compile(dialect=postgresql.dialect())) == (
+        "ips.ip <<= CAST(%(param_1)s AS CIDR)"
+    )
+    assert "<<=" in str(
+        table.c.text_ip.in_network("10.0.0.0/8").compile(dialect=postgresql.dialect())
+    )
+
+    with pytest.raises(model.exc.CompileError, match="compact=True"):
+        table.c.text_ip.in_network("10.0.0.0/8").compile(dialect=sqlite.dialect())
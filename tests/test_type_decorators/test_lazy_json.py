@@ -0,0 +1,144 @@
+import dataclasses
+import datetime
+import enum
+import uuid
+
+import pytest
+
+from ellar_sql import model
+from ellar_sql.model.typeDecorator import LazyValue, lazy_json
+
+DOCUMENT = {"name": "ellar", "tags": ["sql", "orm"], "count": 2}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_codec(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(lazy_json, "orjson", None)
+    return request.param
+
+
+def test_lazy_json_column_type(db_service, ignore_base, json_codec):
+    class Document(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        data = model.Column(model.LazyJSON())
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add_all([Document(data=DOCUMENT), Document(data=None)])
+    session.commit()
+    session.expunge_all()
+
+    stored = session.execute(model.text("SELECT data FROM document")).scalars()
+    assert list(stored) == ['{"name":"ellar","tags":["sql","orm"],"count":2}', None]
+
+    document = session.get(Document, 1)
+    assert isinstance(document.__dict__["data"], LazyValue)
+    assert document.data == DOCUMENT
+    assert not session.dirty
+    assert session.get(Document, 2).data is None
+
+    # selected columns are parsed when fetched
+    assert (
+        session.execute(
+            model.select(Document.data).where(Document.id == 1)
+        ).scalar_one()
+        == DOCUMENT
+    )
+    assert Document.to_columns(session=session)["data"] == [DOCUMENT, None]
+
+    found = session.execute(
+        model.select(Document.id).where(Document.data["name"].as_string() == "ellar")
+    ).scalar()
+    assert found == 1
+
+
+def test_lazy_json_eager(db_service, ignore_base):
+    class Document(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        data = model.Column(model.LazyJSON(lazy=False))
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add(Document(data=DOCUMENT))
+    session.commit()
+
+    assert session.execute(model.select(Document.data)).scalar() == DOCUMENT
+
+
+def test_lazy_json_only_instruments_lazy_columns(db_service, ignore_base):
+    reads = []
+
+    class Note(model.Model):
+        id = model.Column(model.Integer, primary_key=True)
+        data = model.Column(model.LazyJSON())
+        meta = model.Column(model.LazyJSON(lazy=False))
+
+        def __getattribute__(self, name):
+            if name == "meta":
+                reads.append(name)
+            return super().__getattribute__(name)
+
+    assert isinstance(Note.data, model.orm.InstrumentedAttribute)
+    assert isinstance(Note.__dict__["meta"], model.orm.InstrumentedAttribute)
+    assert not isinstance(Note.__dict__["data"], model.orm.InstrumentedAttribute)
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add(Note(data=DOCUMENT, meta=DOCUMENT))
+    session.commit()
+    session.expunge_all()
+
+    note = session.get(Note, 1)
+    assert note.meta == DOCUMENT
+    assert reads == ["meta"]
+
+    assert isinstance(note.__dict__["data"], LazyValue)
+    assert note.data == DOCUMENT
+    assert not session.dirty
+
+    note.data = {"name": "updated"}
+    assert note in session.dirty
+    session.commit()
+    session.expunge_all()
+    assert session.get(Note, 1).data == {"name": "updated"}
+    session.close()
+
+
+def test_json_codec(json_codec):
+    value = {1: "non str key", "list": [1.5, None, True]}
+    dumped = lazy_json.json_dumps(value)
+
+    assert isinstance(dumped, bytes)
+    assert lazy_json.json_loads(dumped) == {
+        "1": "non str key",
+        "list": [1.5, None, True],
+    }
+
+
+def test_json_codec_serializes_same_types(json_codec):
+    class Color(enum.Enum):
+        RED = "red"
+
+    @dataclasses.dataclass
+    class Point:
+        x: int
+
+    value = {
+        "at": datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        "day": datetime.date(2024, 1, 2),
+        "id": uuid.UUID(int=1),
+        "color": Color.RED,
+        "point": Point(x=1),
+    }
+
+    assert lazy_json.json_loads(lazy_json.json_dumps(value)) == {
+        "at": "2024-01-02T03:04:05+00:00",
+        "day": "2024-01-02",
+        "id": "00000000-0000-0000-0000-000000000001",
+        "color": "red",
+        "point": {"x": 1},
+    }
+
+    with pytest.raises(TypeError):
+        lazy_json.json_dumps({"value": object()})
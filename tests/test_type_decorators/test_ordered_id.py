@@ -0,0 +1,105 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.mssql import pymssql
+
+from ellar_sql import model
+
+
+def test_uuid7_is_time_ordered():
+    before = time.time_ns() // 1_000_000
+    values = [model.uuid7() for _ in range(5000)]
+    after = time.time_ns() // 1_000_000
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(v.version == 7 and v.variant == uuid.RFC_4122 for v in values)
+    assert before <= values[0].int >> 80 <= values[-1].int >> 80 <= after + 1
+
+
+def test_ulid_is_time_ordered():
+    values = [model.ulid() for _ in range(5000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(len(v) == 26 for v in values)
+
+
+def test_snowflake_generator():
+    generator = model.SnowflakeGenerator(node_id=5)
+    values = [generator() for _ in range(10000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(v < 2**63 and (v >> 12) & 0x3FF == 5 for v in values)
+
+    with pytest.raises(ValueError, match="node_id"):
+        model.SnowflakeGenerator(node_id=1024)
+
+
+def test_ordered_id_columns_default(db_service, ignore_base):
+    class Event(model.Model):
+        id = model.Column(model.Snowflake(node_id=3), primary_key=True)
+        uid = model.Column(model.UUID7())
+        ulid = model.Column(model.ULID())
+
+    db_service.create_all()
+    session = db_service.session_factory()
+    session.add_all([Event() for _ in range(3)])
+    session.commit()
+
+    events = session.execute(model.select(Event).order_by(Event.id)).scalars().all()
+    assert [e.uid for e in events] == sorted(e.uid for e in events)
+    assert [e.ulid for e in events] == sorted(e.ulid for e in events)
+    assert all(isinstance(e.uid, uuid.UUID) for e in events)
+
+    stored = session.execute(model.text("SELECT uid, ulid FROM event")).first()
+    assert stored.uid == events[0].uid.bytes
+    assert len(stored.ulid) == 16
+
+    event = session.execute(
+        model.select(Event).where(Event.ulid == events[1].ulid.lower())
+    ).scalar()
+    assert event.id == events[1].id
+
+
+def test_ordered_id_columns_keep_explicit_default(ignore_base):
+    def default():
+        return uuid.UUID(int=0)
+
+    column = model.Column("uid", model.UUID7(), default=default)
+    model.Table("guid_table", model.MetaData(), column)
+    assert column.default.arg(None) == uuid.UUID(int=0)
+
+
+def test_ordered_id_columns_generated_default(ignore_base):
+    column = model.Column("uid", model.UUID7())
+    model.Table("generated_guid_table", model.MetaData(), column)
+
+    assert column.default.column is column
+    assert column.default.is_callable
+    assert isinstance(column.default.arg(None), uuid.UUID)
+
+
+@pytest.mark.parametrize(
+    "dialect, column_type",
+    [
+        (sqlite.dialect(), "BINARY(16)"),
+        (postgresql.dialect(), "UUID"),
+        (pymssql.dialect(), "BINARY(16)"),
+    ],
+)
+def test_ordered_id_dialect_type(ignore_base, dialect, column_type):
+    table = model.Table(
+        "ids",
+        model.MetaData(),
+        model.Column("uid", model.UUID7()),
+        model.Column("ulid", model.ULID()),
+        model.Column("id", model.Snowflake()),
+    )
+    ddl = str(model.schema.CreateTable(table).compile(dialect=dialect))
+    assert f"uid {column_type}" in ddl
+    assert f"ulid {column_type}" in ddl
+    assert "id BIGINT" in ddl